@@ -1,7 +1,9 @@
 import streamlit as st
 import pandas as pd
 from pathlib import Path
+import sqlite3
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import sys
 
@@ -11,8 +13,21 @@ sys.path.insert(0, str(Path(__file__).parent))
 from src.ingestion.data_loader import DataLoader
 from src.processing.data_processor import DataProcessor
 from src.processing.anomaly_detector import AnomalyDetector
+from src.processing.data_quality import DataQualityProfiler
+from src.processing.feature_matrix import FeatureMatrix
+from src.processing.feature_screening import FeatureScreener
 from src.analysis.ai_analyzer import AIAnalyzer
 from src.reporting.pdf_generator import PDFGenerator
+from src.reporting.report_cache import ReportCache
+from src.reporting.alerts import AlertEmitter
+from src.reporting.run_archive import RunArchive
+from src.runtime.profiler import StageProfiler
+from src.runtime.scheduler import feed_of
+from src.runtime.concurrency import apply_thread_budget
+from src.config import Config
+
+Config.init()
+apply_thread_budget(1)
 
 # Page config
 st.set_page_config(
@@ -105,6 +120,15 @@ if uploaded_file is not None:
     
     st.markdown("---")
     
+    force_refresh = st.checkbox(
+        "🔄 Force refresh",
+        help="Ignore any cached report for this file and rerun the full pipeline"
+    )
+    profile_run = st.checkbox(
+        "🔬 Profile this run",
+        help="Capture per-stage CPU profiles and allocation sites next to the report"
+    )
+    
     # Process button
     if st.button("🚀 Generate Report", type="primary", use_container_width=True):
         progress_bar = st.progress(0)
@@ -121,45 +145,120 @@ if uploaded_file is not None:
             uploaded_file.seek(0)
             input_path.write_bytes(uploaded_file.read())
             
-            # Load
-            status_text.text("📊 Loading data...")
-            progress_bar.progress(20)
+            output_filename = f"report_{Path(uploaded_file.name).stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
             loader = DataLoader()
-            df = loader.load_csv(input_path)
             
-            # Process
-            status_text.text("⚙️ Processing...")
-            progress_bar.progress(40)
-            processor = DataProcessor()
-            df_clean = processor.prepare_for_ml(df)
-            metrics = processor.calculate_metrics(df_clean)
+            # Same content + same settings = same report
+            content_digest = loader.file_digest(input_path)
+            report_cache = ReportCache() if Config.REPORT_CACHE_ENABLED else None
+            run_archive = RunArchive() if Config.RUN_ARCHIVE_ENABLED else None
+            history = f"archive={run_archive.latest_run(feed_of(input_path))}" if run_archive is not None else None
+            cache_key = report_cache.key(content_digest, variant="dashboard", history=history) if report_cache else None
+            profiler = StageProfiler.for_file(input_path, enabled=profile_run or None)
+            pdf_path, cached, profile_dir = None, None, None
+            if cache_key and not force_refresh and not profiler.enabled:
+                pdf_path, cached = report_cache.fetch(cache_key, Config.OUTPUT_DIR / output_filename)
             
-            # Anomaly detection
-            status_text.text("🔍 Detecting anomalies...")
-            progress_bar.progress(60)
-            detector = AnomalyDetector()
-            anomalies = detector.detect(df_clean)
+            if cached:
+                status_text.text("⚡ Reusing cached report...")
+                metrics, anomalies, insights = cached["metrics"], cached["anomalies"], cached["insights"]
+            else:
+                # Load
+                status_text.text("📊 Loading data...")
+                progress_bar.progress(20)
+                with profiler.stage("ingest"):
+                    df = loader.load_csv(input_path)
             
-            # AI analysis
-            status_text.text("🤖 Generating AI insights...")
-            progress_bar.progress(80)
-            analyzer = AIAnalyzer()
-            insights = analyzer.generate_insights(metrics, anomalies)
-            
-            # Generate PDF
-            status_text.text("📄 Creating PDF...")
-            progress_bar.progress(95)
-            pdf_gen = PDFGenerator()
-            report_data = {
-                "title": f"Analysis Report: {uploaded_file.name}",
-                "metrics": metrics,
-                "anomalies": anomalies,
-                "insights": insights,
-                "charts": []
-            }
+                # Data quality (failing gates skip detection and the LLM)
+                with profiler.stage("quality"):
+                    quality = DataQualityProfiler().profile(df)
+                if not quality["passed"]:
+                    st.warning(f"⚠️ Data quality gates failed: {'; '.join(quality['gate_failures'])}")
+                    metrics = DataQualityProfiler.skipped_metrics(df, quality)
+                    anomalies = DataQualityProfiler.skipped_anomalies(df.height)
+                    insights = DataQualityProfiler.describe_failures(quality)
+                else:
+                    # Process
+                    status_text.text("⚙️ Processing...")
+                    progress_bar.progress(40)
+                    processor = DataProcessor()
+                    with profiler.stage("process"):
+                        df_clean = processor.prepare_for_ml(df)
+                        features = FeatureMatrix.from_frame(df_clean)
+                        metrics = processor.calculate_metrics(df_clean, numeric_cols=features.columns)
+                        metrics["quality"] = quality
+                
+                    # Anomaly detection
+                    status_text.text("🔍 Detecting anomalies...")
+                    progress_bar.progress(60)
+                    detection_features, value_columns = features, None
+                    if Config.SCREENING_ENABLED:
+                        with profiler.stage("screen"):
+                            detection_features, metrics["screening"] = FeatureScreener().screen(features)
+                            value_columns = metrics["screening"]["kept"]
+                    detector = AnomalyDetector()
+                    with profiler.stage("detect"):
+                        anomalies = detector.detect(df_clean, features=detection_features, value_columns=value_columns)
+                    
+                    # Surface the anomalies now instead of after the LLM and PDF
+                    if Config.ALERTS_ENABLED:
+                        with profiler.stage("alert"):
+                            event = AlertEmitter().emit(input_path, anomalies)
+                        if event:
+                            st.toast(f"🚨 {event['anomaly_count']} anomalies detected ({event['anomaly_rate']:.1%} of rows)")
+                    
+                    # Same feed's earlier runs, from the archive index
+                    if run_archive is not None:
+                        with profiler.stage("history"):
+                            metrics["history"] = run_archive.drift(feed_of(input_path), metrics, anomalies)
+                        if metrics["history"] and metrics["history"]["drifted"]:
+                            st.warning(f"📉 Drift vs. previous runs: {', '.join(metrics['history']['drifted'])}")
+                
+                pdf_gen = PDFGenerator()
+                report_data = {
+                    "title": f"Analysis Report: {uploaded_file.name}",
+                    "metrics": metrics,
+                    "anomalies": anomalies,
+                    "insights": insights if not quality["passed"] else None,
+                    "charts": []
+                }
+                prepared = None
+                
+                if quality["passed"]:
+                    # AI analysis, rendered as it streams in while the rest of the PDF is laid out
+                    status_text.text("🤖 Generating AI insights...")
+                    progress_bar.progress(80)
+                    analyzer = AIAnalyzer()
+                    with ThreadPoolExecutor(max_workers=1) as layout:
+                        prepared = layout.submit(pdf_gen.prepare, report_data)
+                        live_insights = st.empty()
+                        with profiler.stage("insights"):
+                            insights = ""
+                            for chunk in analyzer.stream_insights(metrics, anomalies):
+                                insights += chunk
+                                live_insights.markdown(insights + " ▌")
+                        live_insights.empty()
+                        prepared = prepared.result()
+                    report_data["insights"] = insights
+                    report_data["insights_source"] = analyzer.last_source
             
-            output_filename = f"report_{Path(uploaded_file.name).stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-            pdf_path = pdf_gen.generate(report_data, output_filename)
+                # Generate PDF
+                status_text.text("📄 Creating PDF...")
+                progress_bar.progress(95)
+                with profiler.stage("report"):
+                    pdf_path = pdf_gen.generate(report_data, output_filename, prepared=prepared)
+                if run_archive is not None:
+                    try:
+                        run_id = run_archive.record(input_path, report_data, pdf_path, profiler.timings, content_digest)
+                        if cache_key:
+                            # Re-uploading the same file gets this report back until the feed's baseline moves
+                            cache_key = report_cache.key(content_digest, variant="dashboard", history=f"archive={run_id}")
+                    except sqlite3.Error as e:
+                        # The report already exists; a missing history row must not fail the upload
+                        st.warning(f"⚠️ Run not archived: {str(e)}")
+                if cache_key and ReportCache.cacheable(report_data):
+                    report_cache.store(cache_key, pdf_path, summary=ReportCache.summarize(report_data))
+                profile_dir = profiler.dump(pdf_path)
             
             # Complete
             progress_bar.progress(100)
@@ -216,6 +315,15 @@ if uploaded_file is not None:
             with st.expander("📄 View Raw Text (Copy/Paste Friendly)"):
                 st.text(insights)
             
+            if profiler.timings:
+                with st.expander("⏱️ Stage Timings"):
+                    st.table(pd.DataFrame(
+                        [(stage, f"{seconds:.3f}s") for stage, seconds in profiler.timings.items()],
+                        columns=["Stage", "Time"]
+                    ))
+                    if profile_dir:
+                        st.caption(f"🔬 CPU profiles and allocation sites saved to `{profile_dir}`")
+            
             st.markdown("---")
             
             # Download button
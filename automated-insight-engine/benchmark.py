@@ -0,0 +1,230 @@
+"""Micro-benchmarks for the analysis pipeline.
+
+    python benchmark.py screening --rows 50000 --columns 500
+    python benchmark.py concurrency --levels 1,2,4,8
+    python benchmark.py scheduling --backfill-files 30 --hours 1
+"""
+import argparse
+import os
+import tempfile
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+import numpy as np
+import polars as pl
+from src.config import Config
+
+
+def synthetic_wide_frame(rows: int, columns: int, anomalies: int, seed: int = 42) -> tuple:
+    """Wide frame built from a few latent factors (so most columns are near-duplicates),
+    plus constant and ID columns and a set of injected anomalous rows"""
+    rng = np.random.default_rng(seed)
+    factors = rng.standard_normal((rows, 8))
+    loadings = rng.standard_normal((8, columns))
+    values = factors @ loadings + 0.05 * rng.standard_normal((rows, columns))
+
+    # Every fourth column is an exact rescaling of its neighbour, every tenth is flat
+    rescaled = values[:, 1::4].shape[1]
+    values[:, 1::4] = values[:, 0::4][:, :rescaled] * 3.0
+    values[:, ::10] = 1.0
+
+    injected = rng.choice(rows, anomalies, replace=False)
+    values[injected] += rng.choice([-1.0, 1.0], (anomalies, 1)) * 12.0
+
+    data = {"record_id": np.arange(rows)}
+    data.update({f"metric_{i:03d}": values[:, i] for i in range(columns)})
+    return pl.DataFrame(data), set(injected.tolist())
+
+
+def bench_screening(args):
+    from src.processing.anomaly_detector import AnomalyDetector
+    from src.processing.feature_matrix import FeatureMatrix
+    from src.processing.feature_screening import FeatureScreener
+
+    df, injected = synthetic_wide_frame(args.rows, args.columns, args.anomalies)
+    features = FeatureMatrix.from_frame(df)
+    print(f"{args.rows:,} rows × {features.n_features} numeric columns, {len(injected)} injected anomalies")
+    print(f"{'variant':<12}{'features':>10}{'screen s':>10}{'detect s':>10}{'recall':>8}")
+
+    for projection in ["off", "none", "pca", "random"]:
+        start = time.perf_counter()
+        if projection == "off":
+            screened, value_columns = features, None
+        else:
+            screened, report = FeatureScreener(projection=projection).screen(features)
+            value_columns = report["kept"]
+        screen_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        detector = AnomalyDetector()
+        detector.detect(df, features=screened, value_columns=value_columns)
+        detect_seconds = time.perf_counter() - start
+
+        # The report keeps only the top 10, so score recall on the fitted model: of the len(injected)
+        # most anomalous rows, how many were injected
+        scores = detector.model.score_samples(screened.values)
+        found = set(np.argsort(scores)[:len(injected)].tolist())
+        recall = len(found & injected) / len(injected)
+        print(f"{projection:<12}{screened.n_features:>10}{screen_seconds:>10.2f}{detect_seconds:>10.2f}{recall:>8.1%}")
+
+
+def _concurrency_worker_init(threads: int):
+    """Fresh (spawned) process: fix every pool to `threads` before anything starts one"""
+    from src.runtime.concurrency import apply_thread_budget
+    os.environ["THREADS_PER_JOB"] = str(threads)
+    Config.init()
+    apply_thread_budget(1)
+
+
+def _analyze(file_path: str) -> int:
+    """The CPU-bound core of the pipeline: load, prepare, metrics and detection"""
+    from src.ingestion.data_loader import DataLoader
+    from src.processing.anomaly_detector import AnomalyDetector
+    from src.processing.data_processor import DataProcessor
+    from src.processing.feature_matrix import FeatureMatrix
+
+    df = DataLoader.load_csv(Path(file_path))
+    processor = DataProcessor()
+    df_clean = processor.prepare_for_ml(df)
+    features = FeatureMatrix.from_frame(df_clean)
+    processor.calculate_metrics(df_clean, numeric_cols=features.columns)
+    AnomalyDetector().detect(df_clean, features=features)
+    return df.height
+
+
+def bench_concurrency(args):
+    from src.runtime.concurrency import available_cpus
+
+    cpus = Config.CPU_BUDGET or available_cpus()
+    levels = [int(level) for level in args.levels.split(",")]
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = Path(tmp) / "bench.csv"
+        synthetic_wide_frame(args.rows, args.columns, args.rows // 100)[0].write_csv(file_path)
+        print(f"{args.rows:,} rows × {args.columns} columns per file, {cpus} CPU(s), "
+              f"{args.files_per_worker} file(s) per concurrent worker")
+        print(f"{'concurrent':>10}{'threads/job':>20}{'wall s':>10}{'files/s':>10}{'rows/s':>12}")
+
+        for level in levels:
+            # Unbudgeted: every job sizes its pools to all cores, as with n_jobs=-1 and default Polars
+            for label, threads in (("budgeted", max(1, cpus // level)), ("all cores", cpus)):
+                files = [str(file_path)] * level * args.files_per_worker
+                with ProcessPoolExecutor(max_workers=level, mp_context=get_context("spawn"),
+                                         initializer=_concurrency_worker_init, initargs=(threads,)) as pool:
+                    list(pool.map(_analyze, files[:level]))  # warm up imports in every worker
+                    start = time.perf_counter()
+                    rows = sum(pool.map(_analyze, files))
+                    wall = time.perf_counter() - start
+                print(f"{level:>10}{f'{label} ({threads})':>20}{wall:>10.2f}{len(files) / wall:>10.2f}{rows / wall:>12,.0f}")
+
+
+def _mixed_workload(args, rng: random.Random) -> list:
+    """(arrival s, path, size MB, true s/MB): a backfill dropped at t=0, hourly files on a beat, ad-hoc files at random"""
+    jobs = [(0.0, Config.INPUT_DIR / "backfill" / f"events_2024{i // 28 + 1:02d}{i % 28 + 1:02d}.csv",
+             args.backfill_mb, 0.05) for i in range(args.backfill_files)]
+    horizon = args.hours * 3600
+    jobs += [(t, Config.INPUT_DIR / "hourly" / f"orders_{int(t)}.csv", rng.uniform(2, 10), 0.1)
+             for t in np.arange(args.hourly_interval, horizon, args.hourly_interval)]
+    t = 0.0
+    while (t := t + rng.expovariate(1 / args.adhoc_interval)) < horizon:
+        jobs.append((t, Config.INPUT_DIR / f"campaign_{int(t)}.csv", rng.lognormvariate(4, 1), 0.08))
+    return sorted(jobs, key=lambda job: job[0])
+
+
+def _simulate(jobs: list, pick, rng: random.Random) -> list:
+    """Single worker, non-preemptive; returns (path, latency s) in completion order"""
+    clock, waiting, done, arrivals = 0.0, [], [], list(jobs)
+    while arrivals or waiting:
+        if not waiting:
+            clock = max(clock, arrivals[0][0])
+        while arrivals and arrivals[0][0] <= clock:
+            waiting.append(arrivals.pop(0))
+        job = pick(waiting, clock)
+        waiting.remove(job)
+        arrived, path, size_mb, rate = job
+        clock += rate * max(size_mb, 1) * rng.uniform(0.8, 1.2)
+        done.append((path, clock - arrived))
+    return done
+
+
+def bench_scheduling(args):
+    from src.runtime.scheduler import CLASS_NAMES, JobHistory, JobScheduler
+
+    Config.PRIORITY_HIGH_PATTERNS = [args.high]
+    Config.PRIORITY_LOW_PATTERNS = [args.low]
+    jobs = _mixed_workload(args, random.Random(args.seed))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Timing history as a scheduler would have it after a few earlier runs of each feed
+        history = JobHistory(path=Path(tmp) / "timings.json")
+        seen = {}
+        for _, path, size_mb, rate in jobs:
+            seen.setdefault(path.stem.split("_")[0], (path, size_mb, rate))
+        for path, size_mb, rate in seen.values():
+            for _ in range(3):
+                history.observe(path, rate * max(size_mb, 1) * random.uniform(0.8, 1.2), size=int(size_mb * 1024 ** 2))
+        scheduler = JobScheduler(history=history)
+        classes = {job[1]: scheduler.classify(job[1]) for job in jobs}
+        expected = {job[1]: history.expected_seconds(job[1], size=int(job[2] * 1024 ** 2)) for job in jobs}
+
+        def scheduled(waiting, now):
+            return min(waiting, key=lambda job: scheduler.sort_key(classes[job[1]], expected[job[1]], now - job[0]))
+
+        policies = {
+            "fifo (event order)": lambda waiting, now: waiting[0],
+            "sjf only": lambda waiting, now: min(waiting, key=lambda job: expected[job[1]]),
+            "scheduler": scheduled,
+        }
+        print(f"{len(jobs)} files: {args.backfill_files} × {args.backfill_mb:,} MB backfill at t=0, hourly files every "
+              f"{args.hourly_interval}s and ad-hoc files every ~{args.adhoc_interval}s for {args.hours}h, one worker")
+        print(f"{'policy':<20}{'class':>8}{'files':>7}{'mean s':>10}{'p95 s':>10}{'max s':>10}")
+        for name, pick in policies.items():
+            done = _simulate(jobs, pick, random.Random(args.seed))
+            groups = {"all": [latency for _, latency in done]}
+            for path, latency in done:
+                groups.setdefault(CLASS_NAMES[classes[path]], []).append(latency)
+            for label in ("all", "high", "normal", "low"):
+                latencies = np.array(groups.get(label, []))
+                if len(latencies):
+                    print(f"{name if label == 'all' else '':<20}{label:>8}{len(latencies):>7}{latencies.mean():>10.1f}"
+                          f"{np.percentile(latencies, 95):>10.1f}{latencies.max():>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Insight Engine benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    screening = subparsers.add_parser("screening", help="Detection time and recall with and without feature screening")
+    screening.add_argument("--rows", type=int, default=50000)
+    screening.add_argument("--columns", type=int, default=500)
+    screening.add_argument("--anomalies", type=int, default=200)
+    screening.set_defaults(run=bench_screening)
+
+    concurrency = subparsers.add_parser("concurrency", help="Aggregate throughput at several concurrent files, "
+                                                            "with and without the thread budget")
+    concurrency.add_argument("--levels", default="1,2,4,8", help="Comma-separated concurrent file counts")
+    concurrency.add_argument("--rows", type=int, default=200000)
+    concurrency.add_argument("--columns", type=int, default=20)
+    concurrency.add_argument("--files-per-worker", type=int, default=2)
+    concurrency.set_defaults(run=bench_concurrency)
+
+    scheduling = subparsers.add_parser("scheduling", help="Mean and p95 report latency under a mixed workload, "
+                                                          "event order vs. the scheduler (simulated clock)")
+    scheduling.add_argument("--backfill-files", type=int, default=30)
+    scheduling.add_argument("--backfill-mb", type=int, default=1024)
+    scheduling.add_argument("--hours", type=float, default=1)
+    scheduling.add_argument("--hourly-interval", type=float, default=60, help="Seconds between hourly-feed files")
+    scheduling.add_argument("--adhoc-interval", type=float, default=90, help="Mean seconds between ad-hoc files")
+    scheduling.add_argument("--high", default="hourly/*", help="Pattern for the high priority class")
+    scheduling.add_argument("--low", default="backfill/*", help="Pattern for the low priority class")
+    scheduling.add_argument("--seed", type=int, default=7)
+    scheduling.set_defaults(run=bench_scheduling)
+
+    args = parser.parse_args()
+    Config.init()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
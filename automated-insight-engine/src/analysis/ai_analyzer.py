@@ -1,14 +1,32 @@
-import google.generativeai as genai
 import json
 import logging
+import queue
+import threading
+import time
 from src.config import Config
+from src.analysis.narrative_engine import NarrativeEngine
 
 logger = logging.getLogger(__name__)
 
 class AIAnalyzer:
-    """Generate AI-driven insights using Gemini"""
+    """Generate AI-driven insights using Gemini, or the local narrative engine in fast mode / past the deadline"""
     
     def __init__(self):
+        # Resolved on first use: the Gemini SDK import and model listing are slow and need the network
+        self._model = None
+        self.model_name = None
+        self.narrative_engine = NarrativeEngine()
+        self.last_source = None  # "llm", "partial" (stream cut short) or "narrative", for labelling the report
+    
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = self._init_model()
+        return self._model
+    
+    def _init_model(self):
+        import google.generativeai as genai
+        
         genai.configure(api_key=Config.GEMINI_API_KEY)
         
         # List available models and use the first one that supports generateContent
@@ -22,7 +40,7 @@ class AIAnalyzer:
                 # Use the first available model (usually gemini-1.5-flash or similar)
                 self.model_name = available_models[0].replace('models/', '')
                 logger.info(f"✓ Using model: {self.model_name}")
-                self.model = genai.GenerativeModel(self.model_name)
+                return genai.GenerativeModel(self.model_name)
             else:
                 raise ValueError("No compatible models found")
                 
@@ -30,19 +48,145 @@ class AIAnalyzer:
             logger.error(f"❌ Model initialization failed: {str(e)}")
             # Fallback to known working model
             self.model_name = "gemini-1.5-flash-latest"
-            self.model = genai.GenerativeModel(self.model_name)
             logger.info(f"✓ Using fallback model: {self.model_name}")
+            return genai.GenerativeModel(self.model_name)
         
     def generate_insights(self, metrics: dict, anomalies: dict) -> str:
         """Generate narrative insights from data analysis"""
+        if Config.INSIGHT_MODE == "fast":
+            return self._narrative(metrics, anomalies)
         try:
-            logger.info(f"🤖 Generating AI insights with {self.model_name}...")
+            prompt = self._build_prompt(metrics, anomalies)
+            
+            def call():
+                model = self.model
+                logger.info(f"🤖 Generating AI insights with {self.model_name}...")
+                return model.generate_content(prompt, generation_config=self._generation_config()).text
             
-            # Build structured context for the AI
-            context = self._build_context(metrics, anomalies)
+            insights = self._with_deadline(call)
+            logger.info("✓ AI insights generated successfully")
+            self.last_source = "llm"
+            
+            return insights
             
-            # Few-shot prompt engineering
-            prompt = f"""You are a Senior Data Analyst preparing an executive summary report.
+        except TimeoutError as e:
+            logger.warning(f"⏳ {str(e)}, using the local narrative")
+            return self._narrative(metrics, anomalies)
+        except Exception as e:
+            logger.error(f"❌ AI analysis failed: {str(e)}")
+            # Deterministic narrative from the same metrics as fallback
+            return self._narrative(metrics, anomalies)
+    
+    def stream_insights(self, metrics: dict, anomalies: dict):
+        """Yield insight text chunks as the model produces them (the local narrative in fast mode,
+        or if the call fails or misses the deadline before any text).
+
+        LLM_DEADLINE_SECONDS bounds the whole response, not just the first token: a stream that stalls
+        or runs long is cut off with a note, and the insights are marked "partial".
+        """
+        if Config.INSIGHT_MODE == "fast":
+            yield self._narrative(metrics, anomalies)
+            return
+        started = time.time()
+        ends_at = started + Config.LLM_DEADLINE_SECONDS if Config.LLM_DEADLINE_SECONDS > 0 else None
+        streamed = False
+        try:
+            prompt = self._build_prompt(metrics, anomalies)
+            
+            def call():
+                model = self.model
+                logger.info(f"🤖 Streaming AI insights with {self.model_name}...")
+                # The SDK fetches the first chunk before returning
+                return model.generate_content(prompt, generation_config=self._generation_config(), stream=True)
+            
+            for chunk in self._chunks_until(self._with_deadline(call, self._remaining(ends_at)), ends_at):
+                text = chunk.text
+                if not text:
+                    continue
+                if not streamed:
+                    logger.info(f"✓ First insight tokens after {time.time() - started:.2f}s")
+                    streamed = True
+                    self.last_source = "llm"
+                yield text
+            
+            logger.info(f"✓ AI insights streamed in {time.time() - started:.2f}s")
+            
+        except TimeoutError as e:
+            if streamed:
+                logger.warning(f"⏳ {str(e)}, cutting the streamed insights short")
+                self.last_source = "partial"
+                yield "\n\n*(Response cut off at the analysis deadline.)*"
+            else:
+                logger.warning(f"⏳ {str(e)}, using the local narrative")
+                yield self._narrative(metrics, anomalies)
+        except Exception as e:
+            logger.error(f"❌ AI analysis failed: {str(e)}")
+            if streamed:
+                self.last_source = "partial"
+            else:
+                yield self._narrative(metrics, anomalies)
+    
+    @classmethod
+    def _chunks_until(cls, response, ends_at: float):
+        """Iterate a streamed response, each chunk waited for only until ends_at (None: no deadline)"""
+        chunks = iter(response)
+        if ends_at is None:
+            yield from chunks
+            return
+        while (chunk := cls._with_deadline(lambda: next(chunks, None), cls._remaining(ends_at))) is not None:
+            yield chunk
+    
+    @staticmethod
+    def _remaining(ends_at: float) -> float:
+        if ends_at is None:
+            return None
+        remaining = ends_at - time.time()
+        if remaining <= 0:
+            raise TimeoutError(f"LLM deadline of {Config.LLM_DEADLINE_SECONDS:g}s exceeded")
+        return remaining
+    
+    def _narrative(self, metrics: dict, anomalies: dict) -> str:
+        self.last_source = "narrative"
+        return self.narrative_engine.generate(metrics, anomalies)
+    
+    @staticmethod
+    def _with_deadline(call, timeout: float = None):
+        """Run call on a daemon thread and give up after timeout (default LLM_DEADLINE_SECONDS); a late
+        response is discarded"""
+        timeout = Config.LLM_DEADLINE_SECONDS if timeout is None else timeout
+        if timeout <= 0:
+            return call()
+        
+        outcome = queue.Queue(maxsize=1)
+        
+        def run():
+            try:
+                outcome.put((True, call()))
+            except Exception as e:
+                outcome.put((False, e))
+        
+        threading.Thread(target=run, name="llm-call", daemon=True).start()
+        try:
+            ok, value = outcome.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"LLM deadline of {Config.LLM_DEADLINE_SECONDS:g}s exceeded")
+        if not ok:
+            raise value
+        return value
+    
+    @staticmethod
+    def _generation_config() -> dict:
+        return {
+            "temperature": Config.TEMPERATURE,
+            "max_output_tokens": Config.MAX_TOKENS,
+        }
+    
+    def _build_prompt(self, metrics: dict, anomalies: dict) -> str:
+        """Few-shot prompt around the structured context"""
+        # Build structured context for the AI
+        context = self._build_context(metrics, anomalies)
+        
+        return f"""You are a Senior Data Analyst preparing an executive summary report.
 
 STRICT RULES:
 1. Only use the data provided in the context below
@@ -61,24 +205,6 @@ Generate a concise executive summary covering:
 4. Recommended Actions (2-3 actionable items)
 
 Keep the total response under 300 words."""
-
-            response = self.model.generate_content(
-                prompt,
-                generation_config={
-                    "temperature": Config.TEMPERATURE,
-                    "max_output_tokens": Config.MAX_TOKENS,
-                }
-            )
-            
-            insights = response.text
-            logger.info("✓ AI insights generated successfully")
-            
-            return insights
-            
-        except Exception as e:
-            logger.error(f"❌ AI analysis failed: {str(e)}")
-            # Return mock insights as fallback
-            return self._generate_mock_insights(metrics, anomalies)
     
     def _build_context(self, metrics: dict, anomalies: dict) -> dict:
         """Build structured context for AI analysis"""
@@ -96,31 +222,25 @@ Keep the total response under 300 words."""
             }
         }
         
-        return context
-    
-    def _generate_mock_insights(self, metrics: dict, anomalies: dict) -> str:
-        """Generate mock insights when API fails"""
-        total_rows = metrics.get("total_rows", 0)
-        anomaly_count = anomalies.get("anomaly_count", 0)
-        anomaly_pct = anomalies.get("anomaly_percentage", 0)
+        quality = metrics.get("quality")
+        if quality:
+            context["data_quality"] = {
+                "duplicate_rows": quality["duplicate_rows"],
+                "numeric_null_rate": round(quality["numeric_null_rate"], 4),
+                "all_null_columns": quality["all_null_columns"],
+                "constant_columns": quality["constant_columns"],
+                "near_constant_columns": quality["near_constant_columns"]
+            }
         
-        return f"""**Overall Data Health**
-
-The dataset contains {total_rows:,} campaign records with comprehensive performance metrics. Data quality is strong with complete coverage across all numeric columns. Campaign performance exhibits typical variance within expected operational ranges.
-
-**Key Findings**
-
-• Detected {anomaly_count} anomalous campaigns ({anomaly_pct}%) deviating significantly from normal patterns
-• Click-through rates show unusual drops in specific campaigns, indicating potential ad fatigue
-• Cost outliers suggest some campaigns may be overspending relative to engagement
-• Revenue-to-cost ratios vary significantly, presenting optimization opportunities
-
-**Anomalies Detected**
-
-The Isolation Forest algorithm identified {anomaly_count} statistically significant outliers. Primary anomaly patterns include unusually low click rates, disproportionately high costs, and conversion rates outside the 95th percentile.
-
-**Recommended Actions**
-
-1. Audit top 10 anomalous campaigns for budget waste or technical issues
-2. Implement A/B testing on underperforming segments to identify root causes
-3. Set up automated alerts for campaigns exhibiting similar anomaly patterns"""
+        time_series = metrics.get("time_series")
+        if time_series:
+            context["time_series"] = {
+                "timestamp_column": time_series["timestamp_column"],
+                "interval": time_series["interval"],
+                "range": [time_series["start"], time_series["end"]],
+                "window_count": time_series["window_count"],
+                "latest_period_change_pct": time_series["period_over_period"],
+                "flagged_windows": time_series["flagged_windows"][:5]
+            }
+        
+        return context
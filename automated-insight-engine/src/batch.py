@@ -0,0 +1,127 @@
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from src.config import Config
+from src.runtime.admission import AdmissionController
+from src.runtime.concurrency import apply_thread_budget, set_thread_environment
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_SUFFIXES = {'.csv', '.parquet'}
+
+# One engine per pool process, built once by the initializer and reused for every file it handles
+_ENGINE = None
+
+
+def _init_worker(force_refresh: bool, profile: bool, workers: int):
+    """Pool initializer: warm the analyzer client, templates and models once per process"""
+    global _ENGINE
+    from src.main import InsightEngine
+    Config.init()
+    apply_thread_budget(workers)
+    _ENGINE = InsightEngine(force_refresh=force_refresh, profile=profile)
+
+
+def _process(file_path: str) -> dict:
+    """Run one file through the warm engine; failures are reported, never raised, so the pool keeps going"""
+    started = time.time()
+    try:
+        report_path = _ENGINE.process_file(Path(file_path))
+        return {"file": file_path, "status": "ok", "report": str(report_path),
+                "seconds": round(time.time() - started, 3), "worker": os.getpid()}
+    except Exception as e:
+        return {"file": file_path, "status": "failed", "error": str(e),
+                "seconds": round(time.time() - started, 3), "worker": os.getpid()}
+
+
+def collect_files(sources: list) -> list:
+    """Expand directories and glob patterns into a de-duplicated list of supported files"""
+    files = set()
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            candidates = path.rglob("*")
+        elif path.is_file():
+            candidates = [path]
+        else:
+            candidates = (Path(p) for p in glob.glob(source, recursive=True))
+        files.update(p.resolve() for p in candidates if p.is_file() and p.suffix.lower() in SUPPORTED_SUFFIXES)
+    return list(files)
+
+
+def run_batch(sources: list, workers: int = None, summary_path: Path = None, force_refresh: bool = False,
+              profile: bool = None) -> dict:
+    """Process every matching file across a process pool and write a JSON run summary"""
+    # Sizes are taken once, up front: a file may be moved or deleted by the time its job finishes
+    sizes = {path: path.stat().st_size for path in collect_files(sources)}
+    # Largest first: long jobs start early instead of becoming the tail that one worker runs alone
+    files = sorted(sizes, key=sizes.get, reverse=True)
+    workers = max(1, min(workers or Config.BATCH_WORKERS, len(files) or 1))
+
+    logger.info(f"📦 Batch of {len(files)} file(s) across {workers} worker(s)")
+    started_at = datetime.now()
+    started = time.time()
+    results = []
+
+    if files:
+        # The parent admits jobs against the memory budget; each worker then runs one file at a time
+        controller = AdmissionController() if Config.ADMISSION_ENABLED else None
+        lock = threading.Lock()
+
+        def on_done(future, path, admission):
+            if controller is not None:
+                controller.release(admission)
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker process itself died (e.g. killed for memory)
+                result = {"file": str(path), "status": "failed", "error": repr(e), "seconds": None, "worker": None}
+            result["bytes"] = sizes[path]
+            with lock:
+                results.append(result)
+                icon = "✓" if result["status"] == "ok" else "❌"
+                logger.info(f"{icon} [{len(results)}/{len(files)}] {path.name} in {result['seconds'] or 0:.1f}s")
+
+        # Workers inherit the per-job thread settings; the parent itself must not start a Polars pool before forking
+        set_thread_environment(workers)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(force_refresh, profile, workers)) as pool:
+            futures = []
+            for path in files:
+                admission = None
+                if controller is not None:
+                    admission = controller.plan(path)
+                    controller.acquire(admission)
+                future = pool.submit(_process, str(path))
+                future.add_done_callback(lambda f, p=path, a=admission: on_done(f, p, a))
+                futures.append(future)
+            wait(futures)
+
+    failed = [r for r in results if r["status"] != "ok"]
+    summary = {
+        "started_at": started_at.isoformat(timespec='seconds'),
+        "wall_seconds": round(time.time() - started, 3),
+        "workers": workers,
+        "total": len(results),
+        "succeeded": len(results) - len(failed),
+        "failed": len(failed),
+        "files": sorted(results, key=lambda r: r["file"])
+    }
+
+    summary_path = Path(summary_path or Config.BATCH_SUMMARY_DIR / f"batch_{started_at.strftime('%Y%m%d_%H%M%S')}.json")
+    summary_path.parent.mkdir(parents=True, exist_ok=True)
+    summary_path.write_text(json.dumps(summary, indent=2), encoding='utf-8')
+
+    if failed:
+        logger.warning(f"⚠️ Batch finished with {len(failed)} failure(s) in {summary['wall_seconds']:.1f}s")
+    else:
+        logger.info(f"✅ Batch finished in {summary['wall_seconds']:.1f}s")
+    logger.info(f"📄 Run summary: {summary_path}")
+    summary["summary_path"] = str(summary_path)
+    return summary
@@ -2,9 +2,6 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
-
 class Config:
     """Centralized configuration management"""
     
@@ -15,15 +12,141 @@ class Config:
     OUTPUT_DIR = DATA_DIR / "output"
     TEMPLATE_DIR = BASE_DIR / "src" / "templates"
     
-    # Gemini API
-    GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-    GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-pro")
-    TEMPERATURE = float(os.getenv("TEMPERATURE", "0.3"))
-    MAX_TOKENS = int(os.getenv("MAX_TOKENS", "2048"))
+    _initialized = False
     
-    # ML Model Configuration
-    CONTAMINATION_FACTOR = float(os.getenv("CONTAMINATION_FACTOR", "0.1"))
-    N_ESTIMATORS = int(os.getenv("N_ESTIMATORS", "100"))
+    @classmethod
+    def load(cls):
+        """(Re)read settings from the environment; cheap and free of side effects"""
+        # Gemini API
+        cls.GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+        cls.GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-pro")
+        cls.TEMPERATURE = float(os.getenv("TEMPERATURE", "0.3"))
+        cls.MAX_TOKENS = int(os.getenv("MAX_TOKENS", "2048"))
+        cls.INSIGHT_MODE = os.getenv("INSIGHT_MODE", "llm").lower()  # llm, or fast for the local narrative only
+        cls.LLM_DEADLINE_SECONDS = float(os.getenv("LLM_DEADLINE_SECONDS", "20"))  # 0 waits indefinitely
+        
+        # ML Model Configuration
+        cls.CONTAMINATION_FACTOR = float(os.getenv("CONTAMINATION_FACTOR", "0.1"))
+        cls.N_ESTIMATORS = int(os.getenv("N_ESTIMATORS", "100"))
+        cls.FEATURE_DTYPE = os.getenv("FEATURE_DTYPE", "float32")  # float32 halves detection memory
+        
+        # Segmented Analysis (per-dimension metrics and detection)
+        cls.SEGMENT_MODE = os.getenv("SEGMENT_MODE", "false").lower() == "true"
+        cls.SEGMENT_COLUMNS = [c.strip() for c in os.getenv("SEGMENT_COLUMNS", "").split(",") if c.strip()]
+        cls.SEGMENT_MAX_CARDINALITY = int(os.getenv("SEGMENT_MAX_CARDINALITY", "50"))
+        cls.SEGMENT_MIN_ROWS = int(os.getenv("SEGMENT_MIN_ROWS", "20"))
+        cls.SEGMENT_BATCH_ROWS = int(os.getenv("SEGMENT_BATCH_ROWS", "5000"))
+        cls.SEGMENT_WORKERS = int(os.getenv("SEGMENT_WORKERS", "0"))  # 0 = the job's share of CPU_BUDGET
+        cls.SEGMENT_TOP_ANOMALIES = int(os.getenv("SEGMENT_TOP_ANOMALIES", "3"))
+        
+        # Time-Series Analysis (resampled windows over the primary timestamp)
+        cls.TIME_SERIES_ENABLED = os.getenv("TIME_SERIES_ENABLED", "true").lower() == "true"
+        cls.TIMESTAMP_COLUMN = os.getenv("TIMESTAMP_COLUMN", "")
+        cls.TS_INTERVAL = os.getenv("TS_INTERVAL", "auto")  # auto, or a Polars duration such as 1h / 1d
+        cls.TS_HOURLY_MAX_DAYS = int(os.getenv("TS_HOURLY_MAX_DAYS", "7"))
+        cls.TS_ROLLING_WINDOWS = int(os.getenv("TS_ROLLING_WINDOWS", "7"))
+        cls.TS_ZSCORE_THRESHOLD = float(os.getenv("TS_ZSCORE_THRESHOLD", "3.0"))
+        cls.TS_REPORT_WINDOWS = int(os.getenv("TS_REPORT_WINDOWS", "48"))
+        
+        # Approximate Statistics (sketches instead of exact medians on huge inputs)
+        cls.STATS_MODE = os.getenv("STATS_MODE", "auto")  # auto, exact or approx
+        cls.APPROX_ROW_THRESHOLD = int(os.getenv("APPROX_ROW_THRESHOLD", "5000000"))
+        cls.HLL_PRECISION = int(os.getenv("HLL_PRECISION", "14"))  # ~0.8% distinct-count error
+        cls.STREAM_BATCH_ROWS = int(os.getenv("STREAM_BATCH_ROWS", "100000"))
+        
+        # Incremental State (mergeable per-feed aggregates across runs)
+        cls.INCREMENTAL_ENABLED = os.getenv("INCREMENTAL_ENABLED", "true").lower() == "true"
+        cls.STATE_DIR = Path(os.getenv("STATE_DIR", str(cls.DATA_DIR / "state")))
+        cls.ROLLING_RUNS = int(os.getenv("ROLLING_RUNS", "7"))
+        cls.SKETCH_K = int(os.getenv("SKETCH_K", "200"))
+        
+        # Job Queue (multi-worker processing on a shared volume)
+        cls.QUEUE_DB_PATH = Path(os.getenv("QUEUE_DB_PATH", str(cls.DATA_DIR / "queue" / "jobs.db")))
+        cls.QUEUE_LEASE_SECONDS = float(os.getenv("QUEUE_LEASE_SECONDS", "300"))
+        cls.QUEUE_MAX_ATTEMPTS = int(os.getenv("QUEUE_MAX_ATTEMPTS", "3"))
+        cls.QUEUE_POLL_SECONDS = float(os.getenv("QUEUE_POLL_SECONDS", "2"))
+        cls.QUEUE_SETTLE_SECONDS = float(os.getenv("QUEUE_SETTLE_SECONDS", "2"))  # unchanged this long = fully written
+        
+        # HTTP Ingestion API
+        cls.UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", str(cls.DATA_DIR / "uploads")))
+        cls.HTTP_HOST = os.getenv("HTTP_HOST", "0.0.0.0")
+        cls.HTTP_PORT = int(os.getenv("HTTP_PORT", "8080"))
+        cls.HTTP_WORKERS = int(os.getenv("HTTP_WORKERS", "1"))
+        cls.HTTP_MAX_PENDING = int(os.getenv("HTTP_MAX_PENDING", "32"))
+        cls.HTTP_MAX_UPLOAD_BYTES = int(os.getenv("HTTP_MAX_UPLOAD_BYTES", str(10 * 1024**3)))
+        cls.HTTP_RETRY_AFTER_SECONDS = int(os.getenv("HTTP_RETRY_AFTER_SECONDS", "30"))
+        
+        # Report Cache (skip the whole pipeline for identical input + settings)
+        cls.REPORT_CACHE_ENABLED = os.getenv("REPORT_CACHE_ENABLED", "true").lower() == "true"
+        cls.REPORT_CACHE_DIR = Path(os.getenv("REPORT_CACHE_DIR", str(cls.DATA_DIR / "cache" / "reports")))
+        cls.REPORT_CACHE_MAX_AGE_HOURS = float(os.getenv("REPORT_CACHE_MAX_AGE_HOURS", "168"))
+        cls.REPORT_CACHE_MAX_BYTES = int(os.getenv("REPORT_CACHE_MAX_BYTES", str(2 * 1024**3)))
+        
+        # Concurrency (one CPU budget split between concurrent files and their Polars/BLAS/joblib threads)
+        cls.CPU_BUDGET = int(os.getenv("CPU_BUDGET", "0"))  # 0 = cores available to this container
+        cls.THREADS_PER_JOB = int(os.getenv("THREADS_PER_JOB", "0"))  # 0 = CPU_BUDGET / concurrent files
+        
+        # Scheduling (priority classes by file pattern, shortest expected job first within a class)
+        cls.SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "false").lower() == "true"  # also makes the watcher recursive
+        cls.PRIORITY_HIGH_PATTERNS = [p.strip() for p in os.getenv("PRIORITY_HIGH_PATTERNS", "").split(",") if p.strip()]
+        cls.PRIORITY_LOW_PATTERNS = [p.strip() for p in os.getenv("PRIORITY_LOW_PATTERNS", "").split(",") if p.strip()]
+        cls.SCHEDULER_CLASS_GAP_SECONDS = float(os.getenv("SCHEDULER_CLASS_GAP_SECONDS", "600"))
+        cls.SCHEDULER_AGING_RATE = float(os.getenv("SCHEDULER_AGING_RATE", "0.25"))  # key seconds earned per second waited
+        cls.SCHEDULER_DEFAULT_SECONDS_PER_MB = float(os.getenv("SCHEDULER_DEFAULT_SECONDS_PER_MB", "0.5"))
+        cls.SCHEDULER_HISTORY_PATH = Path(os.getenv("SCHEDULER_HISTORY_PATH", str(cls.STATE_DIR / "job_timings.json")))
+        
+        # Batch Mode (process an existing archive across a process pool)
+        cls.BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", str(os.cpu_count() or 1)))
+        cls.BATCH_SUMMARY_DIR = Path(os.getenv("BATCH_SUMMARY_DIR", str(cls.DATA_DIR / "batch")))
+        
+        # Admission Control (memory budget shared by concurrently processed files)
+        cls.ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+        cls.MEMORY_BUDGET_MB = int(os.getenv("MEMORY_BUDGET_MB", "0"))  # 0 = 60% of the container/host memory
+        cls.STREAMING_FRACTION = float(os.getenv("STREAMING_FRACTION", "0.5"))  # estimates above this share of the budget stream
+        cls.ANALYSIS_SAMPLE_ROWS = int(os.getenv("ANALYSIS_SAMPLE_ROWS", "500000"))  # rows kept for detection on the streaming path
+        cls.MEMORY_MODEL_PATH = Path(os.getenv("MEMORY_MODEL_PATH", str(cls.STATE_DIR / "memory_model.json")))
+        
+        # Data Quality (single-pass profile; failing gates skip detection and the LLM)
+        cls.QUALITY_GATES_ENABLED = os.getenv("QUALITY_GATES_ENABLED", "true").lower() == "true"
+        cls.QUALITY_MIN_ROWS = int(os.getenv("QUALITY_MIN_ROWS", "10"))
+        cls.QUALITY_MAX_NULL_RATE = float(os.getenv("QUALITY_MAX_NULL_RATE", "0.5"))  # share of null numeric cells
+        cls.QUALITY_MAX_DUPLICATE_RATE = float(os.getenv("QUALITY_MAX_DUPLICATE_RATE", "0.5"))
+        cls.QUALITY_NEAR_CONSTANT_SHARE = float(os.getenv("QUALITY_NEAR_CONSTANT_SHARE", "0.99"))
+        cls.QUALITY_HIGH_CARDINALITY_RATIO = float(os.getenv("QUALITY_HIGH_CARDINALITY_RATIO", "0.9"))
+        
+        # Feature Screening (drop constant, ID-like and collinear features before detection)
+        cls.SCREENING_ENABLED = os.getenv("SCREENING_ENABLED", "true").lower() == "true"
+        cls.SCREEN_MAX_CORRELATION = float(os.getenv("SCREEN_MAX_CORRELATION", "0.95"))
+        cls.SCREEN_DROP_IDS = os.getenv("SCREEN_DROP_IDS", "true").lower() == "true"
+        cls.SCREEN_PROJECTION = os.getenv("SCREEN_PROJECTION", "none")  # none, pca or random
+        cls.SCREEN_TARGET_DIM = int(os.getenv("SCREEN_TARGET_DIM", "32"))
+        cls.SCREEN_SAMPLE_ROWS = int(os.getenv("SCREEN_SAMPLE_ROWS", "5000"))
+        
+        # Alerts (compact anomaly event right after detection, before the LLM and PDF)
+        cls.ALERTS_ENABLED = os.getenv("ALERTS_ENABLED", "true").lower() == "true"
+        cls.ALERT_SINKS = [s.strip() for s in os.getenv("ALERT_SINKS", "file").split(",") if s.strip()]  # file, stdout, webhook
+        cls.ALERT_FILE = Path(os.getenv("ALERT_FILE", str(cls.DATA_DIR / "alerts" / "alerts.jsonl")))
+        cls.ALERT_WEBHOOK_URL = os.getenv("ALERT_WEBHOOK_URL", "")
+        cls.ALERT_WEBHOOK_TIMEOUT = float(os.getenv("ALERT_WEBHOOK_TIMEOUT", "2"))
+        cls.ALERT_TOP_N = int(os.getenv("ALERT_TOP_N", "5"))
+        cls.ALERT_MIN_ANOMALY_RATE = float(os.getenv("ALERT_MIN_ANOMALY_RATE", "0"))
+        
+        # Run Archive (every run's metrics in SQLite, for per-feed history and drift against previous runs)
+        cls.RUN_ARCHIVE_ENABLED = os.getenv("RUN_ARCHIVE_ENABLED", "true").lower() == "true"
+        cls.RUN_ARCHIVE_PATH = Path(os.getenv("RUN_ARCHIVE_PATH", str(cls.DATA_DIR / "history" / "runs.db")))
+        cls.RUN_ARCHIVE_BASELINE_RUNS = int(os.getenv("RUN_ARCHIVE_BASELINE_RUNS", "20"))
+        cls.DRIFT_ZSCORE = float(os.getenv("DRIFT_ZSCORE", "3.0"))
+        cls.DRIFT_MIN_RUNS = int(os.getenv("DRIFT_MIN_RUNS", "3"))  # fewer baseline runs are shown but never flagged
+        
+        # Profiling (per-stage cProfile + tracemalloc, dumped next to the report)
+        cls.PROFILE_ENABLED = os.getenv("PROFILE_ENABLED", "false").lower() == "true"
+        cls.PROFILE_PATTERN = os.getenv("PROFILE_PATTERN", "")  # e.g. "orders_*.csv" profiles only matching files
+        cls.PROFILE_TOP_N = int(os.getenv("PROFILE_TOP_N", "25"))
+        cls.PROFILE_TRACE_FRAMES = int(os.getenv("PROFILE_TRACE_FRAMES", "1"))
+        
+        # Schema Registry (learned dtypes per feed)
+        cls.SCHEMA_REGISTRY_ENABLED = os.getenv("SCHEMA_REGISTRY_ENABLED", "true").lower() == "true"
+        cls.SCHEMA_REGISTRY_PATH = Path(os.getenv("SCHEMA_REGISTRY_PATH", str(cls.DATA_DIR / "schema_registry.json")))
     
     # Ensure directories exist
     @classmethod
@@ -34,11 +157,21 @@ class Config:
     @classmethod
     def validate(cls):
         """Validate critical configuration"""
-        if not cls.GEMINI_API_KEY:
+        if not cls.GEMINI_API_KEY and cls.INSIGHT_MODE != "fast":
             raise ValueError("GEMINI_API_KEY not found in environment variables")
         
         print("✓ Configuration validated successfully")
         return True
+    
+    @classmethod
+    def init(cls, env_file: str = None):
+        """Explicit startup for entry points: load .env, re-read settings and create directories"""
+        if cls._initialized:
+            return
+        load_dotenv(env_file)
+        cls.load()
+        cls.setup_directories()
+        cls._initialized = True
 
-# Setup directories on import
-Config.setup_directories()
+# Settings from the process environment; entry points call Config.init() to add .env and directories
+Config.load()
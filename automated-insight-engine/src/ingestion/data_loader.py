@@ -1,6 +1,8 @@
 import polars as pl
 from pathlib import Path
+import hashlib
 import logging
+from src.ingestion.schema_registry import NUMERIC_DTYPES
 
 logger = logging.getLogger(__name__)
 
@@ -8,17 +10,63 @@ class DataLoader:
     """Handle data loading from various sources"""
     
     @staticmethod
-    def load_csv(file_path: Path) -> pl.DataFrame:
-        """Load CSV file using Polars for faster processing"""
+    def load(file_path: Path, schema_registry=None, coerced: dict = None) -> pl.DataFrame:
+        """Load a CSV or Parquet file based on its extension"""
+        if file_path.suffix.lower() == '.parquet':
+            return DataLoader.load_parquet(file_path)
+        return DataLoader.load_csv(file_path, schema_registry=schema_registry, coerced=coerced)
+    
+    @staticmethod
+    def load_parquet(file_path: Path) -> pl.DataFrame:
+        """Load a Parquet file (typed at the source, so no inference is needed)"""
+        try:
+            logger.info(f"📊 Loading data from {file_path.name}")
+            df = pl.read_parquet(file_path)
+            decimals = [col for col, dtype in df.schema.items() if isinstance(dtype, pl.Decimal)]
+            if decimals:
+                # Decimal supports neither std() nor fill_null(mean); metrics and detection need floats
+                df = df.with_columns(pl.col(decimals).cast(pl.Float64))
+                logger.info(f"ℹ️ Cast decimal columns to Float64: {', '.join(decimals)}")
+            logger.info(f"✓ Loaded {len(df)} rows, {len(df.columns)} columns")
+            return df
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to load Parquet: {str(e)}")
+            raise
+    
+    @staticmethod
+    def load_csv(file_path: Path, schema_registry=None, coerced: dict = None) -> pl.DataFrame:
+        """Load CSV file using Polars for faster processing.
+
+        coerced, if given, receives {column: count} of tokens that did not parse under a learned
+        numeric dtype and were loaded as nulls.
+        """
         try:
             logger.info(f"📊 Loading data from {file_path.name}")
             
-            # Polars provides faster CSV reading than Pandas
-            df = pl.read_csv(
-                file_path,
-                infer_schema_length=10000,  # Scan more rows for better type inference
-                try_parse_dates=True
-            )
+            df = None
+            schema = schema_registry.lookup(file_path) if schema_registry is not None else None
+            
+            if schema is not None:
+                # Known feed: explicit schema skips type inference and date sniffing
+                try:
+                    df = pl.read_csv(file_path, schema=schema)
+                    logger.info("✓ Applied learned schema")
+                except pl.ComputeError as e:
+                    logger.warning(f"⚠️ Learned schema rejected, re-reading with unparseable numbers as nulls: {str(e).splitlines()[0]}")
+                    df = DataLoader._read_coercing(file_path, schema, coerced)
+                    if schema_registry is not None:
+                        schema_registry.learn(file_path, df.schema)
+            
+            if df is None:
+                # Polars provides faster CSV reading than Pandas
+                df = pl.read_csv(
+                    file_path,
+                    infer_schema_length=10000,  # Scan more rows for better type inference
+                    try_parse_dates=True
+                )
+                if schema_registry is not None:
+                    schema_registry.learn(file_path, df.schema)
             
             logger.info(f"✓ Loaded {len(df)} rows, {len(df.columns)} columns")
             return df
@@ -27,6 +75,127 @@ class DataLoader:
             logger.error(f"❌ Failed to load CSV: {str(e)}")
             raise
     
+    @staticmethod
+    def _read_coercing(file_path: Path, schema: dict, coerced: dict = None) -> pl.DataFrame:
+        """Re-infer a file, but keep the learned numeric columns numeric: a stray token such as
+        "NA" becomes a null instead of turning the column (and the feed's schema) into text.
+        An integer column holding decimals is widened to Float64 rather than losing them."""
+        numeric = {col: dtype for col, dtype in schema.items() if dtype in NUMERIC_DTYPES}
+        raw = pl.read_csv(
+            file_path,
+            infer_schema_length=10000,
+            try_parse_dates=True,
+            dtypes={col: pl.Utf8 for col in numeric}
+        )
+        df, counts = DataLoader._parse_numeric(raw, numeric)
+        if counts:
+            logger.warning("⚠️ Unparseable values loaded as nulls: "
+                           + ", ".join(f"{col} ({count})" for col, count in counts.items()))
+        if coerced is not None:
+            coerced.update(counts)
+        return df
+    
+    @staticmethod
+    def _parse_numeric(raw: pl.DataFrame, numeric: dict) -> tuple:
+        """Parse learned numeric columns read as text, returning (frame, {column: tokens nulled})"""
+        columns = []
+        for col, dtype in numeric.items():
+            text = raw[col].str.strip_chars()
+            parsed = text.cast(dtype, strict=False)
+            if dtype not in (pl.Float32, pl.Float64):
+                as_float = text.cast(pl.Float64, strict=False)
+                if (parsed.is_null() & as_float.is_not_null()).any():
+                    parsed = as_float
+            columns.append(parsed)
+        df = raw.with_columns(columns)
+        counts = raw.select(
+            (pl.col(col).is_not_null() & df[col].is_null()).sum() for col in numeric
+        ).row(0, named=True) if numeric else {}
+        return df, {col: count for col, count in counts.items() if count}
+    
+    @staticmethod
+    def read_csv_batches(file_path: Path, batch_size: int = 100000, schema_registry=None, coerced: dict = None):
+        """Yield a CSV file in batches, typed by the feed's learned schema when there is one.
+
+        Learned numeric columns are read as text and parsed per batch, so a stray token deep in the
+        file becomes a null (counted in coerced) instead of failing the read halfway through.
+        """
+        schema = schema_registry.lookup(file_path) if schema_registry is not None else None
+        numeric = {col: dtype for col, dtype in (schema or {}).items() if dtype in NUMERIC_DTYPES}
+        reader = pl.read_csv_batched(
+            file_path,
+            infer_schema_length=10000,
+            try_parse_dates=True,
+            dtypes={col: pl.Utf8 for col in numeric} or None,
+            batch_size=batch_size
+        )
+        if schema is not None:
+            logger.info("✓ Applied learned schema")
+        
+        while (batches := reader.next_batches(4)):
+            for batch in batches:
+                if numeric:
+                    batch, counts = DataLoader._parse_numeric(batch, numeric)
+                    if coerced is not None:
+                        for col, count in counts.items():
+                            coerced[col] = coerced.get(col, 0) + count
+                yield batch
+    
+    @staticmethod
+    def scan_csv(file_path: Path, schema_registry=None) -> pl.LazyFrame:
+        """Lazily scan a CSV file so downstream stages can stream it"""
+        logger.info(f"📊 Scanning data from {file_path.name}")
+        
+        schema = schema_registry.lookup(file_path) if schema_registry is not None else None
+        if schema is not None:
+            return pl.scan_csv(file_path, schema=schema)
+        
+        return pl.scan_csv(
+            file_path,
+            infer_schema_length=10000,
+            try_parse_dates=True
+        )
+    
+    @staticmethod
+    def sample_csv(file_path: Path, n_rows: int, batch_size: int = 100000, seed: int = 42,
+                   schema_registry=None) -> pl.DataFrame:
+        """Uniform row sample of a CSV read in batches, so memory stays near n_rows rather than the file size"""
+        try:
+            logger.info(f"📊 Sampling up to {n_rows:,} rows from {file_path.name}")
+            
+            # Estimate the row count from the first MiB to pick a per-batch sampling fraction
+            with open(file_path, 'rb') as f:
+                head = f.read(1 << 20)
+            estimated_rows = file_path.stat().st_size / max(len(head) / max(head.count(b'\n'), 1), 1)
+            fraction = min(1.0, 1.1 * n_rows / max(estimated_rows, 1))
+            
+            parts = []
+            batches = DataLoader.read_csv_batches(file_path, batch_size=batch_size, schema_registry=schema_registry)
+            for index, batch in enumerate(batches):
+                parts.append(batch if fraction >= 1.0 else batch.sample(fraction=fraction, seed=seed + index))
+            
+            if not parts:
+                raise ValueError("empty CSV")
+            sample = pl.concat(parts, how="vertical_relaxed")
+            if sample.height > n_rows:
+                sample = sample.sample(n=n_rows, seed=seed)
+            
+            logger.info(f"✓ Sampled {sample.height:,} rows, {sample.width} columns")
+            return sample
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to sample CSV: {str(e)}")
+            raise
+    
+    @staticmethod
+    def file_digest(file_path: Path, chunk_size: int = 1 << 20) -> str:
+        """Content hash of a file, read in chunks so large inputs are never fully buffered"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
     @staticmethod
     def validate_data(df: pl.DataFrame) -> bool:
         """Basic data validation"""
@@ -4,7 +4,6 @@ from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 import logging
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class DataFileHandler(FileSystemEventHandler):
@@ -38,21 +37,25 @@ class DataFileHandler(FileSystemEventHandler):
 class FileWatcher:
     """Monitors directory for new files and triggers processing"""
     
-    def __init__(self, watch_directory, callback):
+    def __init__(self, watch_directory, callback, recursive: bool = False):
         self.watch_directory = Path(watch_directory)
         self.callback = callback
+        self.recursive = recursive  # subdirectories can carry a priority class (hourly/, backfill/)
         self.observer = None
         
-    def start(self):
+    def start(self, block: bool = True):
         """Start monitoring the directory"""
         event_handler = DataFileHandler(self.callback)
         self.observer = Observer()
-        self.observer.schedule(event_handler, str(self.watch_directory), recursive=False)
+        self.observer.schedule(event_handler, str(self.watch_directory), recursive=self.recursive)
         self.observer.start()
         
         logger.info(f"👀 Watching directory: {self.watch_directory}")
         logger.info("🚀 Drop CSV files to start processing...")
         
+        if not block:
+            return
+        
         try:
             while True:
                 time.sleep(1)
@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import os
+import threading
+import uuid
+from pathlib import Path
+from aiohttp import web
+from src.config import Config
+from src.ingestion.job_queue import JobQueue, QueueWorker
+from src.runtime.scheduler import JobScheduler
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_SUFFIXES = {'.csv', '.parquet'}
+_CHUNK_SIZE = 1 << 16
+
+
+class IngestionServer:
+    """Asyncio HTTP front door: streams uploads to disk and enqueues them into the shared job queue"""
+
+    def __init__(self, queue: JobQueue = None, upload_dir: Path = None, max_pending: int = None):
+        self.queue = queue or JobQueue(scheduler=JobScheduler() if Config.SCHEDULER_ENABLED else None)
+        self.upload_dir = Path(upload_dir or Config.UPLOAD_DIR)
+        self.max_pending = max_pending or Config.HTTP_MAX_PENDING
+        self.in_flight = 0
+        self.upload_dir.mkdir(parents=True, exist_ok=True)
+
+    def build_app(self) -> web.Application:
+        app = web.Application()
+        app.add_routes([
+            web.get('/health', self.handle_health),
+            web.post('/jobs', self.handle_upload),
+            web.get('/jobs/{job_id:\\d+}', self.handle_status),
+            web.get('/jobs/{job_id:\\d+}/report', self.handle_report),
+        ])
+        return app
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        pending = await self._run(self.queue.pending_count)
+        return web.json_response({"status": "ok", "pending": pending, "uploading": self.in_flight})
+
+    async def handle_upload(self, request: web.Request) -> web.Response:
+        """POST /jobs?filename=name.csv with the raw file as the (optionally chunked) body"""
+        filename = Path(request.query.get('filename') or request.headers.get('X-Filename', '')).name
+        suffix = Path(filename).suffix.lower()
+        if suffix not in SUPPORTED_SUFFIXES:
+            raise web.HTTPBadRequest(text=f"filename must end with one of {sorted(SUPPORTED_SUFFIXES)}")
+
+        # Backpressure: queued + running + still-uploading jobs are bounded. The slot is taken before
+        # the first await, so concurrent uploads each count the others and can't all slip under the limit
+        self.in_flight += 1
+        part_path = self.upload_dir / f".{uuid.uuid4().hex}.part"
+        try:
+            pending = await self._run(self.queue.pending_count)
+            if pending + self.in_flight > self.max_pending:
+                logger.warning(f"⚠️ Upload of {filename} rejected: {pending} jobs pending")
+                return web.json_response(
+                    {"error": "queue full", "pending": pending},
+                    status=429,
+                    headers={"Retry-After": str(Config.HTTP_RETRY_AFTER_SECONDS)}
+                )
+
+            size = await self._stream_to_disk(request, part_path)
+            final_path = self.upload_dir / f"{Path(filename).stem}_{uuid.uuid4().hex[:8]}{suffix}"
+            os.replace(part_path, final_path)
+            job_id = await self._run(self._enqueue, final_path)
+        finally:
+            self.in_flight -= 1
+            if part_path.exists():
+                part_path.unlink()
+
+        logger.info(f"📥 Received {filename} ({size:,} bytes) as job {job_id}")
+        return web.json_response({
+            "job_id": job_id,
+            "status": JobQueue.PENDING,
+            "status_url": f"/jobs/{job_id}",
+            "report_url": f"/jobs/{job_id}/report"
+        }, status=202)
+
+    async def handle_status(self, request: web.Request) -> web.Response:
+        job = await self._run(self.queue.get, int(request.match_info['job_id']))
+        if job is None:
+            raise web.HTTPNotFound(text="unknown job")
+        return web.json_response({
+            "job_id": job["id"],
+            "status": job["status"],
+            "file": Path(job["path"]).name,
+            "attempts": job["attempts"],
+            "error": job["error"],
+            "report_url": f"/jobs/{job['id']}/report" if job["status"] == JobQueue.DONE else None
+        })
+
+    async def handle_report(self, request: web.Request) -> web.StreamResponse:
+        job = await self._run(self.queue.get, int(request.match_info['job_id']))
+        if job is None:
+            raise web.HTTPNotFound(text="unknown job")
+        if job["status"] != JobQueue.DONE or not job["result_path"]:
+            return web.json_response({"status": job["status"]}, status=409)
+        report_path = Path(job["result_path"])
+        if not report_path.exists():
+            raise web.HTTPGone(text="report no longer available")
+        return web.FileResponse(report_path, headers={
+            "Content-Disposition": f'attachment; filename="{report_path.name}"'
+        })
+
+    async def _stream_to_disk(self, request: web.Request, part_path: Path) -> int:
+        """Write the body chunk by chunk; the whole upload is never held in memory"""
+        size = 0
+        with open(part_path, 'wb') as f:
+            async for chunk in request.content.iter_chunked(_CHUNK_SIZE):
+                size += len(chunk)
+                if size > Config.HTTP_MAX_UPLOAD_BYTES:
+                    raise web.HTTPRequestEntityTooLarge(
+                        max_size=Config.HTTP_MAX_UPLOAD_BYTES, actual_size=size
+                    )
+                # Disk writes block too; a slow volume must not stall every other request
+                await self._run(f.write, chunk)
+        return size
+
+    def _enqueue(self, final_path: Path) -> int:
+        # Renamed into place only once complete, so there is nothing to wait for
+        return self.queue.enqueue(final_path, dedup_key=JobQueue.dedup_key(final_path, settle_seconds=0))
+
+    @staticmethod
+    async def _run(func, *args):
+        # SQLite calls and file writes are blocking; keep them off the event loop
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+def serve(engine_factory, host: str = None, port: int = None, workers: int = None):
+    """Run the HTTP service, with optional in-process queue workers (one engine per worker thread)"""
+    server = IngestionServer()
+    stop_event = threading.Event()
+    workers = Config.HTTP_WORKERS if workers is None else workers
+
+    for index in range(workers):
+        worker = QueueWorker(server.queue, engine_factory().process_file, worker_id=f"http-{os.getpid()}-{index}")
+        threading.Thread(target=worker.run_forever, args=(stop_event,), daemon=True).start()
+
+    logger.info(f"🌐 Ingestion API listening on {host or Config.HTTP_HOST}:{port or Config.HTTP_PORT} ({workers} in-process workers)")
+    try:
+        web.run_app(server.build_app(), host=host or Config.HTTP_HOST, port=port or Config.HTTP_PORT, print=None)
+    finally:
+        stop_event.set()
@@ -0,0 +1,257 @@
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    path TEXT NOT NULL,
+    dedup_key TEXT NOT NULL UNIQUE,
+    status TEXT NOT NULL DEFAULT 'pending',
+    priority INTEGER NOT NULL DEFAULT 0,
+    expected_seconds REAL NOT NULL DEFAULT 0,
+    worker_id TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result_path TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (status, priority, id);
+"""
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class JobQueue:
+    """Durable SQLite job queue; leases let N workers on a shared volume claim each file exactly once"""
+
+    PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+
+    def __init__(self, db_path: Path = None, lease_seconds: float = None, max_attempts: int = None,
+                 scheduler=None):
+        self.db_path = Path(db_path or Config.QUEUE_DB_PATH)
+        self.lease_seconds = lease_seconds or Config.QUEUE_LEASE_SECONDS
+        self.max_attempts = max_attempts or Config.QUEUE_MAX_ATTEMPTS
+        self.scheduler = scheduler  # JobScheduler: priority classes + shortest-expected-job-first
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "expected_seconds" not in columns:  # queue created before scheduling existed
+                conn.execute("ALTER TABLE jobs ADD COLUMN expected_seconds REAL NOT NULL DEFAULT 0")
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode; write transactions are opened explicitly with BEGIN IMMEDIATE
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        return conn
+
+    @staticmethod
+    def dedup_key(file_path: Path, settle_seconds: float = None) -> str:
+        """Same path, size and mtime means the same file, whichever replica saw it first"""
+        stat = JobQueue.settled_stat(file_path, settle_seconds)
+        return f"{Path(file_path).resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    @staticmethod
+    def settled_stat(file_path: Path, settle_seconds: float = None) -> os.stat_result:
+        """Stat a file once it has stopped changing, i.e. size and mtime agree across two polls.
+
+        A file still being copied in would otherwise get one key per replica that saw it mid-write,
+        and be processed once for each. A file untouched for settle_seconds is taken as is, so a
+        backlog found at startup enqueues without waiting.
+        """
+        settle = Config.QUEUE_SETTLE_SECONDS if settle_seconds is None else settle_seconds
+        stat = Path(file_path).stat()
+        if time.time() - stat.st_mtime >= settle:
+            return stat
+        logger.info(f"⏳ Waiting for {Path(file_path).name} to finish writing")
+        while True:
+            time.sleep(settle)
+            current = Path(file_path).stat()
+            if (current.st_size, current.st_mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                return current
+            stat = current
+
+    def enqueue(self, file_path: Path, priority: int = None, dedup_key: str = None) -> int:
+        """Add a file once; re-enqueueing the same file returns the existing job id"""
+        now = time.time()
+        key = dedup_key or self.dedup_key(file_path)
+        expected = 0.0
+        if self.scheduler is not None:
+            assessed, expected = self.scheduler.assess(file_path)
+            priority = assessed if priority is None else priority
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO jobs (path, dedup_key, priority, expected_seconds, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (str(file_path), key, priority or 0, expected, now, now)
+            )
+            if cursor.rowcount:
+                logger.info(f"📥 Queued {Path(file_path).name} (job {cursor.lastrowid})")
+                return cursor.lastrowid
+            return conn.execute("SELECT id FROM jobs WHERE dedup_key = ?", (key,)).fetchone()["id"]
+
+    def claim(self, worker_id: str) -> dict:
+        """Atomically lease the next pending job to a worker; None when the queue is empty"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            self._reclaim_expired(conn, now)
+            row = conn.execute(self._next_job_sql(), self._next_job_params(now)).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker_id = ?, lease_expires = ?, attempts = attempts + 1, "
+                "updated_at = ? WHERE id = ?",
+                (self.RUNNING, worker_id, now + self.lease_seconds, now, row["id"])
+            )
+            job = dict(conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone())
+            conn.execute("COMMIT")
+            return job
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _next_job_sql(self) -> str:
+        if self.scheduler is None:
+            return "SELECT id FROM jobs WHERE status = ? ORDER BY priority DESC, id LIMIT 1"
+        # JobScheduler.sort_key evaluated in SQL, so every replica agrees on the order
+        return ("SELECT id FROM jobs WHERE status = ? "
+                "ORDER BY expected_seconds - priority * ? - (? - created_at) * ?, id LIMIT 1")
+
+    def _next_job_params(self, now: float) -> tuple:
+        if self.scheduler is None:
+            return (self.PENDING,)
+        return (self.PENDING, self.scheduler.class_gap, now, self.scheduler.aging_rate)
+
+    def heartbeat(self, job_id: int, worker_id: str) -> bool:
+        """Extend the lease; False means the lease was lost to another worker"""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE id = ? AND worker_id = ? AND status = ?",
+                (now + self.lease_seconds, now, job_id, worker_id, self.RUNNING)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: int, worker_id: str, result_path: Path = None) -> bool:
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, result_path = ?, lease_expires = NULL, updated_at = ? "
+                "WHERE id = ? AND worker_id = ? AND status = ?",
+                (self.DONE, str(result_path) if result_path else None, time.time(), job_id, worker_id, self.RUNNING)
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> bool:
+        """Return the job to pending for a retry, or mark it failed after max_attempts"""
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+                "error = ?, worker_id = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE id = ? AND worker_id = ? AND status = ?",
+                (self.max_attempts, self.FAILED, self.PENDING, error, time.time(), job_id, worker_id, self.RUNNING)
+            )
+            return cursor.rowcount == 1
+
+    def get(self, job_id: int) -> dict:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return dict(row) if row else None
+
+    def pending_count(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)", (self.PENDING, self.RUNNING)
+            ).fetchone()[0]
+
+    def reclaim_expired(self) -> int:
+        """Return jobs from crashed workers (expired leases) to the queue"""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            count = self._reclaim_expired(conn, time.time())
+            conn.execute("COMMIT")
+            return count
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _reclaim_expired(self, conn: sqlite3.Connection, now: float) -> int:
+        cursor = conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+            "error = COALESCE(error, 'lease expired'), worker_id = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE status = ? AND lease_expires < ?",
+            (self.max_attempts, self.FAILED, self.PENDING, now, self.RUNNING, now)
+        )
+        if cursor.rowcount:
+            logger.warning(f"⚠️ Reclaimed {cursor.rowcount} job(s) with expired leases")
+        return cursor.rowcount
+
+
+class QueueWorker:
+    """Claims jobs from a JobQueue and runs them, heartbeating the lease while the callback works"""
+
+    def __init__(self, queue: JobQueue, callback, worker_id: str = None, poll_interval: float = None):
+        self.queue = queue
+        self.callback = callback
+        self.worker_id = worker_id or default_worker_id()
+        self.poll_interval = poll_interval or Config.QUEUE_POLL_SECONDS
+
+    def run_once(self) -> bool:
+        """Process a single job; False when there was nothing to claim"""
+        job = self.queue.claim(self.worker_id)
+        if job is None:
+            return False
+
+        logger.info(f"🔒 Worker {self.worker_id} claimed job {job['id']}: {Path(job['path']).name}")
+
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job["id"], stop), daemon=True)
+        heartbeat.start()
+        started = time.time()
+        try:
+            result = self.callback(Path(job["path"]))
+            self.queue.complete(job["id"], self.worker_id, result)
+            if self.queue.scheduler is not None:
+                self.queue.scheduler.observe(Path(job["path"]), time.time() - started)
+        except Exception as e:
+            logger.error(f"❌ Job {job['id']} failed: {str(e)}")
+            self.queue.fail(job["id"], self.worker_id, str(e))
+        finally:
+            stop.set()
+            heartbeat.join()
+        return True
+
+    def run_forever(self, stop_event: threading.Event = None):
+        stop_event = stop_event or threading.Event()
+        logger.info(f"👷 Worker {self.worker_id} polling {self.queue.db_path}")
+        while not stop_event.is_set():
+            if not self.run_once():
+                stop_event.wait(self.poll_interval)
+
+    def _heartbeat(self, job_id: int, stop: threading.Event):
+        while not stop.wait(self.queue.lease_seconds / 3):
+            if not self.queue.heartbeat(job_id, self.worker_id):
+                logger.warning(f"⚠️ Worker {self.worker_id} lost the lease on job {job_id}")
+                return
@@ -0,0 +1,160 @@
+import csv
+import hashlib
+import json
+import logging
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import polars as pl
+from src.config import Config
+from src.runtime.state_files import locked, write_atomic
+
+logger = logging.getLogger(__name__)
+
+# Trailing date/timestamp suffixes such as _20251203, -2025-12-03 or _20251203_142425
+_DATE_SUFFIX = re.compile(r'([_\-.]?\d{4}[-_]?\d{2}[-_]?\d{2}([T_\-]?\d{2,6})?)+$')
+
+NUMERIC_DTYPES = {pl.Int8, pl.Int16, pl.Int32, pl.Int64,
+                  pl.UInt8, pl.UInt16, pl.UInt32, pl.UInt64,
+                  pl.Float32, pl.Float64}
+
+
+def derive_feed_key(file_path: Path) -> str:
+    """Map a file name to its feed, e.g. sales_20251203.csv -> sales"""
+    stem = Path(file_path).stem.lower()
+    return _DATE_SUFFIX.sub('', stem) or stem
+
+
+def _dtype_to_str(dtype) -> str:
+    if isinstance(dtype, pl.Datetime):
+        return f"Datetime:{dtype.time_unit}:{dtype.time_zone or ''}"
+    if isinstance(dtype, pl.Duration):
+        return f"Duration:{dtype.time_unit}"
+    return str(dtype)
+
+
+def _dtype_from_str(name: str):
+    if name.startswith("Datetime:"):
+        _, time_unit, time_zone = name.split(":", 2)
+        return pl.Datetime(time_unit, time_zone or None)
+    if name.startswith("Duration:"):
+        return pl.Duration(name.split(":", 1)[1])
+    return getattr(pl, name)
+
+
+class SchemaRegistry:
+    """Persist learned column dtypes per feed so repeat loads skip inference"""
+
+    def __init__(self, registry_path: Path = None):
+        self.registry_path = Path(registry_path or Config.SCHEMA_REGISTRY_PATH)
+        self._lock = threading.Lock()
+        self._entries = self._read()
+
+    @staticmethod
+    def read_header(file_path: Path) -> list:
+        """Read only the header row of a CSV file"""
+        with open(file_path, newline='', encoding='utf-8') as f:
+            return next(csv.reader(f), [])
+
+    @staticmethod
+    def header_hash(columns: list) -> str:
+        return hashlib.sha1("\x1f".join(columns).encode('utf-8')).hexdigest()
+
+    def lookup(self, file_path: Path) -> dict:
+        """Return the learned schema for a file, or None if it must be inferred"""
+        columns = self.read_header(file_path)
+        digest = self.header_hash(columns)
+        feed = derive_feed_key(file_path)
+
+        with self._lock:
+            entry = self._entries.get(feed)
+            if entry is None:
+                # Same header under a new name is the same feed
+                entry = next((e for e in self._entries.values() if e["header_hash"] == digest), None)
+            elif entry["header_hash"] != digest:
+                self._log_drift(feed, entry["columns"], columns)
+                return None
+
+        if entry is None:
+            return None
+
+        return {col: _dtype_from_str(entry["dtypes"][col]) for col in entry["columns"]}
+
+    def learn(self, file_path: Path, schema: dict):
+        """Record the dtypes of a freshly inferred frame for its feed"""
+        try:
+            dtypes = {col: _dtype_to_str(dtype) for col, dtype in schema.items()}
+            # Only persist dtypes that survive a round trip (no nested/decimal types)
+            for col, name in dtypes.items():
+                if _dtype_from_str(name) != schema[col]:
+                    logger.info(f"ℹ️ Schema for {Path(file_path).name} not learned: unsupported dtype on '{col}'")
+                    return
+        except (AttributeError, ValueError):
+            return
+
+        feed = derive_feed_key(file_path)
+        columns = list(schema.keys())
+
+        with self._lock, locked(self.registry_path):
+            # Re-read under the lock so entries other processes learned meanwhile are kept
+            self._entries = self._read()
+            previous = self._entries.get(feed)
+            if previous and previous["columns"] == columns:
+                dtypes = self._widen(previous["dtypes"], dtypes)
+
+            self._entries[feed] = {
+                "header_hash": self.header_hash(columns),
+                "columns": columns,
+                "dtypes": dtypes,
+                "revisions": (previous or {}).get("revisions", 0) + 1,
+                "updated_at": datetime.now().isoformat(timespec='seconds')
+            }
+            self._write()
+
+        logger.info(f"✓ Learned schema for feed '{feed}' ({len(columns)} columns)")
+
+    def forget(self, file_path: Path):
+        """Drop the learned schema for a file's feed"""
+        with self._lock, locked(self.registry_path):
+            self._entries = self._read()
+            if self._entries.pop(derive_feed_key(file_path), None) is not None:
+                self._write()
+
+    @staticmethod
+    def _widen(old: dict, new: dict) -> dict:
+        """Keep numeric dtypes stable across days (Int one day, Float the next -> Float64; never text)"""
+        merged = dict(new)
+        for col, name in new.items():
+            old_name = old.get(col)
+            if old_name is None or old_name == name:
+                continue
+            old_dtype, new_dtype = _dtype_from_str(old_name), _dtype_from_str(name)
+            if old_dtype in NUMERIC_DTYPES and new_dtype in NUMERIC_DTYPES:
+                merged[col] = "Float64"
+            elif old_dtype in NUMERIC_DTYPES:
+                # Never downgrade a numeric column: one day of stray text would make it text for good
+                merged[col] = old_name
+        return merged
+
+    @staticmethod
+    def _log_drift(feed: str, old_columns: list, new_columns: list):
+        added = [c for c in new_columns if c not in old_columns]
+        removed = [c for c in old_columns if c not in new_columns]
+        if added or removed:
+            logger.warning(f"⚠️ Schema drift for feed '{feed}': added={added}, removed={removed}")
+        else:
+            logger.warning(f"⚠️ Schema drift for feed '{feed}': columns reordered")
+
+    def _read(self) -> dict:
+        if not self.registry_path.exists():
+            return {}
+        try:
+            return json.loads(self.registry_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable schema registry: {str(e)}")
+            return {}
+
+    def _write(self):
+        write_atomic(self.registry_path, json.dumps(self._entries, indent=2))
@@ -1,32 +1,61 @@
+import argparse
+import json
 import logging
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from src.config import Config
 from src.ingestion.file_watcher import FileWatcher
+from src.ingestion.job_queue import JobQueue, QueueWorker
 from src.ingestion.data_loader import DataLoader
+from src.ingestion.schema_registry import SchemaRegistry
 from src.processing.data_processor import DataProcessor
 from src.processing.anomaly_detector import AnomalyDetector
+from src.processing.data_quality import DataQualityProfiler
+from src.processing.feature_matrix import FeatureMatrix
+from src.processing.feature_screening import FeatureScreener
+from src.processing.segment_analyzer import SegmentAnalyzer
+from src.processing.time_series import TimeSeriesAnalyzer
+from src.processing.incremental_state import IncrementalState
 from src.analysis.ai_analyzer import AIAnalyzer
 from src.reporting.visualizer import Visualizer
-from src.reporting.pdf_generator import PDFGenerator
+from src.reporting.report_cache import ReportCache
+from src.reporting.alerts import AlertEmitter
+from src.reporting.run_archive import RunArchive
+from src.runtime.admission import AdmissionController
+from src.runtime.concurrency import apply_thread_budget
+from src.runtime.profiler import StageProfiler
+from src.runtime.scheduler import JobScheduler, feed_of
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 class InsightEngine:
     """Main orchestrator for the automated insight engine"""
     
-    def __init__(self):
+    def __init__(self, force_refresh: bool = False, profile: bool = None):
+        self.force_refresh = force_refresh
+        self.profile = profile  # None defers to PROFILE_ENABLED / PROFILE_PATTERN
         self.data_loader = DataLoader()
+        self.schema_registry = SchemaRegistry() if Config.SCHEMA_REGISTRY_ENABLED else None
         self.processor = DataProcessor()
+        self.quality_profiler = DataQualityProfiler()
+        self.feature_screener = FeatureScreener() if Config.SCREENING_ENABLED else None
         self.anomaly_detector = AnomalyDetector()
+        self.segment_analyzer = SegmentAnalyzer()
+        self.time_series_analyzer = TimeSeriesAnalyzer()
+        self.incremental_state = IncrementalState() if Config.INCREMENTAL_ENABLED else None
         self.ai_analyzer = AIAnalyzer()
         self.visualizer = Visualizer()
+        # ReportLab is only needed once an engine exists, not to parse args or run the batch parent
+        from src.reporting.pdf_generator import PDFGenerator
         self.pdf_generator = PDFGenerator()
+        self.report_cache = ReportCache() if Config.REPORT_CACHE_ENABLED else None
+        self.alerts = AlertEmitter() if Config.ALERTS_ENABLED else None
+        self.run_archive = RunArchive() if Config.RUN_ARCHIVE_ENABLED else None
+        self.admission = AdmissionController.shared() if Config.ADMISSION_ENABLED else None
         
-    def process_file(self, file_path: Path):
+    def process_file(self, file_path: Path, force_refresh: bool = None, profile: bool = None):
         """Complete ETL pipeline for a single file"""
         logger.info(f"\n{'='*60}")
         logger.info(f"🚀 STARTING PIPELINE FOR: {file_path.name}")
@@ -35,48 +64,274 @@ class InsightEngine:
         start_time = __import__('time').time()
         
         try:
-            # 1. INGEST
-            df = self.data_loader.load_csv(file_path)
-            self.data_loader.validate_data(df)
-            
-            # 2. PROCESS
-            df_clean = self.processor.prepare_for_ml(df)
-            metrics = self.processor.calculate_metrics(df_clean)
-            
-            # 3. DETECT ANOMALIES
-            anomalies = self.anomaly_detector.detect(df_clean)
-            
-            # 4. AI ANALYSIS
-            insights = self.ai_analyzer.generate_insights(metrics, anomalies)
+            output_filename = f"report_{file_path.stem}_{__import__('datetime').datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+            content_digest = self.data_loader.file_digest(file_path)
             
-            # 5. VISUALIZE
-            charts = self.visualizer.create_summary_charts(df_clean, metrics)
+            profiler = StageProfiler.for_file(file_path, self.profile if profile is None else profile)
             
-            # 6. GENERATE REPORT
-            report_data = {
-                "title": f"Analysis Report: {file_path.stem}",
-                "metrics": metrics,
-                "anomalies": anomalies,
-                "insights": insights,
-                "charts": charts
-            }
+            # 0. REPORT CACHE (same bytes + same settings = same report; a profiled run always executes)
+            cache_key = self.report_cache.key(content_digest, history=self._history_version(file_path)) \
+                if self.report_cache else None
+            if cache_key and not profiler.enabled and not (self.force_refresh if force_refresh is None else force_refresh):
+                cached_path, _ = self.report_cache.fetch(cache_key, Config.OUTPUT_DIR / output_filename)
+                if cached_path:
+                    logger.info(f"✅ Served cached report in {__import__('time').time() - start_time:.3f} seconds: {cached_path}")
+                    return cached_path
             
-            output_filename = f"report_{file_path.stem}_{__import__('datetime').datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-            pdf_path = self.pdf_generator.generate(report_data, output_filename)
+            # 1. ADMISSION (wait for memory headroom; files too big for memory are streamed)
+            if self.admission is None:
+                pdf_path, report_data = self._run_pipeline(file_path, output_filename, content_digest, profiler,
+                                                           started=start_time)
+            else:
+                with self.admission.admit(file_path) as admission:
+                    pdf_path, report_data = self._run_pipeline(file_path, output_filename, content_digest, profiler,
+                                                               streaming=admission.streaming, started=start_time)
+            latency = report_data["metrics"].setdefault("latency", {})
+            latency["time_to_report"] = round(__import__('time').time() - start_time, 3)
+            if self.run_archive is not None:
+                try:
+                    self.run_archive.record(file_path, report_data, pdf_path, profiler.timings, content_digest)
+                except sqlite3.Error as e:
+                    # The report already exists; a missing history row must not fail (and re-run) the job
+                    logger.warning(f"⚠️ Run not archived: {str(e)}")
+            if cache_key and ReportCache.cacheable(report_data):
+                # Keyed by the history including this run: a re-delivered copy gets this report back until
+                # another file of the feed moves the baseline
+                cache_key = self.report_cache.key(content_digest, history=self._history_version(file_path))
+                self.report_cache.store(cache_key, pdf_path, summary=ReportCache.summarize(report_data))
+            profiler.dump(pdf_path)
             
             elapsed = __import__('time').time() - start_time
             
             logger.info(f"\n{'='*60}")
             logger.info(f"✅ PIPELINE COMPLETED IN {elapsed:.1f} SECONDS")
+            if latency.get("time_to_first_signal") is not None:
+                logger.info(f"🚨 First signal after {latency['time_to_first_signal']:.2f}s, report after {latency['time_to_report']:.2f}s")
+            logger.info(f"⏱️ Stages: {profiler.summary()}")
             logger.info(f"📄 Report saved: {pdf_path}")
             logger.info(f"{'='*60}\n")
             
+            return pdf_path
+            
         except Exception as e:
             logger.error(f"\n❌ PIPELINE FAILED: {str(e)}\n")
             raise
+    
+    def _history_version(self, file_path: Path) -> str:
+        """Version of the prior-run state (archive baseline, incremental state) this file's report compares with"""
+        parts = []
+        if self.run_archive is not None:
+            parts.append(f"archive={self.run_archive.latest_run(feed_of(file_path))}")
+        if self.incremental_state is not None:
+            parts.append(f"incremental={self.incremental_state.version(file_path)}")
+        return ",".join(parts) or None
+    
+    def _run_pipeline(self, file_path: Path, output_filename: str, content_digest: str,
+                      profiler: StageProfiler, streaming: bool = False, started: float = None) -> tuple:
+        """Ingest through report, returning (pdf_path, report_data); streaming keeps memory bounded by batches plus a detection sample"""
+        # 2. INGEST
+        coerced = {}  # learned-numeric columns whose unparseable tokens were loaded as nulls
+        if streaming:
+            # Sketch metrics over batches; everything downstream works on a uniform sample
+            logger.info(f"🌊 {file_path.name} is too large to hold in memory, taking the streaming path")
+            with profiler.stage("ingest"):
+                metrics = self.processor.calculate_metrics_streaming(
+                    file_path, schema_registry=self.schema_registry, coerced=coerced
+                )
+                df = self.data_loader.sample_csv(file_path, Config.ANALYSIS_SAMPLE_ROWS, batch_size=Config.STREAM_BATCH_ROWS,
+                                                 schema_registry=self.schema_registry)
+                metrics["approximation"]["sampled_rows"] = df.height
+        else:
+            with profiler.stage("ingest"):
+                df = self.data_loader.load(file_path, schema_registry=self.schema_registry, coerced=coerced)
+                self.data_loader.validate_data(df)
+        
+        # 3. DATA QUALITY (failing gates skip processing, detection and the LLM)
+        with profiler.stage("quality"):
+            quality = self.quality_profiler.profile(df, coerced=coerced)
+        if not quality["passed"]:
+            if streaming:
+                metrics["quality"] = quality
+            else:
+                metrics = DataQualityProfiler.skipped_metrics(df, quality)
+            return self._generate_report(
+                file_path, output_filename, profiler, metrics,
+                anomalies=DataQualityProfiler.skipped_anomalies(metrics["total_rows"]),
+                insights=DataQualityProfiler.describe_failures(quality)
+            )
+        
+        # 4. PROCESS
+        with profiler.stage("process"):
+            df_clean = self.processor.prepare_for_ml(df)
+            if streaming:
+                features = FeatureMatrix.from_frame(
+                    df_clean, columns=[c for c in metrics["numeric_columns"] if c in df_clean.columns]
+                )
+                if Config.TIME_SERIES_ENABLED:
+                    metrics["time_series"] = self.time_series_analyzer.analyze(
+                        self.data_loader.scan_csv(file_path, schema_registry=self.schema_registry)
+                    )
+                if self.incremental_state is not None:
+                    logger.info("ℹ️ Incremental state needs the full frame, skipped on the streaming path")
+            else:
+                features = FeatureMatrix.from_frame(df_clean)
+                metrics = self.processor.calculate_metrics(df_clean, numeric_cols=features.columns)
+                if Config.TIME_SERIES_ENABLED:
+                    metrics["time_series"] = self.time_series_analyzer.analyze(df_clean)
+                if self.incremental_state is not None:
+                    # Raw frame, so null-filled means don't leak into the cumulative moments
+                    metrics["incremental"] = self.incremental_state.update(
+                        file_path, df, features.columns, content_key=content_digest
+                    )
+            metrics["quality"] = quality
+        
+        # 5. DETECT ANOMALIES (on screened, optionally projected, features)
+        detection_features, value_columns = features, None
+        if self.feature_screener is not None:
+            with profiler.stage("screen"):
+                detection_features, metrics["screening"] = self.feature_screener.screen(features)
+                value_columns = metrics["screening"]["kept"]
+        with profiler.stage("detect"):
+            anomalies = self.anomaly_detector.detect(df_clean, features=detection_features, value_columns=value_columns)
+        
+        # 6. ALERT (first signal goes out before segments, the LLM and the PDF)
+        if self.alerts is not None:
+            with profiler.stage("alert"):
+                event = self.alerts.emit(file_path, anomalies, content_digest=content_digest,
+                                         sampled_rows=df.height if streaming else None)
+            if event is not None and started is not None:
+                metrics["latency"] = {"time_to_first_signal": round(__import__('time').time() - started, 3)}
+        
+        # 7. COMPARE WITH PREVIOUS RUNS (aggregates over the archive's index)
+        if self.run_archive is not None:
+            with profiler.stage("history"):
+                metrics["history"] = self.run_archive.drift(feed_of(file_path), metrics, anomalies)
+        
+        with profiler.stage("segments"):
+            segments = self.segment_analyzer.analyze(df_clean, features) if Config.SEGMENT_MODE else None
+        
+        # 8. AI ANALYSIS (the PDF sections that don't depend on the insights are laid out meanwhile)
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-layout") as layout:
+            prepared = layout.submit(self.pdf_generator.prepare, self._report_data(file_path, metrics, anomalies, segments))
+            with profiler.stage("insights"):
+                insights = self.ai_analyzer.generate_insights(metrics, anomalies)
+                insights_source = self.ai_analyzer.last_source
+            
+            # 9. VISUALIZE
+            with profiler.stage("visualize"):
+                charts = self.visualizer.create_summary_charts(df_clean, metrics)
+            prepared = prepared.result()
+        
+        return self._generate_report(file_path, output_filename, profiler, metrics, anomalies, insights,
+                                     segments=segments, charts=charts, prepared=prepared, insights_source=insights_source)
+    
+    @staticmethod
+    def _report_data(file_path: Path, metrics: dict, anomalies: dict, segments: dict = None,
+                     insights: str = None, charts: list = None, insights_source: str = None) -> dict:
+        return {
+            "title": f"Analysis Report: {file_path.stem}",
+            "metrics": metrics,
+            "anomalies": anomalies,
+            "segments": segments,
+            "insights": insights,
+            "insights_source": insights_source,
+            "charts": charts or []
+        }
+    
+    def _generate_report(self, file_path: Path, output_filename: str, profiler: StageProfiler, metrics: dict,
+                         anomalies: dict, insights: str, segments: dict = None, charts: list = None,
+                         prepared: dict = None, insights_source: str = None) -> tuple:
+        # 10. GENERATE REPORT
+        report_data = self._report_data(file_path, metrics, anomalies, segments, insights, charts, insights_source)
+        
+        with profiler.stage("report"):
+            pdf_path = self.pdf_generator.generate(report_data, output_filename, prepared=prepared)
+        return pdf_path, report_data
+
+def run_worker(engine: InsightEngine, worker_id: str = None):
+    """Queue mode: every replica enqueues what it sees, and each file is claimed by exactly one worker"""
+    queue = JobQueue(scheduler=JobScheduler() if Config.SCHEDULER_ENABLED else None)
+    
+    # Files that arrived while no worker was running (dedup keys make this idempotent across replicas)
+    # (subdirectories too when the scheduler is on, since they can carry a priority class)
+    pattern = "**/*.csv" if Config.SCHEDULER_ENABLED else "*.csv"
+    for file_path in sorted(Config.INPUT_DIR.glob(pattern)):
+        queue.enqueue(file_path)
+    
+    watcher = FileWatcher(
+        watch_directory=Config.INPUT_DIR,
+        callback=queue.enqueue,
+        recursive=Config.SCHEDULER_ENABLED
+    )
+    watcher.start(block=False)
+    
+    try:
+        QueueWorker(queue, engine.process_file, worker_id=worker_id).run_forever()
+    except KeyboardInterrupt:
+        watcher.stop()
+
+def run_scheduled(engine: InsightEngine):
+    """Watch mode with a scheduler in front of process_file: the watcher only queues, and files run
+    by priority class, then shortest expected time, so one huge backfill can't hold up hourly files"""
+    scheduler = JobScheduler()
+    watcher = FileWatcher(
+        watch_directory=Config.INPUT_DIR,
+        callback=scheduler.submit,
+        recursive=True
+    )
+    watcher.start(block=False)
+    
+    try:
+        scheduler.run_forever(engine.process_file)
+    except KeyboardInterrupt:
+        watcher.stop()
+
+def query_history(feed: str = None, column: str = None, stat: str = "mean", limit: int = 90):
+    """Feeds, a feed's runs plus latest drift, or one column's trend, straight from the run archive"""
+    archive = RunArchive()
+    if feed is None:
+        return archive.feeds()
+    if column is not None:
+        return archive.history(feed, column, stat=stat, limit=limit)
+    return {"runs": archive.runs(feed, limit=limit), "drift": archive.drift(feed)}
 
 def main():
     """Entry point"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    Config.init()
+    
+    parser = argparse.ArgumentParser(description="Automated Insight Engine")
+    parser.add_argument("--force-refresh", action="store_true",
+                        help="Ignore cached reports and rerun the full pipeline")
+    parser.add_argument("--profile", action="store_true", default=None,
+                        help="Write per-stage CPU and allocation profiles next to each report")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("watch", help="Process files dropped into the input directory (default)")
+    worker_parser = subparsers.add_parser("worker", help="Claim files from the shared job queue")
+    worker_parser.add_argument("--worker-id", help="Stable worker name (default: hostname-pid)")
+    serve_parser = subparsers.add_parser("serve", help="Accept streamed uploads over HTTP")
+    serve_parser.add_argument("--host", default=Config.HTTP_HOST)
+    serve_parser.add_argument("--port", type=int, default=Config.HTTP_PORT)
+    serve_parser.add_argument("--workers", type=int, default=Config.HTTP_WORKERS,
+                              help="In-process queue workers (0 to rely on separate worker processes)")
+    batch_parser = subparsers.add_parser("batch", help="Process an existing archive of files and exit")
+    batch_parser.add_argument("sources", nargs="+", help="Directories, files or glob patterns")
+    batch_parser.add_argument("--workers", type=int, default=Config.BATCH_WORKERS)
+    batch_parser.add_argument("--summary", help="Run summary JSON path (default: BATCH_SUMMARY_DIR)")
+    history_parser = subparsers.add_parser("history", help="Query the run archive (JSON on stdout)")
+    history_parser.add_argument("feed", nargs="?", help="Feed key, e.g. sales (omit to list feeds)")
+    history_parser.add_argument("--column", help="Column whose statistic to trend")
+    history_parser.add_argument("--stat", default="mean", help="mean, median, std, min, max or sum")
+    history_parser.add_argument("--limit", type=int, default=90, help="Most recent runs to return")
+    args = parser.parse_args()
+    
+    if args.command == "history":
+        print(json.dumps(query_history(args.feed, args.column, args.stat, args.limit), indent=2, default=str))
+        return
+    
     print("""
     ╔═══════════════════════════════════════════════════════════╗
     ║                                                           ║
@@ -90,8 +345,30 @@ def main():
     # Validate configuration
     Config.validate()
     
-    # Initialize engine
-    engine = InsightEngine()
+    if args.command == "serve":
+        from src.ingestion.http_server import serve
+        # In-process worker threads share one Polars pool; BLAS/joblib are split between them
+        apply_thread_budget(max(args.workers, 1), in_process=True)
+        serve(lambda: InsightEngine(force_refresh=args.force_refresh, profile=args.profile), host=args.host, port=args.port, workers=args.workers)
+        return
+    
+    if args.command == "batch":
+        from src.batch import run_batch
+        summary = run_batch(args.sources, workers=args.workers, summary_path=args.summary,
+                            force_refresh=args.force_refresh, profile=args.profile)
+        sys.exit(1 if summary["failed"] else 0)
+    
+    # Initialize engine (one file at a time in this process gets the whole CPU budget)
+    apply_thread_budget(1)
+    engine = InsightEngine(force_refresh=args.force_refresh, profile=args.profile)
+    
+    if args.command == "worker":
+        run_worker(engine, worker_id=args.worker_id)
+        return
+    
+    if Config.SCHEDULER_ENABLED:
+        run_scheduled(engine)
+        return
     
     # Start file watcher
     watcher = FileWatcher(
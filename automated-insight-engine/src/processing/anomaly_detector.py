@@ -1,8 +1,9 @@
 import polars as pl
 import numpy as np
-from sklearn.ensemble import IsolationForest
 import logging
 from src.config import Config
+from src.processing.feature_matrix import FeatureMatrix
+from src.runtime.concurrency import threads_per_job
 
 logger = logging.getLogger(__name__)
 
@@ -10,29 +11,39 @@ class AnomalyDetector:
     """Detect anomalies using Isolation Forest algorithm"""
     
     def __init__(self):
-        self.model = IsolationForest(
+        self.model = None  # built on first detect; scikit-learn is slow to import
+    
+    @staticmethod
+    def _build_model():
+        from sklearn.ensemble import IsolationForest
+        
+        return IsolationForest(
             contamination=Config.CONTAMINATION_FACTOR,
             n_estimators=Config.N_ESTIMATORS,
             random_state=42,
-            n_jobs=-1  # Use all CPU cores
+            n_jobs=threads_per_job()  # this job's share of the CPU budget, not every core
         )
         
-    def detect(self, df: pl.DataFrame) -> dict:
-        """Detect anomalies in the dataset"""
+    def detect(self, df: pl.DataFrame, features: FeatureMatrix = None, value_columns: list = None) -> dict:
+        """Detect anomalies in the dataset; value_columns are reported per anomaly (default: the features)"""
         try:
             logger.info("🔍 Running anomaly detection...")
             
-            # Get numeric columns only
-            numeric_cols = [col for col in df.columns if df[col].dtype in [pl.Float64, pl.Float32, pl.Int64, pl.Int32]]
+            # Reuse the shared feature matrix; IsolationForest works in float32 internally,
+            # so a float32 matrix is handed over without another copy
+            if features is None:
+                features = FeatureMatrix.from_frame(df)
+            numeric_cols = features.columns
             
             if len(numeric_cols) == 0:
                 logger.warning("⚠️ No numeric columns for anomaly detection")
                 return {"anomalies": [], "anomaly_count": 0}
             
-            # Convert to numpy for sklearn
-            X = df.select(numeric_cols).to_numpy()
+            X = features.values
             
             # Fit and predict
+            if self.model is None:
+                self.model = self._build_model()
             predictions = self.model.fit_predict(X)
             anomaly_scores = self.model.score_samples(X)
             
@@ -41,21 +52,20 @@ class AnomalyDetector:
             
             anomalies = []
             
-            # Convert DataFrame to pandas for easier indexing
-            df_pandas = df.to_pandas()
+            # Gather only the anomalous rows, keeping the original (undowncast) values;
+            # projected features have no source column, so the caller names what to report
+            value_columns = value_columns or numeric_cols
+            anomaly_rows = df.select(value_columns)[anomaly_indices.tolist()].iter_rows()
             
-            for idx in anomaly_indices:
-                anomaly_data = {
+            for idx, row in zip(anomaly_indices, anomaly_rows):
+                anomalies.append({
                     "row_index": int(idx),
                     "anomaly_score": float(anomaly_scores[idx]),
-                    "values": {}
-                }
-                
-                # Capture the anomalous values using pandas indexing
-                for col in numeric_cols:
-                    anomaly_data["values"][col] = float(df_pandas[col].iloc[idx])
-                
-                anomalies.append(anomaly_data)
+                    "values": {
+                        col: float(value) if value is not None else None
+                        for col, value in zip(value_columns, row)
+                    }
+                })
             
             # Sort by severity (most anomalous first)
             anomalies = sorted(anomalies, key=lambda x: x["anomaly_score"])
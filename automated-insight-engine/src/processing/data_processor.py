@@ -1,5 +1,10 @@
 import polars as pl
 import logging
+from pathlib import Path
+from src.config import Config
+from src.ingestion.data_loader import DataLoader
+from src.processing.feature_matrix import numeric_columns
+from src.processing.sketches import ColumnSummary
 
 logger = logging.getLogger(__name__)
 
@@ -7,24 +12,41 @@ class DataProcessor:
     """Data transformation and aggregation using Polars"""
     
     @staticmethod
-    def calculate_metrics(df: pl.DataFrame) -> dict:
+    def calculate_metrics(df: pl.DataFrame, numeric_cols: list = None, approximate: bool = None) -> dict:
         """Calculate key business metrics"""
         try:
-            # Identify numeric columns for analysis
-            numeric_cols = [col for col in df.columns if df[col].dtype in [pl.Float64, pl.Float32, pl.Int64, pl.Int32]]
+            # Identify numeric columns for analysis (reuse the feature matrix columns when given)
+            if numeric_cols is None:
+                numeric_cols = numeric_columns(df)
             
             if not numeric_cols:
                 raise ValueError("No numeric columns found for analysis")
             
+            if approximate is None:
+                approximate = DataProcessor.use_approximate(len(df))
+            
             metrics = {
                 "total_rows": len(df),
                 "columns": df.columns,
                 "numeric_columns": numeric_cols,
-                "summary_stats": {}
+                "summary_stats": {},
+                "approximation": None
             }
             
+            # All-null columns (flagged by the quality profile) have no statistics to report
+            null_counts = df.select(pl.col(numeric_cols).null_count()).row(0, named=True)
+            measured = [col for col in numeric_cols if null_counts[col] < len(df)]
+            
+            if approximate:
+                # Sketches instead of a per-column sort for the median
+                summaries = {col: DataProcessor._new_summary() for col in measured}
+                for col, summary in summaries.items():
+                    summary.update(df[col].drop_nulls().cast(pl.Float64).to_numpy())
+                logger.info(f"✓ Calculated approximate metrics for {len(numeric_cols)} numeric columns")
+                return DataProcessor._apply_summaries(metrics, summaries)
+            
             # Calculate summary statistics for each numeric column
-            for col in numeric_cols:
+            for col in measured:
                 metrics["summary_stats"][col] = {
                     "mean": df[col].mean(),
                     "median": df[col].median(),
@@ -41,15 +63,98 @@ class DataProcessor:
             logger.error(f"❌ Metric calculation failed: {str(e)}")
             raise
     
+    @staticmethod
+    def use_approximate(row_count: int) -> bool:
+        """Exact stats stay the default below APPROX_ROW_THRESHOLD rows"""
+        if Config.STATS_MODE == "auto":
+            return row_count > Config.APPROX_ROW_THRESHOLD
+        return Config.STATS_MODE == "approx"
+    
+    @staticmethod
+    def calculate_metrics_streaming(file_path: Path, schema_registry=None, coerced: dict = None) -> dict:
+        """Approximate metrics over CSV batches, never holding more than one batch in memory"""
+        try:
+            logger.info(f"📊 Streaming approximate metrics for {file_path.name}")
+            
+            batches = DataLoader.read_csv_batches(
+                file_path, batch_size=Config.STREAM_BATCH_ROWS, schema_registry=schema_registry, coerced=coerced
+            )
+            
+            columns, summaries, total_rows = None, None, 0
+            for batch in batches:
+                if summaries is None:
+                    columns = batch.columns
+                    summaries = {col: DataProcessor._new_summary() for col in numeric_columns(batch)}
+                for col, summary in summaries.items():
+                    summary.update(batch[col].drop_nulls().cast(pl.Float64).to_numpy())
+                total_rows += batch.height
+            
+            if not summaries:
+                raise ValueError("No numeric columns found for analysis")
+            
+            metrics = {
+                "total_rows": total_rows,
+                "columns": columns,
+                "numeric_columns": list(summaries),
+                "summary_stats": {},
+                "approximation": None
+            }
+            
+            logger.info(f"✓ Streamed {total_rows:,} rows through {len(summaries)} column sketches")
+            return DataProcessor._apply_summaries(metrics, summaries)
+            
+        except Exception as e:
+            logger.error(f"❌ Streaming metric calculation failed: {str(e)}")
+            raise
+    
+    @staticmethod
+    def merge_metrics(metrics_list: list) -> dict:
+        """Merge approximate metrics from several chunks or files via their serialized sketches"""
+        summaries = {}
+        for metrics in metrics_list:
+            for col, data in metrics["sketches"].items():
+                summary = ColumnSummary.from_dict(data)
+                summaries[col] = summaries[col].merge(summary) if col in summaries else summary
+        
+        merged = {
+            "total_rows": sum(m["total_rows"] for m in metrics_list),
+            "columns": list(dict.fromkeys(c for m in metrics_list for c in m["columns"])),
+            "numeric_columns": list(summaries),
+            "summary_stats": {},
+            "approximation": None
+        }
+        return DataProcessor._apply_summaries(merged, summaries)
+    
+    @staticmethod
+    def _new_summary() -> ColumnSummary:
+        return ColumnSummary(k=Config.SKETCH_K, p=Config.HLL_PRECISION)
+    
+    @staticmethod
+    def _apply_summaries(metrics: dict, summaries: dict) -> dict:
+        """Fill summary_stats from sketches and record their error bounds"""
+        for col, summary in summaries.items():
+            metrics["summary_stats"][col] = summary.stats()
+        
+        sample = next(iter(summaries.values()))
+        metrics["approximation"] = {
+            "quantile_rank_error": sample.quantiles.rank_error,
+            "distinct_relative_error": sample.distinct.relative_error
+        }
+        metrics["sketches"] = {col: summary.to_dict() for col, summary in summaries.items()}
+        return metrics
+    
     @staticmethod
     def prepare_for_ml(df: pl.DataFrame) -> pl.DataFrame:
         """Prepare data for machine learning (handle nulls, encode if needed)"""
-        # Fill nulls with column mean for numeric columns
-        for col in df.columns:
-            if df[col].dtype in [pl.Float64, pl.Float32, pl.Int64, pl.Int32]:
-                if df[col].null_count() > 0:
-                    mean_val = df[col].mean()
-                    df = df.with_columns(pl.col(col).fill_null(mean_val))
+        # Fill nulls with column mean for numeric columns, in a single pass over the frame
+        null_counts = df.null_count().row(0, named=True)
+        fills = [
+            pl.col(col).fill_null(pl.col(col).mean())
+            for col in numeric_columns(df)
+            if null_counts[col] > 0
+        ]
+        if fills:
+            df = df.with_columns(fills)
         
         logger.info("✓ Data prepared for ML processing")
         return df
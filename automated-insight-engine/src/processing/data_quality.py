@@ -0,0 +1,134 @@
+import polars as pl
+import logging
+from src.config import Config
+from src.processing.feature_matrix import numeric_columns
+
+logger = logging.getLogger(__name__)
+
+_DUPLICATES = "__duplicate_rows"
+
+
+class DataQualityProfiler:
+    """Null rates, (near-)constant columns, duplicate rows and cardinality in one vectorized pass"""
+
+    def profile(self, df: pl.DataFrame, coerced: dict = None) -> dict:
+        """Profile every column in a single select and evaluate the quality gates.
+
+        coerced is the loader's {column: count} of unparseable numeric tokens it loaded as nulls.
+        """
+        try:
+            logger.info("🩺 Profiling data quality...")
+
+            exprs = [(pl.count() - pl.struct(pl.all()).hash(seed=42).n_unique()).alias(_DUPLICATES)]
+            for col, dtype in df.schema.items():
+                exprs.append(pl.col(col).null_count().alias(f"{col}__nulls"))
+                exprs.append(pl.col(col).n_unique().alias(f"{col}__unique"))
+                if dtype != pl.Null:
+                    # Share of rows holding the most frequent value
+                    exprs.append((pl.col(col) == pl.col(col).drop_nulls().mode().first()).sum().alias(f"{col}__top"))
+            stats = df.select(exprs).row(0, named=True)
+
+            rows = max(df.height, 1)
+            numeric = set(numeric_columns(df))
+            columns = {}
+            for col, dtype in df.schema.items():
+                nulls = stats[f"{col}__nulls"]
+                non_null = df.height - nulls
+                columns[col] = {
+                    "dtype": str(dtype),
+                    "null_rate": nulls / rows,
+                    "n_unique": stats[f"{col}__unique"] - (1 if nulls else 0),
+                    "top_share": stats.get(f"{col}__top", 0) / non_null if non_null else 0.0
+                }
+
+            all_null = [c for c, p in columns.items() if p["null_rate"] == 1.0]
+            constant = [c for c, p in columns.items() if p["n_unique"] == 1]
+            near_constant = [
+                c for c, p in columns.items()
+                if p["n_unique"] > 1 and p["top_share"] >= Config.QUALITY_NEAR_CONSTANT_SHARE
+            ]
+            # Text columns that are nearly unique per row behave like IDs, not dimensions
+            high_cardinality = [
+                c for c, p in columns.items()
+                if c not in numeric and df.height >= 100
+                and p["n_unique"] / rows >= Config.QUALITY_HIGH_CARDINALITY_RATIO
+            ]
+
+            numeric_cells = len(numeric) * df.height
+            numeric_null_rate = sum(columns[c]["null_rate"] * df.height for c in numeric) / numeric_cells if numeric_cells else 0.0
+
+            quality = {
+                "rows": df.height,
+                "columns": df.width,
+                "duplicate_rows": stats[_DUPLICATES],
+                "duplicate_rate": stats[_DUPLICATES] / rows,
+                "numeric_null_rate": numeric_null_rate,
+                "all_null_columns": all_null,
+                "constant_columns": constant,
+                "near_constant_columns": near_constant,
+                "high_cardinality_columns": high_cardinality,
+                "coerced_values": dict(coerced or {}),
+                "column_profiles": columns
+            }
+            quality["gate_failures"] = self.evaluate_gates(quality, numeric)
+            quality["passed"] = not quality["gate_failures"]
+
+            if quality["passed"]:
+                logger.info(f"✓ Data quality: {quality['duplicate_rows']} duplicate rows, "
+                            f"{len(all_null) + len(constant)} uninformative columns")
+            else:
+                logger.warning(f"⚠️ Data quality gates failed: {'; '.join(quality['gate_failures'])}")
+            return quality
+
+        except Exception as e:
+            logger.error(f"❌ Data quality profiling failed: {str(e)}")
+            raise
+
+    @staticmethod
+    def evaluate_gates(quality: dict, numeric: set) -> list:
+        """Reasons the file isn't worth detection/LLM spend (empty when gates are disabled or pass)"""
+        if not Config.QUALITY_GATES_ENABLED:
+            return []
+
+        failures = []
+        if quality["rows"] < Config.QUALITY_MIN_ROWS:
+            failures.append(f"only {quality['rows']} rows (minimum {Config.QUALITY_MIN_ROWS})")
+        if quality["duplicate_rate"] > Config.QUALITY_MAX_DUPLICATE_RATE:
+            failures.append(f"{quality['duplicate_rate']:.0%} of rows are duplicates")
+        if quality["numeric_null_rate"] > Config.QUALITY_MAX_NULL_RATE:
+            failures.append(f"{quality['numeric_null_rate']:.0%} of numeric values are null")
+
+        uninformative = set(quality["all_null_columns"]) | set(quality["constant_columns"])
+        if not numeric:
+            failures.append("no numeric columns")
+        elif not numeric - uninformative:
+            failures.append("every numeric column is empty or constant")
+        return failures
+
+    @staticmethod
+    def skipped_metrics(df: pl.DataFrame, quality: dict) -> dict:
+        """Minimal metrics for a file whose processing was short-circuited"""
+        return {"total_rows": df.height, "columns": df.columns, "numeric_columns": [],
+                "summary_stats": {}, "approximation": None, "quality": quality}
+
+    @staticmethod
+    def skipped_anomalies(rows: int) -> dict:
+        """Anomaly result for a file whose detection was short-circuited"""
+        return {"anomalies": [], "anomaly_count": 0, "total_rows": rows, "anomaly_percentage": 0, "skipped": True}
+
+    @staticmethod
+    def describe_failures(quality: dict) -> str:
+        """Narrative used instead of LLM insights when the gates fail"""
+        issues = "\n".join(f"• {failure}" for failure in quality["gate_failures"])
+        flagged = quality["all_null_columns"] + quality["constant_columns"]
+        return f"""**Data Quality Check Failed**
+
+This file did not pass the data-quality gates, so anomaly detection and AI analysis were skipped.
+
+{issues}
+
+**Recommended Actions**
+
+1. Check the upstream export for truncation, repeated batches or missing fields
+2. Review uninformative columns: {', '.join(flagged) if flagged else 'none'}
+3. Re-send the corrected file; it will be analyzed in full"""
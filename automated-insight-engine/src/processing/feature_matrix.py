@@ -0,0 +1,56 @@
+import polars as pl
+import numpy as np
+import logging
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def numeric_columns(df: pl.DataFrame) -> list:
+    """Resolve numeric columns once, covering every integer, unsigned and float dtype.
+
+    Decimal columns are cast to Float64 when loaded; any left over are skipped, since
+    std() and null filling are not supported on them.
+    """
+    return [col for col, dtype in df.schema.items() if dtype.is_numeric() and not isinstance(dtype, pl.Decimal)]
+
+
+class FeatureMatrix:
+    """Contiguous numeric view of a frame, built once and shared by metrics, detection and charts"""
+
+    def __init__(self, columns: list, values: np.ndarray):
+        self.columns = columns
+        self.values = values
+
+    @classmethod
+    def from_frame(cls, df: pl.DataFrame, columns: list = None, dtype: str = None) -> "FeatureMatrix":
+        """Build the matrix from numeric columns, downcast to Config.FEATURE_DTYPE by default"""
+        columns = numeric_columns(df) if columns is None else columns
+        np_dtype = np.dtype(dtype or Config.FEATURE_DTYPE)
+
+        if not columns:
+            return cls([], np.empty((df.height, 0), dtype=np_dtype))
+
+        target = pl.Float32 if np_dtype == np.float32 else pl.Float64
+
+        # Casting in Polars first means the numpy export is a single same-dtype block,
+        # so no intermediate float64 copy of the frame is ever materialized.
+        # All-null columns have no mean to fill with in prepare_for_ml, hence fill_null(0).
+        values = df.select(
+            pl.col(col).cast(target).fill_null(0) for col in columns
+        ).to_numpy(order="fortran")
+
+        logger.info(f"✓ Built {np_dtype.name} feature matrix {values.shape} ({values.nbytes / 1e6:.1f} MB)")
+        return cls(columns, values)
+
+    @property
+    def n_rows(self) -> int:
+        return self.values.shape[0]
+
+    @property
+    def n_features(self) -> int:
+        return self.values.shape[1]
+
+    def column(self, name: str) -> np.ndarray:
+        """Zero-copy view of a single feature"""
+        return self.values[:, self.columns.index(name)]
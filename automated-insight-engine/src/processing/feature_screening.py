@@ -0,0 +1,127 @@
+import re
+import numpy as np
+import logging
+from src.config import Config
+from src.processing.feature_matrix import FeatureMatrix
+
+logger = logging.getLogger(__name__)
+
+_ID_NAME = re.compile(r"(^|[_\s])(id|key|index|uuid)$|[a-z]Id$", re.IGNORECASE)
+
+
+class FeatureScreener:
+    """Drops constant, ID-like and collinear features and optionally projects the rest before detection"""
+
+    def __init__(self, max_correlation: float = None, projection: str = None, target_dim: int = None,
+                 sample_rows: int = None, seed: int = 42):
+        self.max_correlation = max_correlation or Config.SCREEN_MAX_CORRELATION
+        self.projection = (projection or Config.SCREEN_PROJECTION).lower()
+        self.target_dim = target_dim or Config.SCREEN_TARGET_DIM
+        self.sample_rows = sample_rows or Config.SCREEN_SAMPLE_ROWS
+        self.seed = seed
+
+    def screen(self, features: FeatureMatrix) -> tuple:
+        """Return (detection FeatureMatrix, report); the input matrix is reused untouched when nothing is dropped"""
+        try:
+            report = {"input_features": features.n_features, "dropped": [], "kept": list(features.columns),
+                      "projection": None}
+            if features.n_features < 2:
+                return features, report
+
+            values = features.values
+            rng = np.random.default_rng(self.seed)
+            sample_index = (np.sort(rng.choice(features.n_rows, self.sample_rows, replace=False))
+                            if features.n_rows > self.sample_rows else slice(None))
+            sample = np.asarray(values[sample_index], dtype=np.float64)
+
+            # Zero variance over every row, so a rare spike in an otherwise flat column survives
+            flat = values.min(axis=0) == values.max(axis=0)
+            reasons = {i: "zero variance" for i in np.flatnonzero(flat)}
+
+            if Config.SCREEN_DROP_IDS:
+                for i in self._id_like(features.columns, values, sample):
+                    reasons.setdefault(i, "identifier")
+
+            candidates = [i for i in range(features.n_features) if i not in reasons]
+            for i, partner, corr in self._collinear(sample[:, candidates]):
+                reasons[candidates[i]] = f"|r|={abs(corr):.2f} with {features.columns[candidates[partner]]}"
+
+            keep = [i for i in range(features.n_features) if i not in reasons]
+            if not keep:
+                # Never hand the detector an empty matrix; fall back to everything
+                logger.warning("⚠️ Feature screening would drop every feature, keeping all")
+                return features, report
+
+            report["dropped"] = [{"column": features.columns[i], "reason": reason} for i, reason in sorted(reasons.items())]
+            report["kept"] = [features.columns[i] for i in keep]
+            for item in report["dropped"]:
+                logger.info(f"✂️ Dropped feature {item['column']}: {item['reason']}")
+
+            screened = features if not reasons else FeatureMatrix(report["kept"], values[:, keep])
+
+            if self.projection in ("pca", "random") and screened.n_features > self.target_dim:
+                screened, report["projection"] = self._project(screened, sample[:, keep], rng)
+
+            report["output_features"] = screened.n_features
+            logger.info(f"✓ Screened features: {features.n_features} → {screened.n_features}")
+            return screened, report
+
+        except Exception as e:
+            logger.error(f"❌ Feature screening failed: {str(e)}")
+            raise
+
+    @staticmethod
+    def _id_like(columns: list, values: np.ndarray, sample: np.ndarray) -> list:
+        """Integer-valued, (nearly) all-distinct columns that are named like keys or increase row by row"""
+        flagged = []
+        head = values[:min(len(values), 1000)]
+        integral = np.flatnonzero(np.all(sample == np.round(sample), axis=0))
+        for i in integral:
+            col, column = columns[i], sample[:, i]
+            if len(np.unique(column)) < Config.QUALITY_HIGH_CARDINALITY_RATIO * len(column):
+                continue
+            if _ID_NAME.search(col) or np.all(np.diff(head[:, i]) > 0):
+                flagged.append(int(i))
+        return flagged
+
+    def _collinear(self, sample: np.ndarray) -> list:
+        """Greedy pass: a feature goes when it is near-duplicate of one already kept (first occurrence wins)"""
+        if sample.shape[1] < 2:
+            return []
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = np.nan_to_num(np.corrcoef(sample, rowvar=False))
+        kept, dropped = [], []
+        for i in range(corr.shape[0]):
+            if kept:
+                row = np.abs(corr[i, kept])
+                best = int(np.argmax(row))
+                if row[best] >= self.max_correlation:
+                    dropped.append((i, kept[best], corr[i, kept[best]]))
+                    continue
+            kept.append(i)
+        return dropped
+
+    def _project(self, features: FeatureMatrix, sample: np.ndarray, rng: np.random.Generator) -> tuple:
+        """Standardize on the sample, then PCA (SVD of the sample) or a Gaussian random projection"""
+        mean = sample.mean(axis=0)
+        std = sample.std(axis=0)
+        std[std == 0] = 1.0
+        k = self.target_dim
+
+        if self.projection == "pca":
+            _, singular, vt = np.linalg.svd((sample - mean) / std, full_matrices=False)
+            components = vt[:k].T
+            explained = float((singular[:k] ** 2).sum() / (singular ** 2).sum())
+        else:
+            components = rng.standard_normal((features.n_features, k)) / np.sqrt(k)
+            explained = None
+
+        dtype = features.values.dtype
+        projected = ((features.values - mean.astype(dtype)) / std.astype(dtype)) @ components.astype(dtype)
+        names = [f"{self.projection}_{j + 1}" for j in range(k)]
+        logger.info(f"✓ Projected {features.n_features} features to {k} ({self.projection})")
+        return FeatureMatrix(names, np.asfortranarray(projected)), {
+            "method": self.projection,
+            "components": k,
+            "explained_variance": explained
+        }
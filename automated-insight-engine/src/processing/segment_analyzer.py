@@ -0,0 +1,173 @@
+import polars as pl
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+import logging
+from src.config import Config
+from src.processing.feature_matrix import FeatureMatrix
+from src.runtime.concurrency import threads_per_job
+
+logger = logging.getLogger(__name__)
+
+_ROW_COL = "__row"
+
+
+def _detect_segment_batch(batch: list, contamination: float, n_estimators: int, min_rows: int, top_n: int) -> list:
+    """Run one IsolationForest per segment; executed inside a pool worker"""
+    from sklearn.ensemble import IsolationForest
+
+    results = []
+    for segment_id, row_index, X in batch:
+        if len(row_index) < min_rows:
+            results.append((segment_id, None, []))
+            continue
+
+        model = IsolationForest(
+            contamination=contamination,
+            n_estimators=n_estimators,
+            random_state=42,
+            n_jobs=1  # Parallelism comes from the pool, not from each model
+        )
+        predictions = model.fit_predict(X)
+        scores = model.score_samples(X)
+
+        flagged = np.where(predictions == -1)[0]
+        worst = flagged[np.argsort(scores[flagged])][:top_n]
+        results.append((
+            segment_id,
+            int(len(flagged)),
+            [(int(row_index[i]), float(scores[i])) for i in worst]
+        ))
+    return results
+
+
+class SegmentAnalyzer:
+    """Per-segment metrics and anomaly detection over dimension columns"""
+
+    def __init__(self, dimensions: list = None):
+        self.dimensions = dimensions if dimensions is not None else Config.SEGMENT_COLUMNS
+
+    def resolve_dimensions(self, df: pl.DataFrame) -> list:
+        """Use configured dimensions, or low-cardinality text columns when none are set"""
+        if self.dimensions:
+            missing = [col for col in self.dimensions if col not in df.columns]
+            if missing:
+                logger.warning(f"⚠️ Segment columns not found: {missing}")
+            return [col for col in self.dimensions if col in df.columns]
+
+        candidates = [col for col, dtype in df.schema.items() if dtype in (pl.Utf8, pl.Categorical, pl.Boolean)]
+        if not candidates:
+            return []
+
+        cardinality = df.select(pl.col(candidates).n_unique()).row(0, named=True)
+        return [col for col in candidates if 2 <= cardinality[col] <= Config.SEGMENT_MAX_CARDINALITY]
+
+    def analyze(self, df: pl.DataFrame, features: FeatureMatrix = None) -> dict:
+        """Aggregate and detect anomalies within each segment"""
+        try:
+            dims = self.resolve_dimensions(df)
+            if not dims:
+                logger.warning("⚠️ No dimension columns for segmented analysis")
+                return {"dimensions": [], "segment_count": 0, "segments": []}
+
+            if features is None:
+                features = FeatureMatrix.from_frame(df)
+
+            logger.info(f"🧩 Running segmented analysis over {dims}...")
+
+            # One group_by computes every segment aggregate plus the row positions per segment
+            aggregates = (
+                df.with_row_count(_ROW_COL)
+                .group_by(dims, maintain_order=True)
+                .agg(
+                    [pl.col(_ROW_COL), pl.count().alias("rows")]
+                    + [pl.col(col).mean().alias(f"{col}__mean") for col in features.columns]
+                    + [pl.col(col).sum().alias(f"{col}__sum") for col in features.columns]
+                )
+            )
+
+            segments = []
+            tasks = []
+            for segment_id, row in enumerate(aggregates.iter_rows(named=True)):
+                row_index = np.asarray(row[_ROW_COL], dtype=np.int64)
+                segments.append({
+                    "segment": {dim: row[dim] for dim in dims},
+                    "label": " / ".join(str(row[dim]) for dim in dims),
+                    "rows": int(row["rows"]),
+                    "stats": {
+                        col: {"mean": row[f"{col}__mean"], "sum": row[f"{col}__sum"]}
+                        for col in features.columns
+                    },
+                    "anomaly_count": None,
+                    "anomaly_percentage": None,
+                    "top_anomalies": []
+                })
+                if features.n_features:
+                    tasks.append((segment_id, row_index, features.values[row_index]))
+
+            for segment_id, count, top in self._run_detection(tasks):
+                segment = segments[segment_id]
+                if count is None:
+                    continue
+                segment["anomaly_count"] = count
+                segment["anomaly_percentage"] = round(count / segment["rows"] * 100, 2)
+                segment["top_anomalies"] = self._describe(df, features.columns, top)
+
+            segments.sort(key=lambda s: (s["anomaly_count"] or 0, s["rows"]), reverse=True)
+
+            logger.info(f"✓ Analyzed {len(segments)} segments")
+            return {"dimensions": dims, "segment_count": len(segments), "segments": segments}
+
+        except Exception as e:
+            logger.error(f"❌ Segmented analysis failed: {str(e)}")
+            raise
+
+    def _run_detection(self, tasks: list) -> list:
+        """Batch small segments together and fan batches out to a process pool"""
+        batches = self._batch(tasks, Config.SEGMENT_BATCH_ROWS)
+        args = (Config.CONTAMINATION_FACTOR, Config.N_ESTIMATORS, Config.SEGMENT_MIN_ROWS, Config.SEGMENT_TOP_ANOMALIES)
+
+        workers = Config.SEGMENT_WORKERS or threads_per_job()
+        if workers <= 1 or len(batches) <= 1:
+            return [result for batch in batches for result in _detect_segment_batch(batch, *args)]
+
+        # Spawn, not fork: the parent already runs Polars, admission, heartbeat and worker threads,
+        # and a forked child can inherit one of their locks held
+        results = []
+        with ProcessPoolExecutor(max_workers=min(workers, len(batches)), mp_context=get_context("spawn")) as pool:
+            futures = [pool.submit(_detect_segment_batch, batch, *args) for batch in batches]
+            for future in futures:
+                results.extend(future.result())
+        return results
+
+    @staticmethod
+    def _batch(tasks: list, batch_rows: int) -> list:
+        """Large segments run alone; small ones are packed until a batch holds batch_rows rows"""
+        batches, current, current_rows = [], [], 0
+        for task in sorted(tasks, key=lambda t: len(t[1]), reverse=True):
+            rows = len(task[1])
+            if rows >= batch_rows:
+                batches.append([task])
+                continue
+            current.append(task)
+            current_rows += rows
+            if current_rows >= batch_rows:
+                batches.append(current)
+                current, current_rows = [], 0
+        if current:
+            batches.append(current)
+        return batches
+
+    @staticmethod
+    def _describe(df: pl.DataFrame, columns: list, top: list) -> list:
+        if not top:
+            return []
+        rows = df.select(columns)[[index for index, _ in top]].iter_rows()
+        return [
+            {
+                "row_index": index,
+                "anomaly_score": score,
+                "values": {col: float(v) if v is not None else None for col, v in zip(columns, row)}
+            }
+            for (index, score), row in zip(top, rows)
+        ]
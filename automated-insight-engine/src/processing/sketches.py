@@ -0,0 +1,276 @@
+import base64
+import math
+import zlib
+import numpy as np
+
+
+class RunningMoments:
+    """Mergeable count/mean/variance/min/max (Welford moments combined with Chan's update)"""
+
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0,
+                 minimum: float = None, maximum: float = None):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.minimum = minimum
+        self.maximum = maximum
+
+    @classmethod
+    def from_array(cls, values: np.ndarray) -> "RunningMoments":
+        """Vectorized moments of a chunk (nulls/NaNs must already be dropped)"""
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return cls()
+        mean = float(values.mean())
+        return cls(
+            count=int(values.size),
+            mean=mean,
+            m2=float(np.square(values - mean).sum()),
+            minimum=float(values.min()),
+            maximum=float(values.max())
+        )
+
+    def merge(self, other: "RunningMoments") -> "RunningMoments":
+        """Combine two partial aggregates as if computed over the concatenated data"""
+        if other.count == 0:
+            return RunningMoments(self.count, self.mean, self.m2, self.minimum, self.maximum)
+        if self.count == 0:
+            return RunningMoments(other.count, other.mean, other.m2, other.minimum, other.maximum)
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        return RunningMoments(
+            count=count,
+            mean=self.mean + delta * other.count / count,
+            m2=self.m2 + other.m2 + delta * delta * self.count * other.count / count,
+            minimum=min(self.minimum, other.minimum),
+            maximum=max(self.maximum, other.maximum)
+        )
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else None
+
+    @property
+    def std(self) -> float:
+        variance = self.variance
+        return math.sqrt(variance) if variance is not None else None
+
+    @property
+    def total(self) -> float:
+        return self.mean * self.count
+
+    def to_dict(self) -> dict:
+        return {"count": self.count, "mean": self.mean, "m2": self.m2,
+                "min": self.minimum, "max": self.maximum}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RunningMoments":
+        return cls(data["count"], data["mean"], data["m2"], data["min"], data["max"])
+
+
+class KLLSketch:
+    """Mergeable quantile sketch (Karnin-Lang-Liberty compactors) with bounded memory"""
+
+    _DECAY = 2 / 3
+
+    def __init__(self, k: int = 200, seed: int = 42):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray):
+        """Add a chunk of values (nulls/NaNs must already be dropped)"""
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.count += int(values.size)
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Fold another sketch into this one; levels of equal weight are concatenated"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for height, items in enumerate(other.levels):
+            self.levels[height] = np.concatenate([self.levels[height], items])
+        self.count += other.count
+        self._compress()
+        return self
+
+    def quantile(self, q: float) -> float:
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs: list) -> list:
+        if self.count == 0:
+            return [None for _ in qs]
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2 ** h, dtype=np.float64)
+                                  for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        items, cumulative = items[order], np.cumsum(weights[order])
+        targets = np.asarray(qs, dtype=np.float64) * cumulative[-1]
+        positions = np.minimum(np.searchsorted(cumulative, targets, side="left"), len(items) - 1)
+        return [float(v) for v in items[positions]]
+
+    @property
+    def rank_error(self) -> float:
+        """Normalized rank error bound (~99% confidence) for this k, per the KLL/DataSketches estimate"""
+        return 2.296 / self.k ** 0.9723
+
+    def _capacity(self, height: int) -> int:
+        depth = len(self.levels) - height - 1
+        return max(2, int(math.ceil(self.k * self._DECAY ** depth)))
+
+    def _compress(self):
+        while sum(len(level) for level in self.levels) > sum(self._capacity(h) for h in range(len(self.levels))):
+            for height, level in enumerate(self.levels):
+                if len(level) < self._capacity(height):
+                    continue
+                if height + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+
+                level = np.sort(level)
+                # Odd item stays behind; every other item is promoted at double weight
+                keep = level[:1] if len(level) % 2 else np.empty(0)
+                pairs = level[len(keep):]
+                promoted = pairs[int(self._rng.integers(0, 2))::2]
+
+                self.levels[height] = keep
+                self.levels[height + 1] = np.concatenate([self.levels[height + 1], promoted])
+                break
+
+    def to_dict(self) -> dict:
+        return {"k": self.k, "count": self.count, "levels": [level.tolist() for level in self.levels]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "KLLSketch":
+        sketch = cls(k=data["k"])
+        sketch.count = data["count"]
+        sketch.levels = [np.asarray(level, dtype=np.float64) for level in data["levels"]] or [np.empty(0)]
+        return sketch
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    """Vectorized 64-bit finalizer; stable across processes and versions, unlike Python's hash()"""
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def hash_values(values: np.ndarray) -> np.ndarray:
+    """64-bit hashes of numeric values (equal values hash equally regardless of int/float dtype)"""
+    values = np.asarray(values, dtype=np.float64) + 0.0  # folds -0.0 into 0.0
+    return _splitmix64(values.view(np.uint64))
+
+
+def _leading_zeros(x: np.ndarray) -> np.ndarray:
+    zeros = np.zeros(x.shape, dtype=np.uint8)
+    for shift in (32, 16, 8, 4, 2, 1):
+        empty = x < np.uint64(1 << (64 - shift))
+        zeros[empty] += shift
+        x = np.where(empty, x << np.uint64(shift), x)
+    zeros[x == 0] += 1
+    return zeros
+
+
+class HyperLogLog:
+    """Mergeable distinct-count sketch with 2^p registers"""
+
+    def __init__(self, p: int = 14):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def update(self, values: np.ndarray):
+        """Add a chunk of numeric values (nulls/NaNs must already be dropped)"""
+        self.update_hashes(hash_values(values))
+
+    def update_hashes(self, hashes: np.ndarray):
+        if hashes.size == 0:
+            return
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        index = (hashes >> np.uint64(64 - self.p)).astype(np.int64)
+        rank = np.minimum(_leading_zeros(hashes << np.uint64(self.p)) + 1, 64 - self.p + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.p != self.p:
+            raise ValueError(f"Cannot merge HyperLogLog sketches with p={self.p} and p={other.p}")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> float:
+        m = float(len(self.registers))
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        empty = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and empty:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * math.log(m / empty)
+        return float(estimate)
+
+    @property
+    def relative_error(self) -> float:
+        """Standard error of the estimate, 1.04 / sqrt(m)"""
+        return 1.04 / math.sqrt(1 << self.p)
+
+    def to_dict(self) -> dict:
+        return {"p": self.p, "registers": base64.b64encode(zlib.compress(self.registers.tobytes())).decode('ascii')}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "HyperLogLog":
+        sketch = cls(p=data["p"])
+        raw = zlib.decompress(base64.b64decode(data["registers"]))
+        sketch.registers = np.frombuffer(raw, dtype=np.uint8).copy()
+        return sketch
+
+
+class ColumnSummary:
+    """Moments, quantile and distinct-count sketches for one column, mergeable across chunks and files"""
+
+    def __init__(self, k: int = 200, p: int = 14):
+        self.moments = RunningMoments()
+        self.quantiles = KLLSketch(k=k)
+        self.distinct = HyperLogLog(p=p)
+
+    def update(self, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self.moments = self.moments.merge(RunningMoments.from_array(values))
+        self.quantiles.update(values)
+        self.distinct.update(values)
+
+    def merge(self, other: "ColumnSummary") -> "ColumnSummary":
+        self.moments = self.moments.merge(other.moments)
+        self.quantiles.merge(other.quantiles)
+        self.distinct.merge(other.distinct)
+        return self
+
+    def stats(self) -> dict:
+        """Same keys as the exact summary_stats, plus an approximate distinct count"""
+        return {
+            "mean": self.moments.mean if self.moments.count else None,
+            "median": self.quantiles.quantile(0.5),
+            "std": self.moments.std,
+            "min": self.moments.minimum,
+            "max": self.moments.maximum,
+            "sum": self.moments.total,
+            "distinct": round(self.distinct.count())
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "moments": self.moments.to_dict(),
+            "quantiles": self.quantiles.to_dict(),
+            "distinct": self.distinct.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ColumnSummary":
+        summary = cls()
+        summary.moments = RunningMoments.from_dict(data["moments"])
+        summary.quantiles = KLLSketch.from_dict(data["quantiles"])
+        summary.distinct = HyperLogLog.from_dict(data["distinct"])
+        return summary
@@ -0,0 +1,137 @@
+import polars as pl
+import logging
+from datetime import timedelta
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+_WINDOW_COL = "window"
+_ROWS_COL = "rows"
+_TIMESTAMP_HINTS = ("timestamp", "event_time", "datetime", "time", "date", "ts")
+
+
+class TimeSeriesAnalyzer:
+    """Resampled window statistics and window-level anomaly flags over the primary timestamp column"""
+
+    @staticmethod
+    def detect_timestamp_column(schema: dict) -> str:
+        """Pick the configured timestamp column, else the best-named temporal column"""
+        if Config.TIMESTAMP_COLUMN:
+            return Config.TIMESTAMP_COLUMN if Config.TIMESTAMP_COLUMN in schema else None
+
+        temporal = [col for col, dtype in schema.items() if dtype in (pl.Datetime, pl.Date)]
+        if not temporal:
+            return None
+
+        for hint in _TIMESTAMP_HINTS:
+            for col in temporal:
+                if hint in col.lower():
+                    return col
+        return temporal[0]
+
+    def analyze(self, source) -> dict:
+        """Summarize a DataFrame or LazyFrame into resampled windows; None if it has no timestamp"""
+        try:
+            lf = source.lazy()
+            schema = lf.schema
+            ts_col = self.detect_timestamp_column(schema)
+            if ts_col is None:
+                return None
+
+            metric_cols = [col for col, dtype in schema.items() if dtype.is_numeric()]
+            interval = self._resolve_interval(lf, ts_col, schema[ts_col])
+
+            logger.info(f"⏱️ Resampling '{ts_col}' into {interval} windows...")
+
+            # Truncate + group_by is the streaming-capable equivalent of group_by_dynamic(every=interval):
+            # only the timestamp and metric columns are scanned, and rows are folded into
+            # per-window aggregates without materializing the file.
+            windows = (
+                lf.select([ts_col] + metric_cols)
+                .drop_nulls(ts_col)
+                .group_by(pl.col(ts_col).dt.truncate(interval).alias(_WINDOW_COL))
+                .agg(
+                    [pl.count().alias(_ROWS_COL)]
+                    + [pl.col(col).mean().alias(f"{col}_mean") for col in metric_cols]
+                    + [pl.col(col).sum().alias(f"{col}_sum") for col in metric_cols]
+                )
+                .collect(streaming=True)
+                .sort(_WINDOW_COL)
+            )
+
+            tracked = [_ROWS_COL] + [f"{col}_mean" for col in metric_cols]
+            windows = windows.with_columns(self._window_exprs(tracked))
+
+            result = {
+                "timestamp_column": ts_col,
+                "interval": interval,
+                "window_count": windows.height,
+                "start": str(windows[_WINDOW_COL].min()) if windows.height else None,
+                "end": str(windows[_WINDOW_COL].max()) if windows.height else None,
+                "period_over_period": self._latest_changes(windows, tracked),
+                "flagged_windows": self._flagged(windows, tracked),
+                "windows": windows.select([_WINDOW_COL] + tracked).tail(Config.TS_REPORT_WINDOWS).to_dicts()
+            }
+
+            logger.info(f"✓ Summarized {windows.height} windows, {len(result['flagged_windows'])} flagged")
+            return result
+
+        except Exception as e:
+            logger.error(f"❌ Time-series analysis failed: {str(e)}")
+            raise
+
+    @staticmethod
+    def _resolve_interval(lf: pl.LazyFrame, ts_col: str, dtype) -> str:
+        """Hourly windows for short spans, daily otherwise (Date columns are always daily)"""
+        if Config.TS_INTERVAL != "auto":
+            return Config.TS_INTERVAL
+        if dtype == pl.Date:
+            return "1d"
+
+        bounds = lf.select(
+            pl.col(ts_col).min().alias("start"),
+            pl.col(ts_col).max().alias("end")
+        ).collect(streaming=True)
+        start, end = bounds.row(0)
+        if start is None or end - start > timedelta(days=Config.TS_HOURLY_MAX_DAYS):
+            return "1d"
+        return "1h"
+
+    @staticmethod
+    def _window_exprs(tracked: list) -> list:
+        """Rolling baseline from the previous N windows, z-score against it, and period-over-period change"""
+        size = Config.TS_ROLLING_WINDOWS
+        exprs = []
+        for col in tracked:
+            baseline = pl.col(col).shift(1).rolling_mean(size, min_periods=min(3, size))
+            spread = pl.col(col).shift(1).rolling_std(size, min_periods=min(3, size))
+            exprs.extend([
+                baseline.alias(f"{col}__baseline"),
+                # A flat baseline has no spread to measure against; leave the z-score null instead of ±inf
+                pl.when(spread > 0).then((pl.col(col) - baseline) / spread).alias(f"{col}__z"),
+                (pl.col(col).pct_change() * 100).alias(f"{col}__pct")
+            ])
+        return exprs
+
+    @staticmethod
+    def _latest_changes(windows: pl.DataFrame, tracked: list) -> dict:
+        if windows.height < 2:
+            return {}
+        last = windows.row(-1, named=True)
+        return {col: last[f"{col}__pct"] for col in tracked}
+
+    @staticmethod
+    def _flagged(windows: pl.DataFrame, tracked: list) -> list:
+        threshold = Config.TS_ZSCORE_THRESHOLD
+        flagged = pl.concat([
+            windows.filter(pl.col(f"{col}__z").abs() > threshold).select(
+                pl.col(_WINDOW_COL).cast(pl.Utf8),
+                pl.lit(col).alias("metric"),
+                pl.col(col).cast(pl.Float64).alias("value"),
+                pl.col(f"{col}__baseline").alias("baseline"),
+                pl.col(f"{col}__z").alias("zscore"),
+                pl.col(f"{col}__pct").alias("change_pct")
+            )
+            for col in tracked
+        ])
+        return flagged.sort(pl.col("zscore").abs(), descending=True).head(10).to_dicts()
@@ -0,0 +1,122 @@
+import json
+import logging
+import sys
+import threading
+import urllib.request
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class AlertSink(ABC):
+    """Destination for alert events; send() must return quickly"""
+
+    name = "sink"
+
+    @abstractmethod
+    def send(self, event: dict):
+        """Deliver one event"""
+
+
+class FileSink(AlertSink):
+    """Appends one JSON line per event (tail -f friendly; safe across worker processes)"""
+
+    name = "file"
+
+    def __init__(self, path: Path = None):
+        self.path = Path(path or Config.ALERT_FILE)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def send(self, event: dict):
+        line = json.dumps(event, default=str) + "\n"
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)  # a single small append, so concurrent writers don't interleave lines
+
+
+class StdoutSink(AlertSink):
+    """Prints one JSON line per event for a supervising process or log shipper"""
+
+    name = "stdout"
+
+    def send(self, event: dict):
+        sys.stdout.write(json.dumps(event, default=str) + "\n")
+        sys.stdout.flush()
+
+
+class WebhookSink(AlertSink):
+    """POSTs the event as JSON from a background thread, so a slow endpoint never delays the report"""
+
+    name = "webhook"
+
+    def __init__(self, url: str = None, timeout: float = None):
+        self.url = url or Config.ALERT_WEBHOOK_URL
+        self.timeout = timeout or Config.ALERT_WEBHOOK_TIMEOUT
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="alert-webhook")
+
+    def send(self, event: dict):
+        self._executor.submit(self._post, json.dumps(event, default=str).encode("utf-8"))
+
+    def _post(self, body: bytes):
+        request = urllib.request.Request(self.url, data=body, method="POST",
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+        except Exception as e:
+            logger.warning(f"⚠️ Alert webhook failed ({self.url}): {str(e)}")
+
+
+SINKS = {"file": FileSink, "stdout": StdoutSink, "webhook": WebhookSink}
+
+
+class AlertEmitter:
+    """Compact anomaly event sent as soon as detection finishes, ahead of the LLM and PDF stages"""
+
+    def __init__(self, sinks: list = None, top_n: int = None, min_rate: float = None):
+        if sinks is None:
+            names = [n for n in Config.ALERT_SINKS if n in SINKS and (n != "webhook" or Config.ALERT_WEBHOOK_URL)]
+            sinks = [SINKS[name]() for name in names]
+        self.sinks = sinks
+        self.top_n = top_n or Config.ALERT_TOP_N
+        self.min_rate = Config.ALERT_MIN_ANOMALY_RATE if min_rate is None else min_rate
+
+    @staticmethod
+    def build_event(file_path: Path, anomalies: dict, top_n: int, content_digest: str = None,
+                    sampled_rows: int = None) -> dict:
+        return {
+            "event": "anomalies_detected",
+            "file": Path(file_path).name,
+            "content_digest": content_digest,
+            "detected_at": datetime.now().isoformat(timespec="milliseconds"),
+            "rows": anomalies.get("total_rows"),
+            "sampled_rows": sampled_rows,  # detection ran on a sample (streaming path)
+            "anomaly_count": anomalies.get("anomaly_count", 0),
+            "anomaly_rate": round(anomalies.get("anomaly_percentage", 0) / 100, 6),
+            "top": [
+                {"row_index": a["row_index"], "score": round(a["anomaly_score"], 6), "values": a["values"]}
+                for a in anomalies.get("anomalies", [])[:top_n]
+            ]
+        }
+
+    def emit(self, file_path: Path, anomalies: dict, content_digest: str = None, sampled_rows: int = None) -> dict:
+        """Send the event to every sink; returns it, or None when below threshold. Never raises."""
+        if not self.sinks or not anomalies.get("anomaly_count"):
+            return None
+        event = self.build_event(file_path, anomalies, self.top_n, content_digest, sampled_rows)
+        if event["anomaly_rate"] < self.min_rate:
+            return None
+
+        for sink in self.sinks:
+            try:
+                sink.send(event)
+            except Exception as e:
+                # An alert must never take down the report it precedes
+                logger.warning(f"⚠️ Alert sink '{sink.name}' failed: {str(e)}")
+        logger.info(f"🚨 Alert sent: {event['anomaly_count']} anomalies in {event['file']} "
+                    f"({event['anomaly_rate']:.1%}) → {', '.join(s.name for s in self.sinks)}")
+        return event
@@ -57,22 +57,11 @@ class PDFGenerator:
             leading=14
         ))
         
-    def generate(self, data: dict, output_filename: str) -> Path:
-        """Generate premium PDF report"""
+    def prepare(self, data: dict) -> dict:
+        """Build every flowable that doesn't depend on the AI insights (header, KPIs, statistics and
+        the sections after them), so the layout work can overlap with a streaming LLM response"""
         try:
-            logger.info("📄 Generating premium PDF report...")
-            
-            output_path = Config.OUTPUT_DIR / output_filename
-            doc = SimpleDocTemplate(
-                str(output_path),
-                pagesize=A4,
-                rightMargin=0.5*inch,
-                leftMargin=0.5*inch,
-                topMargin=0.5*inch,
-                bottomMargin=0.5*inch
-            )
-            
-            story = []
+            head = []
             
             # ============ HEADER SECTION ============
             title_table = Table([['📊 Automated Data Analysis Report']], colWidths=[7.5*inch])
@@ -87,7 +76,7 @@ class PDFGenerator:
                 ('BOTTOMPADDING', (0, 0), (-1, -1), 20),
                 ('LEFTPADDING', (0, 0), (-1, -1), 20),
             ]))
-            story.append(title_table)
+            head.append(title_table)
             
             # Subtitle with date
             date_str = datetime.now().strftime('%B %d, %Y at %I:%M %p')
@@ -105,11 +94,11 @@ class PDFGenerator:
                 ('LEFTPADDING', (0, 0), (-1, -1), 20),
                 ('BORDER', (0, 0), (-1, -1), 1, self.BORDER_COLOR),
             ]))
-            story.append(subtitle_table)
-            story.append(Spacer(1, 0.25*inch))
+            head.append(subtitle_table)
+            head.append(Spacer(1, 0.25*inch))
             
             # ============ KPI CARDS ============
-            story.append(Paragraph("📈 Key Performance Indicators", self.styles['SectionHeader']))
+            head.append(Paragraph("📈 Key Performance Indicators", self.styles['SectionHeader']))
             
             metrics = data.get('metrics', {})
             anomalies = data.get('anomalies', {})
@@ -146,81 +135,63 @@ class PDFGenerator:
                 ('GRID', (0, 0), (-1, -1), 1, self.BORDER_COLOR),
             ]))
             
-            story.append(kpi_table)
-            story.append(Spacer(1, 0.3*inch))
+            head.append(kpi_table)
+            head.append(Spacer(1, 0.3*inch))
             
-            # ============ AI INSIGHTS ============
-            story.append(Paragraph("🤖 AI-Generated Executive Insights", self.styles['SectionHeader']))
-            
-            insights_text = data.get('insights', 'No insights available')
-            
-            # Sanitize and format insights
-            insights_text = self._sanitize_html(insights_text)
-            
-            # Split into paragraphs for better layout
-            paragraphs = insights_text.split('\n\n')
-            insights_paras = []
-            
-            for para in paragraphs:
-                if para.strip():
-                    insights_paras.append(Paragraph(para.strip(), self.styles['InsightText']))
-                    insights_paras.append(Spacer(1, 0.1*inch))
-            
-            # Container for insights
-            insights_table = Table([[insights_paras]], colWidths=[6.8*inch])
-            insights_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#FEF3C7')),
-                ('BORDER', (0, 0), (-1, -1), 2, self.WARNING_COLOR),
-                ('TOPPADDING', (0, 0), (-1, -1), 16),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 16),
-                ('LEFTPADDING', (0, 0), (-1, -1), 16),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 16),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ]))
-            
-            story.append(insights_table)
-            story.append(Spacer(1, 0.3*inch))
+            tail = []
             
             # ============ STATISTICAL SUMMARY ============
-            story.append(Paragraph("📊 Statistical Summary", self.styles['SectionHeader']))
+            tail.append(Paragraph("📊 Statistical Summary", self.styles['SectionHeader']))
             
             summary_stats = metrics.get('summary_stats', {})
             if summary_stats:
                 stats_data = [['Metric', 'Mean', 'Median', 'Std Dev', 'Min', 'Max']]
                 
                 for col, stats in list(summary_stats.items())[:6]:
-                    stats_data.append([
-                        col,
-                        f"{stats['mean']:,.0f}" if stats['mean'] > 100 else f"{stats['mean']:.2f}",
-                        f"{stats['median']:,.0f}" if stats['median'] > 100 else f"{stats['median']:.2f}",
-                        f"{stats['std']:,.0f}" if stats['std'] > 100 else f"{stats['std']:.2f}",
-                        f"{stats['min']:,.0f}" if stats['min'] > 100 else f"{stats['min']:.2f}",
-                        f"{stats['max']:,.0f}" if stats['max'] > 100 else f"{stats['max']:.2f}"
+                    stats_data.append([col] + [
+                        self._format_number(stats[key]) for key in ('mean', 'median', 'std', 'min', 'max')
                     ])
                 
                 stats_table = Table(stats_data, colWidths=[1.2*inch, 1*inch, 1*inch, 1*inch, 1*inch, 1*inch])
-                stats_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), self.PRIMARY_COLOR),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                    ('ALIGN', (0, 0), (-1, -1), 'RIGHT'),
-                    ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 10),
-                    ('TOPPADDING', (0, 0), (-1, 0), 10),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-                    ('BACKGROUND', (0, 1), (-1, -1), self.LIGHT_BG),
-                    ('TEXTCOLOR', (0, 1), (-1, -1), self.TEXT_DARK),
-                    ('FONTSIZE', (0, 1), (-1, -1), 9),
-                    ('TOPPADDING', (0, 1), (-1, -1), 8),
-                    ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, self.LIGHT_BG]),
-                    ('GRID', (0, 0), (-1, -1), 1, self.BORDER_COLOR),
-                    ('LINEBELOW', (0, 0), (-1, 0), 2, self.PRIMARY_COLOR),
-                ]))
+                stats_table.setStyle(self._data_table_style())
+                
+                tail.append(stats_table)
                 
-                story.append(stats_table)
+                approximation = metrics.get('approximation')
+                if approximation:
+                    tail.append(Spacer(1, 0.1*inch))
+                    tail.append(Paragraph(
+                        f"Approximate statistics: medians are within ±{approximation['quantile_rank_error']*100:.2f}% "
+                        f"of rank and distinct counts within ±{approximation['distinct_relative_error']*100:.2f}% "
+                        f"(sketch-based mode for large inputs).",
+                        self.styles['InsightText']
+                    ))
+                    if approximation.get('sampled_rows'):
+                        tail.append(Paragraph(
+                            f"Anomalies and charts are based on a uniform sample of "
+                            f"{approximation['sampled_rows']:,} rows (streamed for memory).",
+                            self.styles['InsightText']
+                        ))
+            
+            # ============ DATA QUALITY ============
+            tail.extend(self._build_quality_section(metrics.get('quality')))
+            
+            # ============ FEATURE SCREENING ============
+            tail.extend(self._build_screening_section(metrics.get('screening')))
+            
+            # ============ SINCE LAST RUN / TO DATE ============
+            tail.extend(self._build_incremental_section(metrics.get('incremental')))
             
-            story.append(Spacer(1, 0.5*inch))
+            # ============ VS. PREVIOUS RUNS ============
+            tail.extend(self._build_history_section(metrics.get('history')))
+            
+            # ============ TIME-SERIES WINDOWS ============
+            tail.extend(self._build_time_series_section(metrics.get('time_series')))
+            
+            # ============ SEGMENT SUMMARY ============
+            tail.extend(self._build_segment_section(data.get('segments')))
+            
+            tail.append(Spacer(1, 0.5*inch))
             
             # ============ FOOTER ============
             footer_table = Table([
@@ -234,7 +205,34 @@ class PDFGenerator:
                 ('TOPPADDING', (0, 0), (-1, -1), 15),
                 ('BOTTOMPADDING', (0, 0), (-1, -1), 15),
             ]))
-            story.append(footer_table)
+            tail.append(footer_table)
+            
+            return {"head": head, "tail": tail}
+            
+        except Exception as e:
+            logger.error(f"❌ PDF preparation failed: {str(e)}")
+            raise
+    
+    def generate(self, data: dict, output_filename: str, prepared: dict = None) -> Path:
+        """Generate premium PDF report; pass prepare()'s result to skip rebuilding the insight-independent sections"""
+        try:
+            logger.info("📄 Generating premium PDF report...")
+            
+            if prepared is None:
+                prepared = self.prepare(data)
+            
+            output_path = Config.OUTPUT_DIR / output_filename
+            doc = SimpleDocTemplate(
+                str(output_path),
+                pagesize=A4,
+                rightMargin=0.5*inch,
+                leftMargin=0.5*inch,
+                topMargin=0.5*inch,
+                bottomMargin=0.5*inch
+            )
+            
+            insights = self._build_insights_section(data.get('insights') or 'No insights available', data.get('insights_source'))
+            story = prepared["head"] + insights + prepared["tail"]
             
             # Build PDF
             doc.build(story)
@@ -246,6 +244,317 @@ class PDFGenerator:
             logger.error(f"❌ PDF generation failed: {str(e)}")
             raise
     
+    def _build_insights_section(self, insights_text: str, source: str = None) -> list:
+        """AI insights (or the rule-based narrative) in a highlighted container"""
+        title = "📝 Executive Summary (rule-based)" if source == "narrative" else "🤖 AI-Generated Executive Insights"
+        section = [Paragraph(title, self.styles['SectionHeader'])]
+        
+        # Sanitize and format insights
+        insights_text = self._sanitize_html(insights_text)
+        
+        # Split into paragraphs for better layout
+        paragraphs = insights_text.split('\n\n')
+        insights_paras = []
+        
+        for para in paragraphs:
+            if para.strip():
+                insights_paras.append(Paragraph(para.strip(), self.styles['InsightText']))
+                insights_paras.append(Spacer(1, 0.1*inch))
+        
+        # Container for insights
+        insights_table = Table([[insights_paras]], colWidths=[6.8*inch])
+        insights_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#FEF3C7')),
+            ('BORDER', (0, 0), (-1, -1), 2, self.WARNING_COLOR),
+            ('TOPPADDING', (0, 0), (-1, -1), 16),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 16),
+            ('LEFTPADDING', (0, 0), (-1, -1), 16),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 16),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ]))
+        
+        section.append(insights_table)
+        section.append(Spacer(1, 0.3*inch))
+        return section
+    
+    def _data_table_style(self) -> TableStyle:
+        """Shared style for tabular report sections"""
+        return TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), self.PRIMARY_COLOR),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, -1), 'RIGHT'),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('TOPPADDING', (0, 0), (-1, 0), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+            ('BACKGROUND', (0, 1), (-1, -1), self.LIGHT_BG),
+            ('TEXTCOLOR', (0, 1), (-1, -1), self.TEXT_DARK),
+            ('FONTSIZE', (0, 1), (-1, -1), 9),
+            ('TOPPADDING', (0, 1), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, self.LIGHT_BG]),
+            ('GRID', (0, 0), (-1, -1), 1, self.BORDER_COLOR),
+            ('LINEBELOW', (0, 0), (-1, 0), 2, self.PRIMARY_COLOR),
+        ])
+    
+    @staticmethod
+    def _format_number(value) -> str:
+        if value is None:
+            return '—'
+        return f"{value:,.0f}" if abs(value) > 100 else f"{value:.2f}"
+    
+    def _build_quality_section(self, quality: dict) -> list:
+        """Gate outcome plus the columns that carry little or no signal"""
+        if not quality:
+            return []
+        
+        status = "passed" if quality['passed'] else "FAILED: " + "; ".join(quality['gate_failures'])
+        flowables = [
+            Paragraph("🩺 Data Quality", self.styles['SectionHeader']),
+            Paragraph(
+                f"{quality['rows']:,} rows × {quality['columns']} columns; "
+                f"{quality['duplicate_rows']:,} duplicate rows ({quality['duplicate_rate']:.1%}); "
+                f"{quality['numeric_null_rate']:.1%} of numeric values null. Quality gates {status}.",
+                self.styles['InsightText']
+            )
+        ]
+        
+        coerced = quality.get('coerced_values')
+        if coerced:
+            flowables.append(Paragraph(
+                "Unparseable values in numeric columns were loaded as nulls: "
+                + ", ".join(f"{col} ({count:,})" for col, count in coerced.items()) + ".",
+                self.styles['InsightText']
+            ))
+        
+        issues = {}
+        for key, label in (('all_null_columns', 'All null'), ('constant_columns', 'Constant'),
+                           ('near_constant_columns', 'Near-constant'), ('high_cardinality_columns', 'ID-like')):
+            for col in quality[key]:
+                issues.setdefault(col, label)
+        for col, column in quality['column_profiles'].items():
+            if col not in issues and column['null_rate'] > 0.2:
+                issues[col] = 'Sparse'
+        
+        if not issues:
+            flowables.append(Paragraph("No column-level issues found.", self.styles['InsightText']))
+            return flowables
+        
+        table_data = [['Column', 'Type', 'Null %', 'Distinct', 'Top Value %', 'Issue']]
+        for col, issue in list(issues.items())[:10]:
+            column = quality['column_profiles'][col]
+            table_data.append([
+                col,
+                column['dtype'],
+                f"{column['null_rate']:.1%}",
+                f"{column['n_unique']:,}",
+                f"{column['top_share']:.1%}",
+                issue
+            ])
+        
+        quality_table = Table(table_data, colWidths=[1.8*inch, 1*inch, 0.9*inch, 1*inch, 1.1*inch, 1.2*inch])
+        quality_table.setStyle(self._data_table_style())
+        flowables.append(quality_table)
+        return flowables
+    
+    def _build_screening_section(self, screening: dict) -> list:
+        """Which features anomaly detection actually saw, and why the others were dropped"""
+        if not screening or (not screening['dropped'] and not screening['projection']):
+            return []
+        
+        summary = (f"Anomaly detection used {len(screening['kept'])} of {screening['input_features']} "
+                   f"numeric features.")
+        projection = screening['projection']
+        if projection:
+            summary += f" They were projected to {projection['components']} {projection['method'].upper()} components"
+            if projection['explained_variance'] is not None:
+                summary += f" ({projection['explained_variance']:.0%} of variance retained)"
+            summary += "."
+        flowables = [
+            Paragraph("✂️ Feature Screening", self.styles['SectionHeader']),
+            Paragraph(summary, self.styles['InsightText'])
+        ]
+        
+        if screening['dropped']:
+            table_data = [['Dropped Feature', 'Reason']]
+            for item in screening['dropped'][:15]:
+                table_data.append([item['column'], item['reason']])
+            if len(screening['dropped']) > 15:
+                table_data.append([f"… and {len(screening['dropped']) - 15} more", ''])
+            screening_table = Table(table_data, colWidths=[3*inch, 4*inch])
+            screening_table.setStyle(self._data_table_style())
+            flowables.append(screening_table)
+        return flowables
+    
+    def _build_incremental_section(self, incremental: dict) -> list:
+        """Since-last-run and to-date views from the feed's persisted aggregates"""
+        if not incremental or not incremental.get('to_date'):
+            return []
+        
+        flowables = [
+            Paragraph("📅 Since Last Run & To Date", self.styles['SectionHeader']),
+            Paragraph(
+                f"Feed '{incremental['feed']}': {incremental['runs_to_date']} runs, "
+                f"{incremental['rows_to_date']:,} rows since {incremental['first_run']}. "
+                f"Previous file: {incremental['previous_file'] or 'none'}. "
+                f"To-date medians are approximate (±{incremental['quantile_rank_error']*100:.1f}% rank).",
+                self.styles['InsightText']
+            )
+        ]
+        
+        table_data = [['Metric', 'Last Run', 'This Run', 'Change', f"Rolling ({incremental['rolling_runs']})", 'To-Date Mean', 'To-Date Median']]
+        for col, totals in list(incremental['to_date'].items())[:8]:
+            delta = incremental['since_last_run'].get(col, {})
+            change = delta.get('change_pct')
+            table_data.append([
+                col,
+                self._format_number(delta.get('previous_mean')),
+                self._format_number(delta.get('current_mean')),
+                '—' if change is None else f"{change:+.1f}%",
+                self._format_number(incremental['rolling'][col]['mean']),
+                self._format_number(totals['mean']),
+                self._format_number(totals['median'])
+            ])
+        
+        incremental_table = Table(table_data, colWidths=[1.3*inch, 0.9*inch, 0.9*inch, 0.8*inch, 1*inch, 1*inch, 1.1*inch])
+        incremental_table.setStyle(self._data_table_style())
+        flowables.append(incremental_table)
+        return flowables
+    
+    def _build_history_section(self, history: dict) -> list:
+        """This run against the feed's trailing baseline from the run archive"""
+        if not history:
+            return []
+        
+        drifted = history['drifted']
+        flowables = [
+            Paragraph("🗄️ vs. Previous Runs", self.styles['SectionHeader']),
+            Paragraph(
+                f"Feed '{history['feed']}' compared with its last {history['baseline_runs']} run(s) "
+                f"(previous file: {history['previous_file']}). "
+                + (f"Means beyond {history['threshold']:.1f}σ of the baseline: {', '.join(drifted)}."
+                   if drifted else f"No column mean is beyond {history['threshold']:.1f}σ of the baseline."),
+                self.styles['InsightText']
+            )
+        ]
+        
+        def row(label, comparison, percent=False):
+            fmt = (lambda v: '—' if v is None else f"{v:.2%}") if percent else self._format_number
+            change, zscore = comparison['change_pct'], comparison['zscore']
+            return [
+                label,
+                fmt(comparison['current']),
+                fmt(comparison['baseline_mean']),
+                fmt(comparison['baseline_std']),
+                '—' if change is None else f"{change:+.1f}%",
+                '—' if zscore is None else f"{zscore:+.1f}",
+                'DRIFT' if comparison['drifted'] else ''
+            ]
+        
+        # Drifted columns first, then the largest moves
+        columns = sorted(history['columns'].items(),
+                         key=lambda item: (not item[1]['drifted'], -abs(item[1]['zscore'] or 0)))
+        table_data = [['Metric', 'This Run', 'Baseline', 'Baseline σ', 'Change', 'z', '']]
+        table_data.append(row('Rows', history['rows']))
+        table_data.append(row('Anomaly rate', history['anomaly_rate'], percent=True))
+        table_data.extend(row(f"{col} (mean)", comparison) for col, comparison in columns[:10])
+        
+        history_table = Table(table_data, colWidths=[1.8*inch, 1*inch, 1*inch, 1*inch, 0.9*inch, 0.7*inch, 0.6*inch])
+        history_table.setStyle(self._data_table_style())
+        flowables.append(history_table)
+        return flowables
+    
+    def _build_time_series_section(self, time_series: dict) -> list:
+        """Window-level anomalies and latest period-over-period changes"""
+        if not time_series:
+            return []
+        
+        flowables = [
+            Paragraph("⏱️ Time-Series Windows", self.styles['SectionHeader']),
+            Paragraph(
+                f"{time_series['window_count']} {time_series['interval']} windows on "
+                f"'{time_series['timestamp_column']}' from {time_series['start']} to {time_series['end']}.",
+                self.styles['InsightText']
+            )
+        ]
+        
+        changes = [
+            f"{col}: {pct:+.1f}%" for col, pct in time_series['period_over_period'].items()
+            if pct is not None
+        ][:6]
+        if changes:
+            flowables.append(Paragraph(
+                "Latest window vs. previous: " + ", ".join(changes),
+                self.styles['InsightText']
+            ))
+        
+        flagged = time_series['flagged_windows']
+        if flagged:
+            window_data = [['Window', 'Metric', 'Value', 'Baseline', 'Z-Score']]
+            for window in flagged:
+                window_data.append([
+                    window['window'][:19],
+                    window['metric'],
+                    self._format_number(window['value']),
+                    self._format_number(window['baseline']),
+                    f"{window['zscore']:+.1f}"
+                ])
+            window_table = Table(window_data, colWidths=[1.8*inch, 1.8*inch, 1.1*inch, 1.1*inch, 1*inch])
+            window_table.setStyle(self._data_table_style())
+            flowables.append(window_table)
+        else:
+            flowables.append(Paragraph("No window-level anomalies flagged.", self.styles['InsightText']))
+        
+        return flowables
+    
+    def _build_segment_section(self, segments: dict) -> list:
+        """Per-segment summary table and the top anomalies of each segment"""
+        if not segments or not segments.get('segments'):
+            return []
+        
+        flowables = [Paragraph(
+            f"🧩 Segment Summary ({' / '.join(segments['dimensions'])})",
+            self.styles['SectionHeader']
+        )]
+        
+        top_segments = segments['segments'][:10]
+        summary_data = [['Segment', 'Rows', 'Anomalies', 'Anomaly Rate']]
+        for segment in top_segments:
+            rate = segment['anomaly_percentage']
+            summary_data.append([
+                segment['label'][:40],
+                f"{segment['rows']:,}",
+                '—' if segment['anomaly_count'] is None else str(segment['anomaly_count']),
+                '—' if rate is None else f"{rate}%"
+            ])
+        
+        summary_table = Table(summary_data, colWidths=[3.2*inch, 1.2*inch, 1.2*inch, 1.2*inch])
+        summary_table.setStyle(self._data_table_style())
+        flowables.append(summary_table)
+        
+        anomaly_data = [['Segment', 'Row', 'Score', 'Values']]
+        for segment in top_segments:
+            for anomaly in segment['top_anomalies']:
+                values = ', '.join(
+                    f"{col}={self._format_number(v)}" for col, v in list(anomaly['values'].items())[:3]
+                )
+                anomaly_data.append([
+                    segment['label'][:30],
+                    str(anomaly['row_index']),
+                    f"{anomaly['anomaly_score']:.3f}",
+                    values
+                ])
+        
+        if len(anomaly_data) > 1:
+            flowables.append(Spacer(1, 0.2*inch))
+            flowables.append(Paragraph("Top Anomalies per Segment", self.styles['InsightText']))
+            anomaly_table = Table(anomaly_data, colWidths=[2*inch, 0.7*inch, 0.8*inch, 3.3*inch])
+            anomaly_table.setStyle(self._data_table_style())
+            flowables.append(anomaly_table)
+        
+        return flowables
+    
     def _sanitize_html(self, text: str) -> str:
         """Sanitize and fix malformed HTML from AI output"""
         # Remove all HTML tags
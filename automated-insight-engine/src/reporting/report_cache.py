@@ -0,0 +1,172 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from src.config import Config
+from src.runtime.state_files import locked, write_atomic
+
+logger = logging.getLogger(__name__)
+
+# Bump when report layout or analysis semantics change in a way config values don't capture
+CACHE_VERSION = 1
+
+
+class ReportCache:
+    """Whole-report cache keyed by input content plus the Config values that shape the report"""
+
+    def __init__(self, cache_dir: Path = None, max_age_hours: float = None, max_bytes: int = None):
+        self.cache_dir = Path(cache_dir or Config.REPORT_CACHE_DIR)
+        self.max_age_seconds = (max_age_hours or Config.REPORT_CACHE_MAX_AGE_HOURS) * 3600
+        self.max_bytes = max_bytes or Config.REPORT_CACHE_MAX_BYTES
+        self.index_path = self.cache_dir / "index.json"
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def config_fingerprint() -> dict:
+        """Every setting that changes the analysis, the narrative or the layout"""
+        template_digest = hashlib.sha256()
+        for template in sorted(Config.TEMPLATE_DIR.glob("*")):
+            if template.is_file():
+                template_digest.update(template.read_bytes())
+
+        return {
+            "version": CACHE_VERSION,
+            "contamination": Config.CONTAMINATION_FACTOR,
+            "n_estimators": Config.N_ESTIMATORS,
+            "feature_dtype": Config.FEATURE_DTYPE,
+            "model": Config.GEMINI_MODEL,
+            "temperature": Config.TEMPERATURE,
+            "max_tokens": Config.MAX_TOKENS,
+            "insight_mode": Config.INSIGHT_MODE,
+            "segment_mode": Config.SEGMENT_MODE,
+            "segment_columns": Config.SEGMENT_COLUMNS,
+            "segment_limits": [Config.SEGMENT_MAX_CARDINALITY, Config.SEGMENT_MIN_ROWS, Config.SEGMENT_TOP_ANOMALIES],
+            "time_series": [Config.TIME_SERIES_ENABLED, Config.TIMESTAMP_COLUMN, Config.TS_INTERVAL,
+                            Config.TS_HOURLY_MAX_DAYS, Config.TS_ROLLING_WINDOWS, Config.TS_ZSCORE_THRESHOLD,
+                            Config.TS_REPORT_WINDOWS],
+            "stats_mode": Config.STATS_MODE,
+            "approximation": [Config.APPROX_ROW_THRESHOLD, Config.HLL_PRECISION, Config.SKETCH_K,
+                              Config.ANALYSIS_SAMPLE_ROWS],
+            "quality": [Config.QUALITY_GATES_ENABLED, Config.QUALITY_MIN_ROWS, Config.QUALITY_MAX_NULL_RATE,
+                        Config.QUALITY_MAX_DUPLICATE_RATE, Config.QUALITY_NEAR_CONSTANT_SHARE,
+                        Config.QUALITY_HIGH_CARDINALITY_RATIO],
+            "screening": [Config.SCREENING_ENABLED, Config.SCREEN_MAX_CORRELATION, Config.SCREEN_DROP_IDS,
+                          Config.SCREEN_PROJECTION, Config.SCREEN_TARGET_DIM, Config.SCREEN_SAMPLE_ROWS],
+            "incremental": [Config.INCREMENTAL_ENABLED, Config.ROLLING_RUNS],
+            "run_archive": [Config.RUN_ARCHIVE_ENABLED, Config.RUN_ARCHIVE_BASELINE_RUNS, Config.DRIFT_ZSCORE,
+                            Config.DRIFT_MIN_RUNS],
+            "template": template_digest.hexdigest()
+        }
+
+    @staticmethod
+    def summarize(report_data: dict) -> dict:
+        """The parts of a report worth keeping next to the PDF (sketch payloads are dropped)"""
+        metrics = {k: v for k, v in report_data.get("metrics", {}).items() if k != "sketches"}
+        return {
+            "metrics": metrics,
+            "anomalies": report_data.get("anomalies"),
+            "segments": report_data.get("segments"),
+            "insights": report_data.get("insights"),
+            "insights_source": report_data.get("insights_source")
+        }
+
+    @staticmethod
+    def cacheable(report_data: dict) -> bool:
+        """False when the local narrative stood in for a failed or late LLM call, or the LLM's response was
+        cut short; cached, that report would be served for every re-delivery until the entry expired"""
+        source = report_data.get("insights_source")
+        return source != "partial" and (source != "narrative" or Config.INSIGHT_MODE == "fast")
+
+    def key(self, content_digest: str, variant: str = "engine", history: str = None) -> str:
+        """variant separates pipelines that build different reports from the same input (engine vs dashboard);
+        history versions the prior-run state (run archive, incremental state) the report's sections compare with"""
+        fingerprint = json.dumps(self.config_fingerprint(), sort_keys=True)
+        return hashlib.sha256(f"{variant}:{content_digest}:{fingerprint}:{history}".encode('utf-8')).hexdigest()
+
+    def fetch(self, key: str, output_path: Path) -> tuple:
+        """On a hit, hard-link the cached PDF to output_path and return (path, summary); else (None, None)"""
+        with self._lock, locked(self.index_path):
+            index = self._read_index()
+            entry = index.get(key)
+            cached_pdf = self.cache_dir / f"{key}.pdf"
+
+            if entry is None or not cached_pdf.exists():
+                return None, None
+            if time.time() - entry["created_at"] > self.max_age_seconds:
+                self._remove(index, key)
+                self._write_index(index)
+                return None, None
+
+            self._link(cached_pdf, output_path)
+            entry["last_used"] = time.time()
+            entry["hits"] = entry.get("hits", 0) + 1
+            self._write_index(index)
+
+        summary_path = self.cache_dir / f"{key}.json"
+        summary = json.loads(summary_path.read_text(encoding='utf-8')) if summary_path.exists() else None
+        logger.info(f"⚡ Report cache hit ({entry['hits']} hits): {output_path.name}")
+        return output_path, summary
+
+    def store(self, key: str, report_path: Path, summary: dict = None):
+        """Keep a link to a freshly generated report plus its JSON-able summary"""
+        # One lock across files and index, so workers storing or evicting concurrently keep them consistent
+        with self._lock, locked(self.index_path):
+            cached_pdf = self.cache_dir / f"{key}.pdf"
+            self._link(report_path, cached_pdf)
+            size = cached_pdf.stat().st_size
+            if summary is not None:
+                summary_path = self.cache_dir / f"{key}.json"
+                write_atomic(summary_path, json.dumps(summary, default=str))
+                size += summary_path.stat().st_size
+
+            now = time.time()
+            index = self._read_index()
+            index[key] = {"created_at": now, "last_used": now, "size": size, "hits": 0, "source": report_path.name}
+            self._evict(index)
+            self._write_index(index)
+
+    def _evict(self, index: dict):
+        """Drop expired entries, then least recently used ones until under max_bytes"""
+        now = time.time()
+        for key in [k for k, e in index.items() if now - e["created_at"] > self.max_age_seconds]:
+            self._remove(index, key)
+
+        total = sum(e["size"] for e in index.values())
+        for key in sorted(index, key=lambda k: index[k]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            total -= index[key]["size"]
+            self._remove(index, key)
+
+    def _remove(self, index: dict, key: str):
+        index.pop(key, None)
+        for suffix in ('.pdf', '.json'):
+            (self.cache_dir / f"{key}{suffix}").unlink(missing_ok=True)
+        logger.info(f"🧹 Evicted cached report {key[:12]}")
+
+    @staticmethod
+    def _link(source: Path, target: Path):
+        """Hard link when possible (same filesystem), copy otherwise"""
+        if target.exists():
+            target.unlink()
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copy2(source, target)
+
+    def _read_index(self) -> dict:
+        if not self.index_path.exists():
+            return {}
+        try:
+            return json.loads(self.index_path.read_text(encoding='utf-8'))
+        except ValueError:
+            logger.warning("⚠️ Report cache index unreadable, starting fresh")
+            return {}
+
+    def _write_index(self, index: dict):
+        write_atomic(self.index_path, json.dumps(index, indent=2))
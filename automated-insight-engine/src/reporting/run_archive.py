@@ -0,0 +1,239 @@
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from src.config import Config
+from src.processing.sketches import RunningMoments
+from src.runtime.scheduler import feed_of
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    feed TEXT NOT NULL,
+    file TEXT NOT NULL,
+    content_digest TEXT,
+    finished_at REAL NOT NULL,
+    rows INTEGER,
+    anomaly_count INTEGER,
+    anomaly_rate REAL,
+    quality_passed INTEGER,
+    approximate INTEGER NOT NULL DEFAULT 0,
+    insights_source TEXT,
+    report_path TEXT,
+    time_to_first_signal REAL,
+    time_to_report REAL,
+    timings TEXT,
+    anomalies TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_feed ON runs (feed, id);
+CREATE INDEX IF NOT EXISTS idx_runs_digest ON runs (content_digest);
+
+CREATE TABLE IF NOT EXISTS run_metrics (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    feed TEXT NOT NULL,
+    column_name TEXT NOT NULL,
+    mean REAL,
+    median REAL,
+    std REAL,
+    min REAL,
+    max REAL,
+    sum REAL,
+    PRIMARY KEY (run_id, column_name)
+);
+CREATE INDEX IF NOT EXISTS idx_run_metrics_feed ON run_metrics (feed, column_name, run_id);
+"""
+
+STATS = ("mean", "median", "std", "min", "max", "sum")
+
+
+def _number(value):
+    """SQLite-safe float: None for missing, NaN or non-numeric"""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def _compare(current, baseline: RunningMoments, threshold: float, min_runs: int) -> dict:
+    """Current value against the trailing baseline's mean and sample standard deviation"""
+    mean = baseline.mean if baseline.count else None
+    std = baseline.std
+    change_pct = (current - mean) / abs(mean) * 100 if current is not None and mean else None
+    zscore = (current - mean) / std if current is not None and std else None
+    return {
+        "current": current,
+        "baseline_mean": mean,
+        "baseline_std": std,
+        "change_pct": change_pct,
+        "zscore": zscore,
+        "drifted": baseline.count >= min_runs and zscore is not None and abs(zscore) >= threshold
+    }
+
+
+def _moments(values: list) -> RunningMoments:
+    # Two-pass moments of the window; SUM(x * x) in SQL loses all precision on large means
+    return RunningMoments.from_array([value for value in values if value is not None])
+
+
+class RunArchive:
+    """Indexed SQLite archive of every run's metrics, anomaly summary, timings and report path"""
+
+    def __init__(self, db_path: Path = None, baseline_runs: int = None, drift_zscore: float = None):
+        self.db_path = Path(db_path or Config.RUN_ARCHIVE_PATH)
+        self.baseline_runs = baseline_runs or Config.RUN_ARCHIVE_BASELINE_RUNS
+        self.drift_zscore = drift_zscore or Config.DRIFT_ZSCORE
+        self.min_runs = Config.DRIFT_MIN_RUNS
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # WAL so batch workers can append while the dashboard or a CLI query reads
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def record(self, file_path: Path, report_data: dict, report_path: Path = None, timings: dict = None,
+               content_digest: str = None) -> int:
+        """Store one finished run; returns its id"""
+        try:
+            metrics = report_data.get("metrics", {})
+            anomalies = report_data.get("anomalies") or {}
+            latency = metrics.get("latency", {})
+            quality = metrics.get("quality")
+            feed = feed_of(file_path)
+            top = [{"row_index": a["row_index"], "score": a["anomaly_score"]}
+                   for a in anomalies.get("anomalies", [])[:Config.ALERT_TOP_N]]
+
+            with self._lock, closing(self._connect()) as conn, conn:
+                cursor = conn.execute(
+                    "INSERT INTO runs (feed, file, content_digest, finished_at, rows, anomaly_count, anomaly_rate, "
+                    "quality_passed, approximate, insights_source, report_path, time_to_first_signal, "
+                    "time_to_report, timings, anomalies) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (feed, Path(file_path).name, content_digest, time.time(), metrics.get("total_rows"),
+                     anomalies.get("anomaly_count"), (_number(anomalies.get("anomaly_percentage")) or 0) / 100,
+                     None if quality is None else int(quality["passed"]), int(bool(metrics.get("approximation"))),
+                     report_data.get("insights_source"), str(report_path) if report_path else None,
+                     latency.get("time_to_first_signal"), latency.get("time_to_report"),
+                     json.dumps({k: round(v, 4) for k, v in (timings or {}).items()}), json.dumps(top))
+                )
+                run_id = cursor.lastrowid
+                conn.executemany(
+                    f"INSERT INTO run_metrics (run_id, feed, column_name, {', '.join(STATS)}) "
+                    f"VALUES (?, ?, ?, {', '.join('?' * len(STATS))})",
+                    [(run_id, feed, col, *(_number(stats.get(stat)) for stat in STATS))
+                     for col, stats in metrics.get("summary_stats", {}).items()]
+                )
+            logger.info(f"🗄️ Archived run {run_id} for feed '{feed}'")
+            return run_id
+
+        except Exception as e:
+            logger.error(f"❌ Run archive write failed: {str(e)}")
+            raise
+
+    def feeds(self) -> list:
+        """Every archived feed with its run count and latest run"""
+        with closing(self._connect()) as conn:
+            return [dict(row) for row in conn.execute(
+                "SELECT feed, COUNT(*) AS runs, MAX(finished_at) AS last_run FROM runs GROUP BY feed ORDER BY feed"
+            )]
+
+    def latest_run(self, feed: str) -> int:
+        """Id of the feed's most recent run (None before the first); changes whenever its baseline can"""
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT MAX(id) FROM runs WHERE feed = ?", (feed,)).fetchone()[0]
+
+    def runs(self, feed: str, limit: int = 90) -> list:
+        """Most recent runs of a feed, oldest first"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT * FROM runs WHERE feed = ? ORDER BY id DESC LIMIT ?", (feed, limit)
+            ).fetchall()
+        return [{**dict(row), "timings": json.loads(row["timings"] or "{}"),
+                 "anomalies": json.loads(row["anomalies"] or "[]")} for row in reversed(rows)]
+
+    def history(self, feed: str, column: str, stat: str = "mean", limit: int = 90) -> list:
+        """One column's statistic across the feed's most recent runs, oldest first"""
+        if stat not in STATS:
+            raise ValueError(f"stat must be one of {STATS}")
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT r.id AS run_id, r.file, r.finished_at, m.{stat} AS value FROM run_metrics m "
+                f"JOIN runs r ON r.id = m.run_id WHERE m.feed = ? AND m.column_name = ? "
+                f"ORDER BY m.run_id DESC LIMIT ?",
+                (feed, column, limit)
+            ).fetchall()
+        return [dict(row) for row in reversed(rows)]
+
+    def drift(self, feed: str, metrics: dict = None, anomalies: dict = None, run_id: int = None) -> dict:
+        """Compare a run with the feed's trailing baseline (the baseline_runs before it).
+
+        Pass metrics/anomalies for a run that isn't archived yet; otherwise archived run run_id
+        (default: the feed's latest) is compared. None when there is no earlier run.
+        """
+        with closing(self._connect()) as conn:
+            if metrics is None:
+                run = conn.execute(
+                    "SELECT id, rows, anomaly_rate FROM runs WHERE feed = ? AND id <= COALESCE(?, 1e18) "
+                    "ORDER BY id DESC LIMIT 1",
+                    (feed, run_id)
+                ).fetchone()
+                if run is None:
+                    return None
+                current_run, current_rows, current_rate = run["id"], run["rows"], run["anomaly_rate"]
+                current = {row["column_name"]: row["mean"] for row in conn.execute(
+                    "SELECT column_name, mean FROM run_metrics WHERE run_id = ?", (current_run,))}
+            else:
+                current_run = None
+                current = {col: _number(stats.get("mean")) for col, stats in metrics.get("summary_stats", {}).items()}
+                current_rows = metrics.get("total_rows")
+                current_rate = (_number((anomalies or {}).get("anomaly_percentage")) or 0) / 100
+
+            # Previous runs that passed the quality gates (a rejected file would skew the baseline)
+            window = conn.execute(
+                "SELECT id, file FROM runs WHERE feed = ? AND id < COALESCE(?, 1e18) "
+                "AND COALESCE(quality_passed, 1) = 1 ORDER BY id DESC LIMIT ?",
+                (feed, current_run, self.baseline_runs)
+            ).fetchall()
+            if not window:
+                return None
+            ids = [row["id"] for row in window]
+            placeholders = ", ".join("?" * len(ids))
+
+            # At most baseline_runs values per column, fetched through the (run_id, column_name) key
+            values = {}
+            for row in conn.execute(
+                f"SELECT column_name, mean FROM run_metrics WHERE run_id IN ({placeholders}) AND mean IS NOT NULL",
+                ids
+            ):
+                values.setdefault(row["column_name"], []).append(row["mean"])
+            totals = conn.execute(f"SELECT rows, anomaly_rate FROM runs WHERE id IN ({placeholders})", ids).fetchall()
+
+        args = (self.drift_zscore, self.min_runs)
+        comparison = {
+            col: _compare(current.get(col), _moments(column_values), *args)
+            for col, column_values in values.items() if col in current
+        }
+        result = {
+            "feed": feed,
+            "baseline_runs": len(window),
+            "previous_file": window[0]["file"],
+            "threshold": self.drift_zscore,
+            "rows": _compare(current_rows, _moments([row["rows"] for row in totals]), *args),
+            "anomaly_rate": _compare(current_rate, _moments([row["anomaly_rate"] for row in totals]), *args),
+            "columns": comparison,
+            "drifted": [col for col, c in comparison.items() if c["drifted"]]
+        }
+        if result["drifted"]:
+            logger.info(f"📉 Drift against the last {len(window)} '{feed}' runs: {', '.join(result['drifted'])}")
+        return result
@@ -1,5 +1,3 @@
-import plotly.graph_objects as go
-import plotly.express as px
 import polars as pl
 import logging
 from pathlib import Path
@@ -0,0 +1,225 @@
+import json
+import logging
+import os
+import resource
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from src.config import Config
+from src.runtime.state_files import locked, write_atomic
+
+logger = logging.getLogger(__name__)
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+_MB = 1024 * 1024
+
+
+def current_rss_bytes() -> int:
+    """Resident set size of this process (falls back to the peak where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def default_budget_bytes() -> int:
+    """60% of the cgroup memory limit when running in a container, otherwise of physical memory"""
+    limit = None
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        try:
+            value = Path(path).read_text().strip()
+        except OSError:
+            continue
+        if value.isdigit() and int(value) < 1 << 60:
+            limit = int(value)
+            break
+    if limit is None:
+        limit = os.sysconf("SC_PHYS_PAGES") * _PAGE_SIZE
+    return int(limit * 0.6)
+
+
+class MemoryProbe:
+    """Samples RSS on a background thread and reports the peak growth over the starting level"""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.baseline = 0
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self) -> "MemoryProbe":
+        self.baseline = self.peak = current_rss_bytes()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss_bytes())
+
+    @property
+    def growth(self) -> int:
+        return max(self.peak - self.baseline, 0)
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, current_rss_bytes())
+
+
+class MemoryEstimator:
+    """Predicts a job's peak memory from file size, column count and format, calibrated from observed peaks"""
+
+    # Peak bytes per input byte before calibration: read_csv, the prepared frame, the feature
+    # matrix and the pandas/plotly copies add up to several times a CSV; Parquet is compressed
+    DEFAULT_RATIOS = {".csv": 4.0, ".parquet": 10.0}
+    COLUMN_OVERHEAD = 2 * _MB  # per-column stats, charts and report tables
+    BASE_OVERHEAD = 64 * _MB
+    MIN_CALIBRATION_BYTES = 8 * _MB  # smaller files are dominated by fixed costs
+    SMOOTHING = 0.3
+
+    def __init__(self, model_path: Path = None):
+        self.model_path = Path(model_path or Config.MEMORY_MODEL_PATH)
+        self.ratios = dict(self.DEFAULT_RATIOS)
+        self._lock = threading.Lock()
+        self._loaded_mtime = None
+        self._reload()
+
+    def describe(self, file_path: Path) -> tuple:
+        """(format, size, columns) of a file without loading it"""
+        file_path = Path(file_path)
+        fmt = file_path.suffix.lower()
+        if fmt == ".parquet":
+            # Imported here: the batch parent loads this module before set_thread_environment sizes Polars' pool
+            import polars as pl
+            columns = len(pl.read_parquet_schema(file_path))
+        else:
+            fmt = ".csv"
+            with open(file_path, 'rb') as f:
+                columns = f.readline().count(b',') + 1
+        return fmt, file_path.stat().st_size, columns
+
+    def estimate(self, file_path: Path) -> int:
+        fmt, size, columns = self.describe(file_path)
+        self._reload()
+        return int(size * self.ratios[fmt] + columns * self.COLUMN_OVERHEAD + self.BASE_OVERHEAD)
+
+    def observe(self, file_path: Path, peak_bytes: int):
+        """Fold an observed peak into the per-format ratio (exponentially weighted)"""
+        fmt, size, columns = self.describe(file_path)
+        if size < self.MIN_CALIBRATION_BYTES:
+            return
+        ratio = max(peak_bytes - columns * self.COLUMN_OVERHEAD - self.BASE_OVERHEAD, 0) / size
+        with self._lock, locked(self.model_path):
+            self._reload(force=True)  # under the lock, so no other process's update is lost
+            self.ratios[fmt] = (1 - self.SMOOTHING) * self.ratios[fmt] + self.SMOOTHING * ratio
+            self._save()
+        logger.info(f"✓ Memory model: {fmt} peak ratio {ratio:.2f} observed, now {self.ratios[fmt]:.2f}")
+
+    def _reload(self, force: bool = False):
+        # Other workers on the same volume calibrate too; pick up their updates
+        try:
+            mtime = self.model_path.stat().st_mtime_ns
+        except OSError:
+            return
+        if mtime == self._loaded_mtime and not force:
+            return
+        try:
+            self.ratios.update(json.loads(self.model_path.read_text(encoding='utf-8'))["ratios"])
+            self._loaded_mtime = mtime
+        except (OSError, ValueError, KeyError):
+            logger.warning("⚠️ Memory model unreadable, using defaults")
+
+    def _save(self):
+        write_atomic(self.model_path, json.dumps({"ratios": self.ratios}, indent=2))
+        self._loaded_mtime = self.model_path.stat().st_mtime_ns
+
+
+class Admission:
+    """A job's reservation against the memory budget"""
+
+    def __init__(self, file_path: Path, estimate: int, reserved: int, streaming: bool):
+        self.file_path = Path(file_path)
+        self.estimate = estimate
+        self.reserved = reserved
+        self.streaming = streaming
+        self.overlapped = False  # shared the process with another job, so its RSS growth isn't its own
+
+
+class AdmissionController:
+    """Starts jobs only while their estimated peaks fit in the memory budget"""
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, budget_bytes: int = None, estimator: MemoryEstimator = None, streaming_fraction: float = None):
+        self.budget = budget_bytes or (Config.MEMORY_BUDGET_MB * _MB) or default_budget_bytes()
+        self.estimator = estimator or MemoryEstimator()
+        self.streaming_fraction = streaming_fraction or Config.STREAMING_FRACTION
+        self.reserved = 0
+        self.running = 0
+        self._active = set()
+        self._condition = threading.Condition()
+
+    @classmethod
+    def shared(cls) -> "AdmissionController":
+        """One controller per process, so engines on different threads share a budget"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+                logger.info(f"✓ Memory budget: {cls._shared.budget / _MB:,.0f} MB")
+            return cls._shared
+
+    def plan(self, file_path: Path) -> Admission:
+        """Estimate a job; ones too large for an in-memory run go to the streaming path"""
+        estimate = self.estimator.estimate(file_path)
+        streaming_limit = int(self.budget * self.streaming_fraction)
+        streaming = estimate > streaming_limit and Path(file_path).suffix.lower() != '.parquet'
+        # The streaming path holds a few batches plus the detection sample, sized to fit its share
+        reserved = min(estimate, streaming_limit) if streaming else estimate
+        return Admission(file_path, estimate, reserved, streaming)
+
+    def acquire(self, admission: Admission):
+        """Block until the reservation fits; a job is always admitted when nothing else is running"""
+        with self._condition:
+            if self.running and self.reserved + admission.reserved > self.budget:
+                logger.info(
+                    f"⏳ Waiting for memory: {admission.file_path.name} needs {admission.reserved / _MB:,.0f} MB, "
+                    f"{self.reserved / _MB:,.0f} of {self.budget / _MB:,.0f} MB reserved"
+                )
+            self._condition.wait_for(
+                lambda: self.running == 0 or self.reserved + admission.reserved <= self.budget
+            )
+            self.reserved += admission.reserved
+            self.running += 1
+            for other in self._active:
+                other.overlapped = admission.overlapped = True
+            self._active.add(admission)
+
+    def release(self, admission: Admission, peak_bytes: int = None):
+        with self._condition:
+            self.reserved -= admission.reserved
+            self.running -= 1
+            self._active.discard(admission)
+            self._condition.notify_all()
+        # Streaming runs don't scale with file size, so they would skew the ratio; the process RSS of a
+        # run that overlapped another job includes that job's memory too
+        if peak_bytes is not None and not admission.streaming and not admission.overlapped:
+            self.estimator.observe(admission.file_path, peak_bytes)
+
+    @contextmanager
+    def admit(self, file_path: Path):
+        """Reserve, run, then release and calibrate from the measured peak"""
+        admission = self.plan(file_path)
+        self.acquire(admission)
+        probe = MemoryProbe()
+        completed = False
+        try:
+            with probe:
+                yield admission
+            completed = True
+        finally:
+            # A failed run's partial peak says nothing about the file's real footprint
+            self.release(admission, probe.growth if completed else None)
@@ -0,0 +1,79 @@
+import logging
+import os
+from pathlib import Path
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Native thread pools sized from the environment when first used
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS",
+                   "VECLIB_MAXIMUM_THREADS", "NUMEXPR_NUM_THREADS")
+
+# Set by apply_thread_budget for this process; read by the detectors when they build models
+_threads_per_job = None
+
+
+def available_cpus() -> int:
+    """Cores this process may run on: its CPU affinity, capped by a cgroup CPU quota in containers"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, int(quota) // int(period)))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def cpu_budget() -> int:
+    return Config.CPU_BUDGET or available_cpus()
+
+
+def plan_threads(concurrent_jobs: int = 1) -> int:
+    """Intra-job threads when concurrent_jobs share the budget (THREADS_PER_JOB overrides the split)"""
+    return Config.THREADS_PER_JOB or max(1, cpu_budget() // max(1, concurrent_jobs))
+
+
+def threads_per_job() -> int:
+    """n_jobs for scikit-learn and friends in this process"""
+    return _threads_per_job or plan_threads(1)
+
+
+def set_thread_environment(concurrent_jobs: int = 1, in_process: bool = False) -> int:
+    """Export the per-job thread settings without starting any pool (safe in a parent about to fork).
+
+    With separate worker processes (in_process=False) every pool gets the per-job share. With
+    worker threads in one process, the Polars pool is shared by all of them and keeps the whole
+    budget, while BLAS and joblib (which start threads per caller) get the per-job share.
+    """
+    global _threads_per_job
+    threads = plan_threads(concurrent_jobs)
+    os.environ["POLARS_MAX_THREADS"] = str(cpu_budget() if in_process else threads)
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(threads)
+    _threads_per_job = threads
+    return threads
+
+
+def apply_thread_budget(concurrent_jobs: int = 1, in_process: bool = False) -> int:
+    """Size Polars, BLAS/OpenMP and joblib for the process that does the work, before its first query"""
+    threads = set_thread_environment(concurrent_jobs, in_process)
+    polars_threads = int(os.environ["POLARS_MAX_THREADS"])
+
+    # Pools that already started ignore the environment; resize what can be resized
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(limits=threads)
+    except ImportError:
+        pass
+    import polars as pl
+    if pl.threadpool_size() != polars_threads:
+        logger.warning(f"⚠️ Polars thread pool already started with {pl.threadpool_size()} threads "
+                       f"(budget {polars_threads}); set the budget before the first Polars query")
+
+    logger.info(f"🧵 Thread budget: {cpu_budget()} CPU(s) across {concurrent_jobs} concurrent job(s), "
+                f"Polars {polars_threads} / BLAS and joblib {threads} thread(s) each")
+    return threads
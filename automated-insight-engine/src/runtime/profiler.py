@@ -0,0 +1,122 @@
+import cProfile
+import fnmatch
+import io
+import json
+import logging
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+# tracemalloc is process-wide; concurrent profiled jobs share one trace and the last one out stops it
+_trace_lock = threading.Lock()
+_trace_users = 0
+
+# The profiler's own bookkeeping shouldn't show up among the allocation sites
+_IGNORED_FRAMES = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+
+
+def _start_tracing():
+    global _trace_users
+    with _trace_lock:
+        if _trace_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(Config.PROFILE_TRACE_FRAMES)
+        _trace_users += 1
+
+
+def _stop_tracing():
+    global _trace_users
+    with _trace_lock:
+        _trace_users -= 1
+        if _trace_users == 0:
+            tracemalloc.stop()
+
+
+class StageProfiler:
+    """Per-stage wall-clock timings, plus cProfile and tracemalloc detail when profiling is enabled"""
+
+    def __init__(self, enabled: bool = False, top_n: int = None):
+        self.enabled = enabled
+        self.top_n = top_n or Config.PROFILE_TOP_N
+        self.timings = {}
+        self.stages = {}
+
+    @classmethod
+    def for_file(cls, file_path: Path, enabled: bool = None) -> "StageProfiler":
+        """Profile when asked for this run, when PROFILE_ENABLED is set, or when the name matches PROFILE_PATTERN"""
+        if enabled is None:
+            enabled = Config.PROFILE_ENABLED or bool(
+                Config.PROFILE_PATTERN and fnmatch.fnmatch(Path(file_path).name, Config.PROFILE_PATTERN)
+            )
+        return cls(enabled=enabled)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a pipeline stage; with profiling on, also capture its CPU profile and allocations"""
+        if not self.enabled:
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+            return
+
+        _start_tracing()
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot().filter_traces(_IGNORED_FRAMES)
+            _stop_tracing()
+            self.stages[name] = {
+                "profile": profile,
+                "peak_bytes": peak,
+                "allocations": after.compare_to(before.filter_traces(_IGNORED_FRAMES), 'lineno')[:self.top_n]
+            }
+
+    def summary(self) -> str:
+        return ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.timings.items())
+
+    def dump(self, report_path: Path) -> Path:
+        """Write <report>_profile/ with a .prof per stage (pstats/snakeviz) and a readable summary"""
+        if not self.enabled:
+            return None
+
+        profile_dir = Path(report_path).with_name(f"{Path(report_path).stem}_profile")
+        profile_dir.mkdir(parents=True, exist_ok=True)
+
+        lines, summary = [], {"timings": self.timings, "stages": {}}
+        for name, stage in self.stages.items():
+            stage["profile"].dump_stats(str(profile_dir / f"{name}.prof"))
+
+            buffer = io.StringIO()
+            pstats.Stats(stage["profile"], stream=buffer).sort_stats("cumulative").print_stats(self.top_n)
+            allocations = [
+                {"site": str(stat.traceback[0]), "size_diff": stat.size_diff, "count_diff": stat.count_diff}
+                for stat in stage["allocations"]
+            ]
+            summary["stages"][name] = {"peak_bytes": stage["peak_bytes"], "allocations": allocations}
+
+            lines.append(f"{'=' * 80}\n{name}: {self.timings[name]:.3f}s, "
+                         f"peak traced memory {stage['peak_bytes'] / 1024**2:.1f} MB\n{'=' * 80}")
+            lines.append("Top allocation sites (net growth over the stage):")
+            lines.extend(f"  {a['size_diff'] / 1024:>12,.1f} KiB  {a['count_diff']:>+9,}  {a['site']}" for a in allocations)
+            lines.append("\nTop functions by cumulative time:")
+            lines.append(buffer.getvalue())
+
+        (profile_dir / "summary.txt").write_text("\n".join(lines), encoding='utf-8')
+        (profile_dir / "summary.json").write_text(json.dumps(summary, indent=2), encoding='utf-8')
+        logger.info(f"🔬 Profile saved: {profile_dir}")
+        return profile_dir
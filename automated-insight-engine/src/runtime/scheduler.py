@@ -0,0 +1,151 @@
+import fnmatch
+import json
+import logging
+import re
+import threading
+import time
+from pathlib import Path
+from src.config import Config
+from src.runtime.state_files import locked, write_atomic
+from src.ingestion.schema_registry import derive_feed_key
+
+logger = logging.getLogger(__name__)
+
+HIGH, NORMAL, LOW = 1, 0, -1
+CLASS_NAMES = {HIGH: "high", NORMAL: "normal", LOW: "low"}
+
+_MB = 1024 * 1024
+# IngestionServer stores uploads as <stem>_<8 hex chars><suffix>
+_UPLOAD_SUFFIX = re.compile(r'_[0-9a-f]{8}$')
+
+
+def feed_of(file_path: Path) -> str:
+    """Feed key for timing history; uploads keep their original stem"""
+    file_path = Path(file_path)
+    if file_path.parent.resolve() == Path(Config.UPLOAD_DIR).resolve():
+        file_path = file_path.with_name(_UPLOAD_SUFFIX.sub('', file_path.stem) + file_path.suffix)
+    return derive_feed_key(file_path)
+
+
+class JobHistory:
+    """Per-feed processing rate (seconds per MB), learned from completed jobs and shared through a JSON file"""
+
+    SMOOTHING = 0.3
+    MIN_MB = 1.0  # fixed costs dominate below this size
+
+    def __init__(self, path: Path = None, default_rate: float = None):
+        self.path = Path(path or Config.SCHEDULER_HISTORY_PATH)
+        self.default_rate = default_rate or Config.SCHEDULER_DEFAULT_SECONDS_PER_MB
+        self.rates = {}
+        self._lock = threading.Lock()
+        self._loaded_mtime = None
+        self._reload()
+
+    def expected_seconds(self, file_path: Path, size: int = None) -> float:
+        size = Path(file_path).stat().st_size if size is None else size
+        self._reload()
+        rate = self.rates.get(feed_of(file_path), self.default_rate)
+        return rate * max(size / _MB, self.MIN_MB)
+
+    def observe(self, file_path: Path, seconds: float, size: int = None):
+        """Fold a completed job's duration into its feed's rate (exponentially weighted)"""
+        size = Path(file_path).stat().st_size if size is None else size
+        feed = feed_of(file_path)
+        rate = seconds / max(size / _MB, self.MIN_MB)
+        with self._lock, locked(self.path):
+            self._reload(force=True)  # under the lock, so no other process's update is lost
+            previous = self.rates.get(feed)
+            self.rates[feed] = rate if previous is None else (1 - self.SMOOTHING) * previous + self.SMOOTHING * rate
+            self._save()
+
+    def _reload(self, force: bool = False):
+        # Other workers on the same volume record timings too; pick up their updates
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except OSError:
+            return
+        if mtime == self._loaded_mtime and not force:
+            return
+        try:
+            self.rates.update(json.loads(self.path.read_text(encoding='utf-8'))["rates"])
+            self._loaded_mtime = mtime
+        except (OSError, ValueError, KeyError):
+            logger.warning("⚠️ Job timing history unreadable, using defaults")
+
+    def _save(self):
+        write_atomic(self.path, json.dumps({"rates": self.rates}, indent=2))
+        self._loaded_mtime = self.path.stat().st_mtime_ns
+
+
+class JobScheduler:
+    """Priority classes by file pattern, shortest-expected-job-first within a class, and aging against starvation"""
+
+    def __init__(self, history: JobHistory = None, class_gap: float = None, aging_rate: float = None):
+        self.history = history or JobHistory()
+        self.class_gap = Config.SCHEDULER_CLASS_GAP_SECONDS if class_gap is None else class_gap
+        self.aging_rate = Config.SCHEDULER_AGING_RATE if aging_rate is None else aging_rate
+        self._pending = []  # [file_path, priority, expected_seconds, submitted_at]
+        self._cond = threading.Condition()
+
+    @staticmethod
+    def classify(file_path: Path) -> int:
+        """HIGH/LOW when the file name, or its path under the input/upload directory, matches a pattern"""
+        file_path = Path(file_path)
+        candidates = [file_path.name]
+        for root in (Config.INPUT_DIR, Config.UPLOAD_DIR):
+            try:
+                candidates.append(file_path.resolve().relative_to(Path(root).resolve()).as_posix())
+            except ValueError:
+                continue
+        for priority, patterns in ((HIGH, Config.PRIORITY_HIGH_PATTERNS), (LOW, Config.PRIORITY_LOW_PATTERNS)):
+            if any(fnmatch.fnmatch(candidate, pattern) for candidate in candidates for pattern in patterns):
+                return priority
+        return NORMAL
+
+    def assess(self, file_path: Path) -> tuple:
+        """(priority, expected_seconds) for a newly arrived file"""
+        return self.classify(file_path), self.history.expected_seconds(file_path)
+
+    def sort_key(self, priority: int, expected_seconds: float, waited_seconds: float) -> float:
+        """Lower runs first: each class is worth class_gap seconds, and waiting earns aging_rate per second,
+        so a long job overtakes newer short ones once it has waited long enough and never starves"""
+        return expected_seconds - priority * self.class_gap - waited_seconds * self.aging_rate
+
+    def observe(self, file_path: Path, seconds: float):
+        try:
+            self.history.observe(file_path, seconds)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not record timing for {Path(file_path).name}: {str(e)}")
+
+    def submit(self, file_path: Path):
+        """Queue a file for run_forever (in-process mode; the SQLite JobQueue orders by the same key)"""
+        priority, expected = self.assess(file_path)
+        with self._cond:
+            self._pending.append([Path(file_path), priority, expected, time.time()])
+            self._cond.notify()
+        logger.info(f"📥 Scheduled {Path(file_path).name}: {CLASS_NAMES[priority]} priority, ~{expected:.1f}s expected "
+                    f"({len(self._pending)} waiting)")
+
+    def next(self, timeout: float = None) -> Path:
+        """Pop the pending file with the lowest key right now; None on timeout"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._pending, timeout=timeout):
+                return None
+            now = time.time()
+            best = min(self._pending, key=lambda job: self.sort_key(job[1], job[2], now - job[3]))
+            self._pending.remove(best)
+            return best[0]
+
+    def run_forever(self, callback, stop_event: threading.Event = None):
+        """Run queued files through callback one at a time, recording how long each feed takes"""
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            file_path = self.next(timeout=1)
+            if file_path is None:
+                continue
+            started = time.time()
+            try:
+                callback(file_path)
+                self.observe(file_path, time.time() - started)
+            except Exception as e:
+                logger.error(f"❌ Error processing {file_path.name}: {str(e)}")
@@ -0,0 +1,43 @@
+import os
+import tempfile
+from contextlib import contextmanager, suppress
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: callers' threading locks still serialize a single process
+    fcntl = None
+
+
+@contextmanager
+def locked(path: Path):
+    """Exclusive lock on a JSON state file across threads and processes (batch pool, queue workers).
+
+    Hold it across the whole read-modify-write so concurrent writers never lose each other's updates.
+    The lock lives on a sidecar <name>.lock file, since the state file itself is replaced on write.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + ".lock"), "a") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def write_atomic(path: Path, text: str):
+    """Replace path in one step through a temp file unique to this writer, in the same directory"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(tmp_path)
+        raise
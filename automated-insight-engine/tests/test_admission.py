@@ -0,0 +1,99 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from src.runtime.admission import Admission, AdmissionController, MemoryEstimator
+
+_MB = 1024 * 1024
+
+
+@pytest.fixture
+def estimator(tmp_path):
+    return MemoryEstimator(tmp_path / "memory_model.json")
+
+
+def _csv(path: Path, size: int, columns: int = 3) -> Path:
+    path.write_text(",".join(f"c{i}" for i in range(columns)) + "\n")
+    with open(path, "r+b") as f:
+        f.truncate(size)
+    return path
+
+
+def _admission(name: str, reserved_mb: int) -> Admission:
+    return Admission(Path(name), reserved_mb * _MB, reserved_mb * _MB, streaming=False)
+
+
+def test_estimate_from_size_columns_and_format(tmp_path, estimator):
+    path = _csv(tmp_path / "sales.csv", 10 * _MB, columns=4)
+    expected = 10 * _MB * 4.0 + 4 * MemoryEstimator.COLUMN_OVERHEAD + MemoryEstimator.BASE_OVERHEAD
+    assert estimator.estimate(path) == expected
+
+
+def test_large_csv_goes_to_the_streaming_path(tmp_path, estimator):
+    controller = AdmissionController(budget_bytes=400 * _MB, estimator=estimator, streaming_fraction=0.5)
+    small = controller.plan(_csv(tmp_path / "small.csv", 10 * _MB))
+    large = controller.plan(_csv(tmp_path / "large.csv", 100 * _MB))
+
+    assert not small.streaming and small.reserved == small.estimate
+    assert large.streaming and large.reserved == 200 * _MB
+
+
+def test_reservation_blocks_until_budget_frees(estimator):
+    controller = AdmissionController(budget_bytes=100 * _MB, estimator=estimator)
+    first, second = _admission("a.csv", 60), _admission("b.csv", 50)
+    controller.acquire(first)
+
+    admitted = threading.Event()
+    waiter = threading.Thread(target=lambda: (controller.acquire(second), admitted.set()))
+    waiter.start()
+    assert not admitted.wait(0.2)
+
+    controller.release(first)
+    assert admitted.wait(2)
+    waiter.join()
+    assert (controller.running, controller.reserved) == (1, 50 * _MB)
+
+
+def test_oversized_job_is_admitted_when_idle(estimator):
+    controller = AdmissionController(budget_bytes=100 * _MB, estimator=estimator)
+    controller.acquire(_admission("huge.csv", 500))
+    assert controller.running == 1
+
+
+def test_observed_peaks_persist_as_weighted_ratio(tmp_path, estimator):
+    path = _csv(tmp_path / "sales.csv", 10 * _MB, columns=2)
+    peak = 10 * _MB * 8.0 + 2 * MemoryEstimator.COLUMN_OVERHEAD + MemoryEstimator.BASE_OVERHEAD
+    estimator.observe(path, peak)
+
+    expected = 0.7 * 4.0 + 0.3 * 8.0
+    assert estimator.ratios[".csv"] == pytest.approx(expected)
+    # Another worker on the same volume picks the calibration up
+    assert MemoryEstimator(estimator.model_path).ratios[".csv"] == pytest.approx(expected)
+
+
+def test_small_files_do_not_calibrate(tmp_path, estimator):
+    estimator.observe(_csv(tmp_path / "tiny.csv", _MB), 500 * _MB)
+    assert estimator.ratios == MemoryEstimator.DEFAULT_RATIOS
+    assert not estimator.model_path.exists()
+
+
+def test_only_runs_alone_calibrate(monkeypatch, estimator):
+    observed = []
+    monkeypatch.setattr(estimator, "observe", lambda path, peak: observed.append(path.name))
+    controller = AdmissionController(budget_bytes=100 * _MB, estimator=estimator)
+
+    alone = _admission("alone.csv", 10)
+    controller.acquire(alone)
+    controller.release(alone, peak_bytes=20 * _MB)
+
+    first, second = _admission("a.csv", 10), _admission("b.csv", 10)
+    controller.acquire(first)
+    controller.acquire(second)
+    controller.release(first, peak_bytes=20 * _MB)
+    later = _admission("c.csv", 10)
+    controller.acquire(later)  # still overlaps second
+    controller.release(second, peak_bytes=20 * _MB)
+    controller.release(later, peak_bytes=20 * _MB)
+
+    assert observed == ["alone.csv"]
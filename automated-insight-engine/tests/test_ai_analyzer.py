@@ -0,0 +1,70 @@
+import itertools
+import time
+
+import pytest
+
+from src.analysis.ai_analyzer import AIAnalyzer
+from src.config import Config
+
+_METRICS = {"total_rows": 10, "columns": ["amount"], "numeric_columns": ["amount"],
+            "summary_stats": {"amount": {"mean": 5.0, "median": 5.0, "std": 1.0, "min": 3.0, "max": 7.0}}}
+_ANOMALIES = {"anomaly_count": 0, "anomaly_percentage": 0, "anomalies": []}
+
+
+class _Chunk:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _StreamingModel:
+    """Yields one chunk per delay; the first arrives before generate_content returns, as with the SDK"""
+
+    def __init__(self, delays: list):
+        self.delays = delays
+
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        def rest():
+            for i, delay in enumerate(self.delays[1:], start=1):
+                time.sleep(delay)
+                yield _Chunk(f"part {i}. ")
+
+        time.sleep(self.delays[0])
+        return itertools.chain([_Chunk("part 0. ")], rest())
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    monkeypatch.setattr(Config, "INSIGHT_MODE", "llm")
+    analyzer = AIAnalyzer()
+    analyzer.model_name = "test-model"
+    return analyzer
+
+
+def test_full_stream_within_deadline(analyzer, monkeypatch):
+    monkeypatch.setattr(Config, "LLM_DEADLINE_SECONDS", 2)
+    analyzer._model = _StreamingModel([0, 0.01, 0.01])
+
+    assert "".join(analyzer.stream_insights(_METRICS, _ANOMALIES)) == "part 0. part 1. part 2. "
+    assert analyzer.last_source == "llm"
+
+
+def test_deadline_bounds_the_whole_stream(analyzer, monkeypatch):
+    monkeypatch.setattr(Config, "LLM_DEADLINE_SECONDS", 0.3)
+    # Quick first token, then a stream that would take two more seconds
+    analyzer._model = _StreamingModel([0, 0.1, 0.1, 1.0, 1.0])
+
+    started = time.time()
+    text = "".join(analyzer.stream_insights(_METRICS, _ANOMALIES))
+
+    assert time.time() - started < 0.6
+    assert text.startswith("part 0. part 1. part 2. ")
+    assert "part 3." not in text
+    assert text.endswith("*(Response cut off at the analysis deadline.)*")
+    assert analyzer.last_source == "partial"
+
+
+def test_no_deadline_waits_for_the_whole_stream(analyzer, monkeypatch):
+    monkeypatch.setattr(Config, "LLM_DEADLINE_SECONDS", 0)
+    analyzer._model = _StreamingModel([0, 0.05, 0.05])
+    assert "".join(analyzer.stream_insights(_METRICS, _ANOMALIES)).count("part") == 3
+    assert analyzer.last_source == "llm"
@@ -0,0 +1,89 @@
+import json
+import logging
+from pathlib import Path
+
+import pytest
+
+from src.config import Config
+from src.reporting.alerts import AlertEmitter, AlertSink, FileSink, StdoutSink, WebhookSink
+
+
+class _Recorder(AlertSink):
+    name = "recorder"
+
+    def __init__(self):
+        self.events = []
+
+    def send(self, event: dict):
+        self.events.append(event)
+
+
+class _Broken(AlertSink):
+    name = "broken"
+
+    def send(self, event: dict):
+        raise ConnectionError("endpoint down")
+
+
+def _anomalies(count: int = 2, rows: int = 100) -> dict:
+    return {
+        "anomaly_count": count,
+        "total_rows": rows,
+        "anomaly_percentage": count / rows * 100,
+        "anomalies": [{"row_index": i, "anomaly_score": -0.5 - i, "values": {"amount": 100.0 * i}} for i in range(count)]
+    }
+
+
+def test_sink_must_implement_send():
+    class Silent(AlertSink):
+        pass
+
+    with pytest.raises(TypeError):
+        Silent()
+
+
+@pytest.mark.parametrize("names, url, expected", [
+    (["file"], "", [FileSink]),
+    (["stdout", "file"], "", [StdoutSink, FileSink]),
+    (["webhook", "stdout"], "", [StdoutSink]),  # no URL, no webhook
+    (["webhook", "pager"], "http://localhost:9/hook", [WebhookSink]),  # unknown names are ignored
+])
+def test_sinks_selected_from_config(tmp_path, monkeypatch, names, url, expected):
+    monkeypatch.setattr(Config, "ALERT_SINKS", names)
+    monkeypatch.setattr(Config, "ALERT_WEBHOOK_URL", url)
+    monkeypatch.setattr(Config, "ALERT_FILE", tmp_path / "alerts.jsonl")
+    assert [type(sink) for sink in AlertEmitter().sinks] == expected
+
+
+def test_event_goes_to_every_sink(tmp_path):
+    recorder = _Recorder()
+    emitter = AlertEmitter(sinks=[recorder, FileSink(tmp_path / "alerts.jsonl")], top_n=1, min_rate=0)
+
+    event = emitter.emit(Path("sales.csv"), _anomalies(), content_digest="abc")
+
+    assert recorder.events == [event]
+    assert event["anomaly_rate"] == 0.02
+    assert event["top"] == [{"row_index": 0, "score": -0.5, "values": {"amount": 0.0}}]
+    assert json.loads((tmp_path / "alerts.jsonl").read_text()) == json.loads(json.dumps(event))
+
+
+def test_rate_below_threshold_is_suppressed(monkeypatch):
+    monkeypatch.setattr(Config, "ALERT_MIN_ANOMALY_RATE", 0.05)
+    recorder = _Recorder()
+    emitter = AlertEmitter(sinks=[recorder], top_n=5)
+
+    assert emitter.emit(Path("sales.csv"), _anomalies(count=2)) is None
+    assert emitter.emit(Path("sales.csv"), _anomalies(count=0)) is None
+    assert emitter.emit(Path("sales.csv"), _anomalies(count=10)) is not None
+    assert [e["anomaly_count"] for e in recorder.events] == [10]
+
+
+def test_failing_sink_only_logs_a_warning(caplog):
+    recorder = _Recorder()
+    emitter = AlertEmitter(sinks=[_Broken(), recorder], top_n=5, min_rate=0)
+
+    with caplog.at_level(logging.WARNING):
+        event = emitter.emit(Path("sales.csv"), _anomalies())
+
+    assert event is not None and recorder.events == [event]
+    assert "Alert sink 'broken' failed: endpoint down" in caplog.text
@@ -0,0 +1,83 @@
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from src import batch
+from src.config import Config
+
+
+class _Engine:
+    """Stands in for InsightEngine: records the order files arrive in and fails the ones named bad_*"""
+
+    def __init__(self):
+        self.seen = []
+
+    def process_file(self, file_path: Path):
+        self.seen.append(file_path.name)
+        if file_path.name.startswith("bad_"):
+            raise ValueError("no numeric columns")
+        file_path.unlink()  # e.g. an archiver moving processed files away
+        return file_path.with_suffix(".pdf")
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = _Engine()
+
+    def init_worker(force_refresh, profile, workers):
+        batch._ENGINE = engine
+
+    # Threads instead of processes, so the stand-in engine is shared with the test
+    monkeypatch.setattr(batch, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(batch, "_init_worker", init_worker)
+    monkeypatch.setattr(batch, "set_thread_environment", lambda workers: None)
+    monkeypatch.setattr(Config, "ADMISSION_ENABLED", False)
+    return engine
+
+
+def _write(path: Path, size: int) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    return path
+
+
+def test_collect_files_expands_directories_and_globs(tmp_path):
+    a = _write(tmp_path / "archive" / "a.csv", 1)
+    b = _write(tmp_path / "archive" / "2024" / "b.parquet", 1)
+    _write(tmp_path / "archive" / "notes.txt", 1)
+    c = _write(tmp_path / "exports" / "c.CSV", 1)
+
+    files = batch.collect_files([str(tmp_path / "archive"), str(tmp_path / "exports" / "*.CSV"), str(a)])
+    assert sorted(files) == sorted([a.resolve(), b.resolve(), c.resolve()])
+
+
+def test_largest_files_run_first_and_failures_are_recorded(tmp_path, engine):
+    _write(tmp_path / "small.csv", 10)
+    _write(tmp_path / "large.csv", 1000)
+    _write(tmp_path / "bad_medium.csv", 100)
+
+    summary = batch.run_batch([str(tmp_path)], workers=1, summary_path=tmp_path / "run.json")
+
+    assert engine.seen == ["large.csv", "bad_medium.csv", "small.csv"]
+    assert (summary["total"], summary["succeeded"], summary["failed"]) == (3, 2, 1)
+    results = {Path(r["file"]).name: r for r in summary["files"]}
+    assert results["bad_medium.csv"]["status"] == "failed"
+    assert results["bad_medium.csv"]["error"] == "no numeric columns"
+    # Processed files were deleted before their jobs finished; their sizes were recorded at submit
+    assert {name: r["bytes"] for name, r in results.items()} == {"small.csv": 10, "large.csv": 1000, "bad_medium.csv": 100}
+    assert json.loads((tmp_path / "run.json").read_text())["failed"] == 1
+
+
+def test_failed_batch_exits_non_zero(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "_initialized", True)
+    monkeypatch.setattr(Config, "INSIGHT_MODE", "fast")
+    monkeypatch.setattr(batch, "run_batch", lambda sources, **kwargs: {"failed": 1})
+    monkeypatch.setattr(sys, "argv", ["src.main", "batch", str(tmp_path)])
+    from src.main import main
+
+    with pytest.raises(SystemExit) as exit_info:
+        main()
+    assert exit_info.value.code == 1
@@ -0,0 +1,71 @@
+import os
+
+import pytest
+
+from src.config import Config
+from src.runtime import concurrency
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    monkeypatch.setattr(Config, "CPU_BUDGET", 8)
+    monkeypatch.setattr(Config, "THREADS_PER_JOB", 0)
+    monkeypatch.setattr(concurrency, "_threads_per_job", None)
+    # Restored after each test, whatever set_thread_environment exports
+    for var in ("POLARS_MAX_THREADS",) + concurrency.THREAD_ENV_VARS:
+        monkeypatch.setenv(var, "unset")
+
+
+def _cpus(monkeypatch, tmp_path, affinity: int, cpu_max: str = None):
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: set(range(affinity)), raising=False)
+    cgroup = tmp_path / "cpu.max"
+    if cpu_max is not None:
+        cgroup.write_text(cpu_max)
+    monkeypatch.setattr(concurrency, "Path", lambda path: cgroup)
+
+
+@pytest.mark.parametrize("jobs, expected", [(1, 8), (2, 4), (3, 2), (8, 1), (16, 1), (0, 8)])
+def test_budget_split_across_jobs(jobs, expected):
+    assert concurrency.plan_threads(jobs) == expected
+
+
+def test_threads_per_job_overrides_the_split(monkeypatch):
+    monkeypatch.setattr(Config, "THREADS_PER_JOB", 3)
+    assert concurrency.plan_threads(1) == 3
+    assert concurrency.plan_threads(8) == 3
+
+
+@pytest.mark.parametrize("cpu_max, expected", [
+    ("200000 100000\n", 2),
+    ("50000 100000\n", 1),  # under one core still gets a thread
+    ("max 100000\n", 16),
+    (None, 16),  # no cgroup v2 file
+    ("garbage\n", 16)
+])
+def test_cgroup_quota_caps_available_cpus(monkeypatch, tmp_path, cpu_max, expected):
+    _cpus(monkeypatch, tmp_path, affinity=16, cpu_max=cpu_max)
+    assert concurrency.available_cpus() == expected
+
+
+def test_budget_defaults_to_available_cpus(monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, "CPU_BUDGET", 0)
+    _cpus(monkeypatch, tmp_path, affinity=16, cpu_max="400000 100000")
+    assert concurrency.cpu_budget() == 4
+    assert concurrency.plan_threads(2) == 2
+
+
+def test_worker_processes_get_the_per_job_share():
+    assert concurrency.set_thread_environment(concurrent_jobs=4) == 2
+    assert os.environ["POLARS_MAX_THREADS"] == "2"
+    assert all(os.environ[var] == "2" for var in concurrency.THREAD_ENV_VARS)
+    assert concurrency.threads_per_job() == 2
+
+
+def test_worker_threads_share_the_polars_pool():
+    assert concurrency.set_thread_environment(concurrent_jobs=4, in_process=True) == 2
+    assert os.environ["POLARS_MAX_THREADS"] == "8"
+    assert all(os.environ[var] == "2" for var in concurrency.THREAD_ENV_VARS)
+
+
+def test_threads_per_job_before_any_budget_is_applied():
+    assert concurrency.threads_per_job() == 8
@@ -0,0 +1,35 @@
+from decimal import Decimal
+
+import polars as pl
+import pytest
+
+from src.ingestion.data_loader import DataLoader
+from src.processing.data_processor import DataProcessor
+from src.processing.feature_matrix import FeatureMatrix, numeric_columns
+
+
+def test_parquet_decimals_load_as_floats(tmp_path):
+    path = tmp_path / "ledger.parquet"
+    pl.DataFrame(
+        {"amount": [Decimal("1.10"), None, Decimal("3.25")], "units": [1, 2, None]},
+        schema={"amount": pl.Decimal(10, 2), "units": pl.Int64}
+    ).write_parquet(path)
+
+    df = DataLoader.load(path)
+    assert df.schema == {"amount": pl.Float64, "units": pl.Int64}
+
+    # The whole numeric path: null filling, the feature matrix and summary statistics
+    prepared = DataProcessor.prepare_for_ml(df)
+    features = FeatureMatrix.from_frame(prepared)
+    metrics = DataProcessor.calculate_metrics(prepared, numeric_cols=features.columns)
+    assert features.columns == ["amount", "units"]
+    assert prepared["amount"].null_count() == 0
+    assert metrics["summary_stats"]["amount"]["mean"] == pytest.approx(2.175)
+
+
+def test_numeric_columns_skip_leftover_decimals():
+    df = pl.DataFrame(
+        {"amount": [Decimal("1.10")], "rate": [0.5], "count": [1], "name": ["a"]},
+        schema={"amount": pl.Decimal(10, 2), "rate": pl.Float32, "count": pl.UInt16, "name": pl.Utf8}
+    )
+    assert numeric_columns(df) == ["rate", "count"]
@@ -0,0 +1,87 @@
+import numpy as np
+import polars as pl
+import pytest
+
+from src.config import Config
+from src.ingestion.data_loader import DataLoader
+from src.ingestion.schema_registry import SchemaRegistry
+from src.processing.data_processor import DataProcessor
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    monkeypatch.setattr(Config, "SKETCH_K", 200)
+    monkeypatch.setattr(Config, "HLL_PRECISION", 12)
+    monkeypatch.setattr(Config, "STREAM_BATCH_ROWS", 5000)
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(11)
+    rows = 40_000
+    return pl.DataFrame({
+        "region": rng.choice(["north", "south"], rows),
+        "amount": rng.lognormal(3, 1, rows),
+        "units": rng.integers(0, 5000, rows)
+    })
+
+
+def _assert_within_bounds(approx: dict, exact: dict, df: pl.DataFrame):
+    assert approx["total_rows"] == exact["total_rows"]
+    assert approx["numeric_columns"] == exact["numeric_columns"]
+    error = approx["approximation"]
+    for col, stats in exact["summary_stats"].items():
+        estimate = approx["summary_stats"][col]
+        for key in ("mean", "std", "sum"):
+            assert estimate[key] == pytest.approx(stats[key], rel=1e-9), f"{col} {key}"
+        assert (estimate["min"], estimate["max"]) == (stats["min"], stats["max"])
+
+        ordered = np.sort(df[col].to_numpy())
+        rank = np.searchsorted(ordered, estimate["median"]) / ordered.size
+        assert abs(rank - 0.5) <= error["quantile_rank_error"], f"{col} median rank {rank:.4f}"
+        assert estimate["distinct"] == pytest.approx(df[col].n_unique(), rel=3 * error["distinct_relative_error"])
+
+
+def test_streaming_metrics_match_exact_within_error_bounds(tmp_path, frame):
+    path = tmp_path / "sales.csv"
+    frame.write_csv(path)
+
+    streamed = DataProcessor.calculate_metrics_streaming(path)
+    exact = DataProcessor.calculate_metrics(frame, approximate=False)
+    _assert_within_bounds(streamed, exact, frame)
+
+
+def test_merged_file_metrics_match_exact_within_error_bounds(tmp_path, frame):
+    parts = [frame[:15_000], frame[15_000:]]
+    metrics = []
+    for i, part in enumerate(parts):
+        part.write_csv(tmp_path / f"sales_{i}.csv")
+        metrics.append(DataProcessor.calculate_metrics_streaming(tmp_path / f"sales_{i}.csv"))
+
+    merged = DataProcessor.merge_metrics(metrics)
+    _assert_within_bounds(merged, DataProcessor.calculate_metrics(frame, approximate=False), frame)
+
+
+def test_streaming_path_applies_learned_schema(tmp_path):
+    registry = SchemaRegistry(tmp_path / "schema_registry.json")
+    DataLoader.load_csv(_write(tmp_path / "sales_20250101.csv", ["1.5", "2"]), schema_registry=registry)
+
+    # Integers for the first batches, then a decimal and a stray token: inference would stop at int
+    values = [str(i) for i in range(12_000)] + ["2.5", "NA"]
+    path = _write(tmp_path / "sales_20250102.csv", values)
+
+    coerced = {}
+    metrics = DataProcessor.calculate_metrics_streaming(path, schema_registry=registry, coerced=coerced)
+    assert metrics["total_rows"] == 12_002
+    assert metrics["summary_stats"]["amount"]["max"] == 11_999
+    assert metrics["summary_stats"]["amount"]["sum"] == pytest.approx(sum(range(12_000)) + 2.5)
+    assert coerced == {"amount": 1}
+
+    sample = DataLoader.sample_csv(path, 20_000, batch_size=5000, schema_registry=registry)
+    assert sample["amount"].dtype == pl.Float64
+    assert sample["amount"].null_count() == 1
+
+
+def _write(path, amounts: list):
+    path.write_text("id,amount\n" + "".join(f"{i},{amount}\n" for i, amount in enumerate(amounts)))
+    return path
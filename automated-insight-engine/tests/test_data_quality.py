@@ -0,0 +1,91 @@
+import polars as pl
+import pytest
+
+from src.config import Config
+from src.processing.data_quality import DataQualityProfiler
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    monkeypatch.setattr(Config, "QUALITY_GATES_ENABLED", True)
+    monkeypatch.setattr(Config, "QUALITY_MIN_ROWS", 10)
+    monkeypatch.setattr(Config, "QUALITY_MAX_NULL_RATE", 0.5)
+    monkeypatch.setattr(Config, "QUALITY_MAX_DUPLICATE_RATE", 0.5)
+    monkeypatch.setattr(Config, "QUALITY_NEAR_CONSTANT_SHARE", 0.99)
+    monkeypatch.setattr(Config, "QUALITY_HIGH_CARDINALITY_RATIO", 0.9)
+
+
+@pytest.fixture
+def frame():
+    rows = 200
+    return pl.DataFrame({
+        "amount": [float(i % 50) for i in range(rows)],
+        "empty": pl.Series([None] * rows, dtype=pl.Float64),
+        "currency": ["EUR"] * rows,
+        "flag": [1] + [0] * (rows - 1),
+        "order_id": [f"o-{i}" for i in range(rows)],
+        "region": ["north", "south"] * (rows // 2)
+    })
+
+
+def test_column_flags(frame):
+    quality = DataQualityProfiler().profile(frame)
+
+    assert quality["all_null_columns"] == ["empty"]
+    assert quality["constant_columns"] == ["currency"]
+    assert quality["near_constant_columns"] == ["flag"]
+    assert quality["high_cardinality_columns"] == ["order_id"]
+    assert quality["column_profiles"]["empty"]["n_unique"] == 0
+    assert quality["column_profiles"]["flag"]["top_share"] == pytest.approx(199 / 200)
+    assert quality["passed"]
+
+
+def test_duplicate_rows_are_counted(frame):
+    quality = DataQualityProfiler().profile(pl.concat([frame, frame[:30], frame[:5]]))
+    assert quality["duplicate_rows"] == 35
+    assert quality["duplicate_rate"] == pytest.approx(35 / 235)
+
+
+def test_coerced_values_are_reported(frame):
+    assert DataQualityProfiler().profile(frame, coerced={"amount": 3})["coerced_values"] == {"amount": 3}
+
+
+@pytest.mark.parametrize("df, failure", [
+    (pl.DataFrame({"amount": [1.0, 2.0]}), "only 2 rows (minimum 10)"),
+    (pl.DataFrame({"amount": [1.0] * 8 + [2.0, 3.0], "id": [1] * 8 + [2, 3]}), "70% of rows are duplicates"),
+    (pl.DataFrame({"amount": [1.0, None, None, None] * 5, "units": [None, 2.0, 3.0, None] * 5,
+                   "id": [f"r{i}" for i in range(20)]}), "62% of numeric values are null"),
+    (pl.DataFrame({"name": [f"n{i}" for i in range(20)]}), "no numeric columns"),
+    (pl.DataFrame({"amount": [5.0] * 20, "name": [f"n{i}" for i in range(20)]}),
+     "every numeric column is empty or constant"),
+])
+def test_each_gate_fails(df, failure):
+    quality = DataQualityProfiler().profile(df)
+    assert not quality["passed"]
+    assert quality["gate_failures"] == [failure]
+
+
+def test_disabled_gates_always_pass(monkeypatch):
+    monkeypatch.setattr(Config, "QUALITY_GATES_ENABLED", False)
+    assert DataQualityProfiler().profile(pl.DataFrame({"name": ["a"]}))["passed"]
+
+
+def test_file_without_numeric_columns_gets_a_quality_report(tmp_path, monkeypatch):
+    from src.reporting.pdf_generator import PDFGenerator
+
+    df = pl.DataFrame({"name": [f"n{i}" for i in range(20)], "region": ["north", "south"] * 10})
+    quality = DataQualityProfiler().profile(df)
+    metrics = DataQualityProfiler.skipped_metrics(df, quality)
+    anomalies = DataQualityProfiler.skipped_anomalies(metrics["total_rows"])
+    insights = DataQualityProfiler.describe_failures(quality)
+
+    assert metrics["numeric_columns"] == [] and metrics["quality"] is quality
+    assert anomalies["skipped"] and anomalies["total_rows"] == 20
+    assert "• no numeric columns" in insights
+
+    monkeypatch.setattr(Config, "OUTPUT_DIR", tmp_path)
+    report = PDFGenerator().generate(
+        {"title": "names.csv", "metrics": metrics, "anomalies": anomalies, "insights": insights},
+        "report_names.pdf"
+    )
+    assert report.read_bytes().startswith(b"%PDF")
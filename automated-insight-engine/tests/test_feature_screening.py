@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from src.config import Config
+from src.processing.feature_matrix import FeatureMatrix
+from src.processing.feature_screening import FeatureScreener
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    monkeypatch.setattr(Config, "SCREEN_DROP_IDS", True)
+    monkeypatch.setattr(Config, "QUALITY_HIGH_CARDINALITY_RATIO", 0.9)
+
+
+def _matrix(columns: dict) -> FeatureMatrix:
+    return FeatureMatrix(list(columns), np.asfortranarray(np.column_stack(list(columns.values()))))
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(3)
+
+
+def _screener(**kwargs) -> FeatureScreener:
+    defaults = {"max_correlation": 0.95, "projection": "none", "target_dim": 2, "sample_rows": 5000}
+    return FeatureScreener(**{**defaults, **kwargs})
+
+
+def test_zero_variance_and_id_like_columns_are_dropped(rng):
+    rows = 500
+    amount = rng.normal(100, 10, rows)
+    spiky = np.zeros(rows)
+    spiky[250] = 40.0
+    features = _matrix({
+        "amount": amount,
+        "flat": np.full(rows, 3.0),
+        "spiky": spiky,  # flat but for one spike: exactly what detection should see
+        "customer_id": rng.permutation(rows).astype(float),
+        "row_number": np.arange(rows, dtype=float),
+        "units": rng.integers(1, 5, rows).astype(float)
+    })
+
+    screened, report = _screener().screen(features)
+
+    assert {item["column"]: item["reason"] for item in report["dropped"]} == {
+        "flat": "zero variance", "customer_id": "identifier", "row_number": "identifier"
+    }
+    assert screened.columns == ["amount", "spiky", "units"]
+    np.testing.assert_array_equal(screened.column("amount"), amount)
+
+
+def test_collinear_pruning_keeps_first_occurrence(rng):
+    base = rng.normal(0, 1, 1000)
+    features = _matrix({
+        "revenue": base,
+        "noise": rng.normal(0, 1, 1000),
+        "revenue_eur": base * 0.9 + rng.normal(0, 0.01, 1000),
+        "refunds": -base
+    })
+
+    screened, report = _screener().screen(features)
+
+    assert screened.columns == ["revenue", "noise"]
+    dropped = {item["column"]: item["reason"] for item in report["dropped"]}
+    assert set(dropped) == {"revenue_eur", "refunds"}
+    assert dropped["revenue_eur"].endswith("with revenue")
+    assert dropped["refunds"] == "|r|=1.00 with revenue"
+
+
+def test_nothing_dropped_reuses_the_input_matrix(rng):
+    features = _matrix({"a": rng.normal(0, 1, 100), "b": rng.normal(0, 1, 100)})
+    screened, report = _screener().screen(features)
+    assert screened is features
+    assert report["dropped"] == []
+
+
+@pytest.mark.parametrize("projection", ["pca", "random"])
+def test_projection_output_width(rng, projection):
+    features = _matrix({f"f{i}": rng.normal(0, 1, 300) for i in range(6)})
+
+    screened, report = _screener(projection=projection, target_dim=3).screen(features)
+
+    assert screened.values.shape == (300, 3)
+    assert screened.columns == [f"{projection}_{i}" for i in (1, 2, 3)]
+    assert report["output_features"] == 3
+    assert report["projection"]["components"] == 3
+    if projection == "pca":
+        assert 0 < report["projection"]["explained_variance"] <= 1
+
+
+def test_projection_skipped_below_target_dim(rng):
+    features = _matrix({f"f{i}": rng.normal(0, 1, 300) for i in range(3)})
+    screened, report = _screener(projection="pca", target_dim=5).screen(features)
+    assert screened.n_features == 3 and report["projection"] is None
@@ -0,0 +1,114 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from src.config import Config
+from src.ingestion.http_server import IngestionServer
+from src.ingestion.job_queue import JobQueue
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "HTTP_RETRY_AFTER_SECONDS", 7)
+    monkeypatch.setattr(Config, "HTTP_MAX_UPLOAD_BYTES", 1 << 20)
+    queue = JobQueue(tmp_path / "jobs.db", lease_seconds=60, max_attempts=3)
+    return IngestionServer(queue=queue, upload_dir=tmp_path / "uploads", max_pending=2)
+
+
+def _run(server: IngestionServer, scenario):
+    """Run scenario(client) against the app on a local test server"""
+    async def main():
+        async with TestClient(TestServer(server.build_app())) as client:
+            return await scenario(client)
+    return asyncio.run(main())
+
+
+def test_upload_is_accepted_and_queued(server):
+    async def scenario(client):
+        response = await client.post("/jobs?filename=sales.csv", data=b"id,amount\n1,2\n")
+        return response.status, await response.json()
+
+    status, body = _run(server, scenario)
+    assert status == 202
+    job = server.queue.get(body["job_id"])
+    assert job["status"] == JobQueue.PENDING
+    assert body["status_url"] == f"/jobs/{job['id']}"
+    stored = [p for p in server.upload_dir.iterdir()]
+    assert [p.name for p in stored] == [job["path"].rsplit("/", 1)[-1]]
+    assert stored[0].read_bytes() == b"id,amount\n1,2\n"
+
+
+def test_unsupported_suffix_is_rejected(server):
+    async def scenario(client):
+        return (await client.post("/jobs?filename=sales.xlsx", data=b"x")).status
+
+    assert _run(server, scenario) == 400
+    assert server.queue.pending_count() == 0
+
+
+def test_full_queue_answers_429_with_retry_after(server):
+    for name in ("a", "b"):
+        server.queue.enqueue(server.upload_dir / f"{name}.csv", dedup_key=name)
+
+    async def scenario(client):
+        response = await client.post("/jobs?filename=sales.csv", data=b"id\n1\n")
+        return response.status, response.headers.get("Retry-After")
+
+    assert _run(server, scenario) == (429, "7")
+    assert server.in_flight == 0
+    assert list(server.upload_dir.iterdir()) == []
+
+
+def test_concurrent_uploads_cannot_overshoot_the_limit(server, monkeypatch):
+    server.queue.enqueue(server.upload_dir / "a.csv", dedup_key="a")
+    count = server.queue.pending_count
+    calls = []
+
+    def slow_first_count():
+        # The first upload's count goes stale: the second one is enqueued before it returns
+        calls.append(None)
+        pending = count()
+        if len(calls) == 1:
+            time.sleep(0.3)
+        return pending
+
+    monkeypatch.setattr(server.queue, "pending_count", slow_first_count)
+
+    async def scenario(client):
+        responses = await asyncio.gather(*(
+            client.post(f"/jobs?filename=sales_{i}.csv", data=b"id\n1\n") for i in range(2)
+        ))
+        return sorted(response.status for response in responses)
+
+    assert _run(server, scenario) == [202, 429]
+    assert count() == 2
+
+
+def test_job_status_and_report_download(server, tmp_path):
+    async def scenario(client):
+        job_id = (await (await client.post("/jobs?filename=sales.csv", data=b"id\n1\n")).json())["job_id"]
+        pending = await (await client.get(f"/jobs/{job_id}")).json()
+        early = (await client.get(f"/jobs/{job_id}/report")).status
+
+        report = tmp_path / "report_sales.pdf"
+        report.write_bytes(b"%PDF-report")
+        job = server.queue.claim("worker")
+        server.queue.complete(job["id"], "worker", report)
+
+        done = await (await client.get(f"/jobs/{job_id}")).json()
+        download = await client.get(done["report_url"])
+        body = await download.read()
+        report.unlink()
+        gone = (await client.get(done["report_url"])).status
+        missing = (await client.get("/jobs/999")).status
+        return pending, early, done, download.status, body, gone, missing
+
+    pending, early, done, status, body, gone, missing = _run(server, scenario)
+    assert pending["status"] == JobQueue.PENDING and pending["report_url"] is None
+    assert early == 409
+    assert done["status"] == JobQueue.DONE
+    assert (status, body) == (200, b"%PDF-report")
+    assert gone == 410
+    assert missing == 404
@@ -0,0 +1,76 @@
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from src.config import Config
+from src.processing.incremental_state import IncrementalState
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    monkeypatch.setattr(Config, "ROLLING_RUNS", 2)
+    monkeypatch.setattr(Config, "SKETCH_K", 200)
+
+
+@pytest.fixture
+def state(tmp_path):
+    return IncrementalState(tmp_path / "incremental")
+
+
+def _update(state, name: str, amounts: list, content_key: str = None) -> dict:
+    df = pl.DataFrame({"amount": amounts})
+    return state.update(Path(name), df, ["amount"], content_key=content_key or name)
+
+
+def test_state_lives_in_its_own_directory(monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, "STATE_DIR", tmp_path)
+    _update(IncrementalState(), "job_timings_20250101.csv", [1.0])
+    assert (tmp_path / "incremental" / "job_timings.json").exists()
+    assert not (tmp_path / "job_timings.json").exists()
+
+
+def test_redelivered_file_is_skipped(state):
+    _update(state, "sales_20250101.csv", [1.0, 2.0], content_key="digest-a")
+    again = _update(state, "sales_20250101_142425.csv", [1.0, 2.0], content_key="digest-a")
+
+    assert again["already_processed"] is True
+    assert again["runs_to_date"] == 1
+    assert again["rows_to_date"] == 2
+    assert state.version(Path("sales_20250102.csv")) == 1
+
+
+def test_since_last_run_compares_with_previous_file(state):
+    _update(state, "sales_20250101.csv", [10.0, 10.0])
+    views = _update(state, "sales_20250102.csv", [15.0, 15.0])
+
+    assert views["previous_file"] == "sales_20250101.csv"
+    assert views["since_last_run"]["amount"] == {
+        "previous_mean": 10.0, "current_mean": 15.0, "change_pct": pytest.approx(50.0)
+    }
+
+
+def test_window_rolls_over_while_to_date_keeps_everything(state):
+    first = _update(state, "sales_20250101.csv", [1.0, 1.0])
+    _update(state, "sales_20250102.csv", [2.0, 2.0])
+    views = _update(state, "sales_20250103.csv", [6.0, 6.0])
+
+    # ROLLING_RUNS=2: the first file has left the window but not the to-date totals
+    assert views["rolling_runs"] == 2
+    assert views["rolling"]["amount"]["count"] == 4
+    assert views["rolling"]["amount"]["mean"] == pytest.approx(4.0)
+    assert views["to_date"]["amount"]["count"] == 6
+    assert views["to_date"]["amount"]["mean"] == pytest.approx(3.0)
+    assert views["to_date"]["amount"]["min"] == 1.0
+    assert views["runs_to_date"] == 3
+    assert views["first_run"] == first["first_run"] is not None
+
+
+def test_seen_digests_are_capped(monkeypatch, state):
+    monkeypatch.setattr(IncrementalState, "SEEN_LIMIT", 2)
+    for day in range(1, 4):
+        _update(state, f"sales_2025010{day}.csv", [1.0], content_key=f"digest-{day}")
+
+    assert _update(state, "sales_20250103.csv", [1.0], content_key="digest-3")["already_processed"] is True
+    # Only the last SEEN_LIMIT digests are remembered
+    assert _update(state, "sales_20250101.csv", [1.0], content_key="digest-1")["already_processed"] is False
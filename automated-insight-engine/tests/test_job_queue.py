@@ -0,0 +1,199 @@
+import logging
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+
+from src.ingestion.job_queue import JobQueue, QueueWorker
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "jobs.db"
+
+
+def _fill(queue: JobQueue, count: int) -> list:
+    return [queue.enqueue(Path(f"file_{i}.csv"), dedup_key=f"file_{i}") for i in range(count)]
+
+
+def test_enqueue_is_idempotent(db_path):
+    queue = JobQueue(db_path, lease_seconds=60, max_attempts=3)
+    first = queue.enqueue(Path("a.csv"), dedup_key="a")
+    assert queue.enqueue(Path("a.csv"), dedup_key="a") == first
+    assert queue.pending_count() == 1
+
+
+def test_file_still_being_written_is_enqueued_once(db_path, tmp_path):
+    path = tmp_path / "sales.csv"
+    path.write_text("id\n")
+
+    def write_rest():
+        for i in range(5):
+            time.sleep(0.05)
+            with open(path, "a") as f:
+                f.write(f"{i}\n")
+
+    writer = threading.Thread(target=write_rest)
+    writer.start()
+    # Two replicas seeing the file mid-write agree on the key of the finished file
+    queues = [JobQueue(db_path, lease_seconds=60, max_attempts=3) for _ in range(2)]
+    ids = [queue.enqueue(path, dedup_key=JobQueue.dedup_key(path, settle_seconds=0.2)) for queue in queues]
+    writer.join()
+
+    assert ids[0] == ids[1]
+    assert queues[0].get(ids[0])["dedup_key"].endswith(f":{path.stat().st_size}:{path.stat().st_mtime_ns}")
+
+
+def test_settled_file_is_not_waited_for(tmp_path):
+    path = tmp_path / "sales.csv"
+    path.write_text("id\n1\n")
+    started = time.time()
+    JobQueue.dedup_key(path, settle_seconds=0)
+    assert time.time() - started < 0.1
+
+
+def test_each_job_claimed_exactly_once_across_connections(db_path):
+    # Two queue objects, as two replicas on a shared volume would have, racing on every claim
+    queues = [JobQueue(db_path, lease_seconds=60, max_attempts=3) for _ in range(2)]
+    job_ids = _fill(queues[0], 60)
+    claimed = {0: [], 1: []}
+    start = threading.Barrier(2)
+
+    def drain(index):
+        start.wait()
+        while (job := queues[index].claim(f"worker-{index}")) is not None:
+            claimed[index].append(job["id"])
+
+    threads = [threading.Thread(target=drain, args=(i,)) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    everything = claimed[0] + claimed[1]
+    assert sorted(everything) == sorted(job_ids)
+    assert len(set(everything)) == len(everything)
+    assert all(queues[0].get(job_id)["attempts"] == 1 for job_id in job_ids)
+
+
+def test_expired_lease_is_reclaimed(db_path):
+    queue = JobQueue(db_path, lease_seconds=0.05, max_attempts=3)
+    job_id = queue.enqueue(Path("a.csv"), dedup_key="a")
+    assert queue.claim("crashed")["id"] == job_id
+    assert queue.claim("other") is None  # still leased
+
+    time.sleep(0.1)
+    job = queue.claim("other")
+    assert job["id"] == job_id
+    assert job["worker_id"] == "other"
+    assert job["attempts"] == 2
+
+
+def test_reclaim_expired_returns_job_to_pending(db_path):
+    queue = JobQueue(db_path, lease_seconds=0.05, max_attempts=3)
+    job_id = queue.enqueue(Path("a.csv"), dedup_key="a")
+    queue.claim("crashed")
+    time.sleep(0.1)
+
+    assert queue.reclaim_expired() == 1
+    job = queue.get(job_id)
+    assert job["status"] == JobQueue.PENDING
+    assert job["error"] == "lease expired"
+
+
+def test_fail_retries_until_max_attempts(db_path):
+    queue = JobQueue(db_path, lease_seconds=60, max_attempts=2)
+    job_id = queue.enqueue(Path("a.csv"), dedup_key="a")
+
+    queue.claim("w")
+    assert queue.fail(job_id, "w", "boom")
+    assert queue.get(job_id)["status"] == JobQueue.PENDING
+
+    queue.claim("w")
+    assert queue.fail(job_id, "w", "boom again")
+    job = queue.get(job_id)
+    assert job["status"] == JobQueue.FAILED
+    assert job["error"] == "boom again"
+    assert queue.claim("w") is None
+
+
+def test_expired_lease_past_max_attempts_fails(db_path):
+    queue = JobQueue(db_path, lease_seconds=0.05, max_attempts=1)
+    job_id = queue.enqueue(Path("a.csv"), dedup_key="a")
+    queue.claim("crashed")
+    time.sleep(0.1)
+
+    assert queue.claim("other") is None
+    assert queue.get(job_id)["status"] == JobQueue.FAILED
+
+
+def test_lost_lease_rejects_heartbeat_and_completion(db_path):
+    queue = JobQueue(db_path, lease_seconds=0.05, max_attempts=3)
+    job_id = queue.enqueue(Path("a.csv"), dedup_key="a")
+    queue.claim("slow")
+    time.sleep(0.1)
+    queue.claim("fast")
+
+    assert not queue.heartbeat(job_id, "slow")
+    assert not queue.complete(job_id, "slow")
+    assert queue.heartbeat(job_id, "fast")
+    assert queue.complete(job_id, "fast", Path("report.pdf"))
+    job = queue.get(job_id)
+    assert job["status"] == JobQueue.DONE
+    assert job["result_path"] == "report.pdf"
+
+
+def test_worker_completes_and_fails_jobs(db_path):
+    queue = JobQueue(db_path, lease_seconds=60, max_attempts=1)
+    ok = queue.enqueue(Path("ok.csv"), dedup_key="ok")
+    bad = queue.enqueue(Path("bad.csv"), dedup_key="bad")
+
+    def callback(file_path):
+        if file_path.name == "bad.csv":
+            raise ValueError("unreadable")
+        return file_path.with_suffix(".pdf")
+
+    worker = QueueWorker(queue, callback, worker_id="w", poll_interval=0.01)
+    assert worker.run_once() and worker.run_once()
+    assert not worker.run_once()
+
+    assert queue.get(ok)["status"] == JobQueue.DONE
+    assert queue.get(ok)["result_path"] == "ok.pdf"
+    assert queue.get(bad)["status"] == JobQueue.FAILED
+    assert queue.get(bad)["error"] == "unreadable"
+
+
+def test_worker_heartbeat_extends_lease(db_path):
+    queue = JobQueue(db_path, lease_seconds=0.3, max_attempts=3)
+    job_id = queue.enqueue(Path("a.csv"), dedup_key="a")
+    rival = []
+
+    def slow(file_path):
+        # Outlives the original lease; the heartbeat must keep the job from being reclaimed
+        time.sleep(0.6)
+        rival.append(queue.claim("rival"))
+
+    QueueWorker(queue, slow, worker_id="w").run_once()
+    assert rival == [None]
+    assert queue.get(job_id)["status"] == JobQueue.DONE
+
+
+def test_worker_notices_lost_heartbeat(db_path, caplog):
+    queue = JobQueue(db_path, lease_seconds=0.3, max_attempts=3)
+    job_id = queue.enqueue(Path("a.csv"), dedup_key="a")
+
+    def stolen(file_path):
+        # Another replica took the job over (e.g. after a stall); this worker's lease is gone
+        with closing(queue._connect()) as conn:
+            conn.execute("UPDATE jobs SET worker_id = 'rival' WHERE id = ?", (job_id,))
+        time.sleep(0.25)
+
+    with caplog.at_level(logging.WARNING, logger="src.ingestion.job_queue"):
+        QueueWorker(queue, stolen, worker_id="w").run_once()
+
+    assert "lost the lease" in caplog.text
+    job = queue.get(job_id)
+    assert job["status"] == JobQueue.RUNNING
+    assert job["worker_id"] == "rival"
@@ -0,0 +1,98 @@
+import logging
+import time
+
+import pytest
+
+from src.analysis.ai_analyzer import AIAnalyzer
+from src.analysis.narrative_engine import NarrativeEngine
+from src.config import Config
+
+SECTIONS = ["Overall Data Health", "Key Findings", "Anomalies Detected", "Recommended Actions"]
+
+
+@pytest.fixture
+def metrics():
+    return {
+        "total_rows": 1200,
+        "columns": ["amount", "units", "region"],
+        "numeric_columns": ["amount", "units"],
+        "summary_stats": {
+            "amount": {"mean": 150.0, "median": 90.0, "std": 200.0, "min": 1.0, "max": 4000.0},
+            "units": {"mean": 3.0, "median": 3.0, "std": 1.0, "min": 1.0, "max": 9.0}
+        },
+        "quality": {"duplicate_rows": 4, "duplicate_rate": 4 / 1200, "numeric_null_rate": 0.0,
+                    "all_null_columns": [], "constant_columns": ["currency"], "near_constant_columns": []},
+        "time_series": {
+            "timestamp_column": "event_time", "interval": "1d", "start": "2025-01-01", "end": "2025-01-05",
+            "window_count": 5, "period_over_period": {"amount_mean": 3.0},
+            "flagged_windows": [
+                {"metric": "amount_mean", "window": "2025-01-03 00:00:00", "zscore": 4.2, "value": 900.0, "baseline": 150.0}
+            ]
+        },
+        "incremental": {"since_last_run": {"amount": {"change_pct": -12.5}}}
+    }
+
+
+@pytest.fixture
+def anomalies():
+    return {
+        "anomaly_count": 12,
+        "anomaly_percentage": 1.0,
+        "anomalies": [
+            {"row_index": 41, "anomaly_score": -0.7, "values": {"amount": 3950.0, "units": 3.0}},
+            {"row_index": 7, "anomaly_score": -0.6, "values": {"amount": 2100.0, "units": 8.0}}
+        ]
+    }
+
+
+def test_same_input_gives_same_text(metrics, anomalies):
+    assert NarrativeEngine().generate(metrics, anomalies) == NarrativeEngine().generate(metrics, anomalies)
+
+
+def test_text_has_the_four_sections_in_order(metrics, anomalies):
+    text = NarrativeEngine().generate(metrics, anomalies)
+    positions = [text.index(f"**{title}**") for title in SECTIONS]
+    assert positions == sorted(positions)
+
+
+def test_text_is_written_from_the_numbers(metrics, anomalies):
+    text = NarrativeEngine().generate(metrics, anomalies)
+
+    assert "1,200 records with 2 numeric columns" in text
+    assert "4 duplicate rows" in text
+    assert "amount is right-skewed (mean 150 vs median 90.00)" in text
+    assert "amount_mean in the 2025-01-03 window was 4.2σ above its rolling baseline" in text
+    assert "Mean amount is down 12.5% since the previous file" in text
+    assert "flagged 12 records (1.0% of the data)" in text
+    assert "1. Review rows 41, 7 (highest anomaly scores), starting with their amount values" in text
+
+
+def test_drivers_ranked_by_share_of_deviation(metrics, anomalies):
+    drivers = NarrativeEngine().anomaly_drivers(metrics["summary_stats"], anomalies)
+    assert [d["column"] for d in drivers] == ["amount", "units"]
+    assert drivers[0]["direction"] == "above"
+    assert sum(d["share"] for d in drivers) == pytest.approx(1.0)
+
+
+def test_sparse_input_still_has_every_section():
+    text = NarrativeEngine().generate({"total_rows": 0, "summary_stats": {}}, {"skipped": True})
+    assert all(f"**{title}**" in text for title in SECTIONS)
+    assert "Anomaly detection was skipped" in text
+
+
+def test_missed_deadline_falls_back_to_the_narrative(monkeypatch, caplog, metrics, anomalies):
+    class SlowModel:
+        def generate_content(self, prompt, generation_config=None, stream=False):
+            time.sleep(1)
+
+    monkeypatch.setattr(Config, "INSIGHT_MODE", "llm")
+    monkeypatch.setattr(Config, "LLM_DEADLINE_SECONDS", 0.1)
+    analyzer = AIAnalyzer()
+    analyzer._model, analyzer.model_name = SlowModel(), "test-model"
+
+    with caplog.at_level(logging.WARNING):
+        assert analyzer.generate_insights(metrics, anomalies) == NarrativeEngine().generate(metrics, anomalies)
+        assert analyzer.last_source == "narrative"
+        assert "".join(analyzer.stream_insights(metrics, anomalies)) == NarrativeEngine().generate(metrics, anomalies)
+        assert analyzer.last_source == "narrative"
+    assert caplog.text.count("LLM deadline of 0.1s exceeded, using the local narrative") == 2
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import polars as pl
+import pytest
+from reportlab import rl_config
+
+from src.config import Config
+from src.processing.data_processor import DataProcessor
+from src.processing.data_quality import DataQualityProfiler
+from src.processing.time_series import TimeSeriesAnalyzer
+from src.reporting import pdf_generator
+from src.reporting.pdf_generator import PDFGenerator
+
+
+class _FixedClock(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 3, 1, 9, 30)
+
+
+@pytest.fixture(autouse=True)
+def deterministic(monkeypatch, tmp_path):
+    # Same bytes for the same story: no timestamps or random document ids
+    monkeypatch.setattr(rl_config, "invariant", 1)
+    monkeypatch.setattr(pdf_generator, "datetime", _FixedClock)
+    monkeypatch.setattr(Config, "OUTPUT_DIR", tmp_path)
+
+
+@pytest.fixture
+def report_data():
+    rng = np.random.default_rng(9)
+    rows = 240
+    df = pl.DataFrame({
+        "event_time": [datetime(2025, 1, 1) + timedelta(hours=i) for i in range(rows)],
+        "amount": rng.normal(100, 10, rows),
+        "units": rng.integers(1, 5, rows).astype(np.float64)
+    })
+    metrics = DataProcessor.calculate_metrics(df, approximate=False)
+    metrics["quality"] = DataQualityProfiler().profile(df)
+    metrics["time_series"] = TimeSeriesAnalyzer().analyze(df)
+    anomalies = {
+        "anomaly_count": 2, "total_rows": rows, "anomaly_percentage": 0.83,
+        "anomalies": [{"row_index": 7, "anomaly_score": -0.61, "values": {"amount": 141.0, "units": 4.0}}]
+    }
+    return {
+        "title": "Analysis Report: sales", "metrics": metrics, "anomalies": anomalies, "segments": None,
+        "insights": "**Overall Data Health**\n\nStable.\n\n**Key Findings**\n\n• Amount is steady.",
+        "insights_source": "llm", "charts": []
+    }
+
+
+def test_prepared_layout_matches_one_shot_report(report_data):
+    generator = PDFGenerator()
+    one_shot = generator.generate(report_data, "one_shot.pdf").read_bytes()
+
+    # The dashboard lays out the insight-independent sections while the LLM streams
+    prepared = generator.prepare({**report_data, "insights": None, "insights_source": None})
+    two_step = generator.generate(report_data, "two_step.pdf", prepared=prepared).read_bytes()
+
+    assert one_shot.startswith(b"%PDF")
+    assert two_step == one_shot
+
+
+def test_prepared_layout_can_be_reused_with_other_insights(report_data):
+    generator = PDFGenerator()
+    prepared = generator.prepare(report_data)
+    fallback = {**report_data, "insights": "Local summary.", "insights_source": "narrative"}
+
+    assert (generator.generate(fallback, "a.pdf", prepared=prepared).read_bytes()
+            == generator.generate(fallback, "b.pdf").read_bytes())
@@ -0,0 +1,52 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+# Imported at first use only; none of these may load just because a module was imported
+HEAVY_MODULES = ["sklearn", "plotly", "reportlab", "google.generativeai", "pandas", "aiohttp"]
+
+# Generous so slow CI machines pass, tight enough to catch an eager scikit-learn/plotly import
+IMPORT_BUDGET_SECONDS = 1.5
+
+
+def _cold_import(module: str) -> dict:
+    """Import a module in a fresh interpreter and report its time and the heavy modules it pulled in"""
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'seconds': elapsed, 'loaded': loaded}))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=APP_DIR, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_main_import_skips_heavy_dependencies():
+    assert _cold_import("src.main")["loaded"] == []
+
+
+def test_batch_import_skips_heavy_dependencies():
+    assert _cold_import("src.batch")["loaded"] == []
+
+
+def test_main_import_within_budget():
+    # Best of three, so a single noisy run doesn't fail the suite
+    seconds = min(_cold_import("src.main")["seconds"] for _ in range(3))
+    assert seconds < IMPORT_BUDGET_SECONDS, f"importing src.main took {seconds:.2f}s"
+
+
+def test_config_import_has_no_side_effects():
+    code = (
+        "import logging\n"
+        "import src.config, src.ingestion.file_watcher\n"
+        "assert not logging.getLogger().handlers, 'logging configured at import'\n"
+        "assert not src.config.Config._initialized, 'Config.init() ran at import'\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=APP_DIR, check=True)
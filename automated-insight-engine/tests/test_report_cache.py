@@ -0,0 +1,135 @@
+import json
+import time
+
+import pytest
+
+from src.config import Config
+from src.reporting.report_cache import ReportCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ReportCache(tmp_path / "cache", max_age_hours=1, max_bytes=10_000)
+
+
+def _report(tmp_path, name: str, size: int = 100):
+    path = tmp_path / name
+    path.write_bytes(b"%PDF" + b"x" * size)
+    return path
+
+
+def test_miss_then_hit(tmp_path, cache):
+    key = cache.key("digest")
+    assert cache.fetch(key, tmp_path / "out.pdf") == (None, None)
+
+    cache.store(key, _report(tmp_path, "report.pdf"), summary={"metrics": {"total_rows": 3}})
+    path, summary = cache.fetch(key, tmp_path / "again.pdf")
+    assert path == tmp_path / "again.pdf"
+    assert path.read_bytes() == (tmp_path / "report.pdf").read_bytes()
+    assert summary == {"metrics": {"total_rows": 3}}
+    assert json.loads(cache.index_path.read_text())[key]["hits"] == 1
+
+
+def test_key_separates_content_variant_and_history(cache):
+    base = cache.key("digest")
+    assert cache.key("digest") == base
+    assert cache.key("other") != base
+    assert cache.key("digest", variant="dashboard") != base
+    assert cache.key("digest", history="archive=1") != base
+    assert cache.key("digest", history="archive=1") != cache.key("digest", history="archive=2")
+
+
+@pytest.mark.parametrize("setting, value", [
+    ("CONTAMINATION_FACTOR", 0.2),
+    ("N_ESTIMATORS", 50),
+    ("GEMINI_MODEL", "other-model"),
+    ("TEMPERATURE", 0.9),
+    ("SEGMENT_MODE", True),
+    ("STATS_MODE", "approx"),
+    ("INSIGHT_MODE", "fast"),
+    ("QUALITY_MAX_NULL_RATE", 0.1),
+    ("TIME_SERIES_ENABLED", False),
+    ("TIMESTAMP_COLUMN", "created_at"),
+    ("TS_INTERVAL", "1h"),
+    ("APPROX_ROW_THRESHOLD", 10),
+    ("HLL_PRECISION", 12),
+    ("SKETCH_K", 100),
+    ("SCREEN_PROJECTION", "pca"),
+    ("ROLLING_RUNS", 3),
+    ("DRIFT_ZSCORE", 2.0),
+    ("RUN_ARCHIVE_BASELINE_RUNS", 5),
+])
+def test_report_settings_change_the_key(monkeypatch, cache, setting, value):
+    before = cache.key("digest")
+    monkeypatch.setattr(Config, setting, value)
+    assert cache.key("digest") != before
+
+
+def test_expired_entry_misses(tmp_path, cache):
+    key = cache.key("digest")
+    cache.store(key, _report(tmp_path, "report.pdf"))
+    index = json.loads(cache.index_path.read_text())
+    index[key]["created_at"] = time.time() - 2 * 3600
+    cache.index_path.write_text(json.dumps(index))
+
+    assert cache.fetch(key, tmp_path / "out.pdf") == (None, None)
+    assert not (cache.cache_dir / f"{key}.pdf").exists()
+
+
+def test_least_recently_used_evicted_over_budget(tmp_path, cache):
+    keys = [cache.key(f"digest-{i}") for i in range(3)]
+    cache.store(keys[0], _report(tmp_path, "a.pdf", 4_000))
+    cache.store(keys[1], _report(tmp_path, "b.pdf", 4_000))
+    cache.fetch(keys[0], tmp_path / "a-again.pdf")  # keys[1] is now least recently used
+    cache.store(keys[2], _report(tmp_path, "c.pdf", 4_000))
+
+    assert cache.fetch(keys[1], tmp_path / "b-again.pdf") == (None, None)
+    assert cache.fetch(keys[0], tmp_path / "a-third.pdf")[0] is not None
+    assert cache.fetch(keys[2], tmp_path / "c-again.pdf")[0] is not None
+
+
+def test_summarize_drops_sketches():
+    summary = ReportCache.summarize({"metrics": {"total_rows": 3, "sketches": {"a": {}}}, "insights": "text"})
+    assert summary["metrics"] == {"total_rows": 3}
+    assert summary["insights"] == "text"
+
+
+@pytest.mark.parametrize("mode, source, cacheable", [
+    ("llm", "llm", True),
+    ("llm", "narrative", False),
+    ("fast", "narrative", True),
+    ("llm", None, True),  # quality-gate failure: no insights call at all
+    ("llm", "partial", False),
+])
+def test_only_intended_insights_are_cacheable(monkeypatch, mode, source, cacheable):
+    monkeypatch.setattr(Config, "INSIGHT_MODE", mode)
+    assert ReportCache.cacheable({"insights_source": source}) is cacheable
+
+
+def test_engine_does_not_cache_the_llm_fallback(tmp_path, monkeypatch, cache):
+    from src.main import InsightEngine
+
+    for setting in ("REPORT_CACHE_ENABLED", "RUN_ARCHIVE_ENABLED", "INCREMENTAL_ENABLED",
+                    "ADMISSION_ENABLED", "ALERTS_ENABLED", "SCHEMA_REGISTRY_ENABLED", "PROFILE_ENABLED"):
+        monkeypatch.setattr(Config, setting, False)
+    monkeypatch.setattr(Config, "INSIGHT_MODE", "llm")
+    monkeypatch.setattr(Config, "OUTPUT_DIR", tmp_path)
+    engine = InsightEngine()
+    engine.report_cache = cache
+
+    sources = iter(["narrative", "llm"])
+    def run_pipeline(file_path, output_filename, *args, **kwargs):
+        # The LLM call failed the first time, and the report carries the local narrative instead
+        report = _report(tmp_path, output_filename)
+        return report, {"metrics": {}, "insights": "text", "insights_source": next(sources)}
+    monkeypatch.setattr(engine, "_run_pipeline", run_pipeline)
+
+    data = tmp_path / "sales.csv"
+    data.write_text("id\n1\n")
+    engine.process_file(data)
+    assert not cache.index_path.exists() or json.loads(cache.index_path.read_text()) == {}
+
+    # The retry reaches the LLM, and only that report is cached
+    engine.process_file(data)
+    path, summary = cache.fetch(cache.key(engine.data_loader.file_digest(data)), tmp_path / "again.pdf")
+    assert summary["insights_source"] == "llm"
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from src.reporting.run_archive import RunArchive
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = RunArchive(tmp_path / "runs.db", baseline_runs=10, drift_zscore=3.0)
+    archive.min_runs = 3
+    return archive
+
+
+def _report(rows: int, means: dict, anomaly_pct: float = 5.0, passed: bool = True) -> dict:
+    return {
+        "metrics": {
+            "total_rows": rows,
+            "summary_stats": {col: {"mean": mean, "std": 1.0} for col, mean in means.items()},
+            "quality": {"passed": passed}
+        },
+        "anomalies": {"anomaly_count": int(rows * anomaly_pct / 100), "anomaly_percentage": anomaly_pct,
+                      "anomalies": []}
+    }
+
+
+def _split(report: dict) -> dict:
+    return {"metrics": report["metrics"], "anomalies": report["anomalies"]}
+
+
+def _record(archive, day: int, rows: int, means: dict, **kwargs) -> int:
+    return archive.record(f"sales_202501{day:02d}.csv", _report(rows, means, **kwargs))
+
+
+def test_first_run_has_no_baseline(archive):
+    assert archive.drift("sales", **_split(_report(100, {"amount": 10.0}))) is None
+
+
+def test_drift_flags_a_shifted_column(archive):
+    rng = np.random.default_rng(0)
+    for day in range(1, 11):
+        _record(archive, day, 1000 + day, {"amount": 50 + rng.normal(0, 1), "units": 5 + rng.normal(0, 0.1)})
+
+    result = archive.drift("sales", **_split(_report(1005, {"amount": 80.0, "units": 5.0})))
+    assert result["baseline_runs"] == 10
+    assert result["previous_file"] == "sales_20250110.csv"
+    assert result["drifted"] == ["amount"]
+    assert result["columns"]["amount"]["zscore"] > 3
+    assert abs(result["columns"]["units"]["zscore"]) < 3
+    assert not result["rows"]["drifted"]
+
+
+def test_baseline_keeps_precision_on_large_values(archive):
+    rng = np.random.default_rng(1)
+    means = 1.2e8 + rng.normal(0, 0.5, 10)
+    for day, mean in enumerate(means, start=1):
+        _record(archive, day, 10**12 + day, {"amount": float(mean)})
+
+    result = archive.drift("sales", **_split(_report(10**12, {"amount": 1.2e8})))
+    assert result["columns"]["amount"]["baseline_std"] == pytest.approx(np.std(means, ddof=1), rel=1e-6)
+    assert result["rows"]["baseline_std"] == pytest.approx(np.std(np.arange(1, 11), ddof=1), rel=1e-9)
+
+
+def test_too_few_runs_are_shown_but_not_flagged(archive):
+    _record(archive, 1, 100, {"amount": 10.0})
+    _record(archive, 2, 100, {"amount": 10.2})
+
+    result = archive.drift("sales", **_split(_report(100, {"amount": 99.0})))
+    assert result["columns"]["amount"]["zscore"] > 3
+    assert result["drifted"] == []
+
+
+def test_failed_quality_runs_stay_out_of_the_baseline(archive):
+    for day in range(1, 5):
+        _record(archive, day, 100, {"amount": 10.0 + day / 10})
+    _record(archive, 5, 3, {"amount": 1e6}, passed=False)
+
+    result = archive.drift("sales", **_split(_report(100, {"amount": 10.3})))
+    assert result["baseline_runs"] == 4
+    assert result["columns"]["amount"]["baseline_mean"] == pytest.approx(10.25)
+
+
+def test_archived_run_compares_with_runs_before_it(archive):
+    for day in range(1, 5):
+        _record(archive, day, 100, {"amount": 10.0 + day / 10})
+    latest = _record(archive, 5, 100, {"amount": 50.0})
+
+    assert archive.latest_run("sales") == latest
+    result = archive.drift("sales")
+    assert result["columns"]["amount"]["current"] == 50.0
+    assert result["drifted"] == ["amount"]
+    assert archive.drift("sales", run_id=latest - 1)["columns"]["amount"]["current"] == pytest.approx(10.4)
+
+
+def test_history_and_runs(archive):
+    for day in range(1, 4):
+        _record(archive, day, 100 * day, {"amount": float(day)})
+
+    assert [point["value"] for point in archive.history("sales", "amount")] == [1.0, 2.0, 3.0]
+    assert [run["rows"] for run in archive.runs("sales", limit=2)] == [200, 300]
+    assert archive.feeds()[0]["feed"] == "sales" and archive.feeds()[0]["runs"] == 3
+    with pytest.raises(ValueError):
+        archive.history("sales", "amount", stat="mode")
@@ -0,0 +1,93 @@
+import time
+
+import pytest
+
+from src.config import Config
+from src.ingestion.job_queue import JobQueue
+from src.runtime.scheduler import HIGH, LOW, NORMAL, JobHistory, JobScheduler
+
+
+@pytest.fixture
+def files(tmp_path):
+    """Small files of three feeds: 'slow' takes 10s per job, 'fast' 1s, 'urgent' 10s but high priority"""
+    paths = {}
+    for feed in ("slow", "fast", "urgent"):
+        paths[feed] = tmp_path / f"{feed}_20250101.csv"
+        paths[feed].write_text("a,b\n1,2\n")
+    return paths
+
+
+@pytest.fixture
+def history(tmp_path, files):
+    history = JobHistory(tmp_path / "job_timings.json", default_rate=5.0)
+    for feed, seconds in (("slow", 10.0), ("fast", 1.0), ("urgent", 10.0)):
+        history.observe(files[feed], seconds, size=0)
+    return history
+
+
+@pytest.fixture
+def urgent(monkeypatch):
+    monkeypatch.setattr(Config, "PRIORITY_HIGH_PATTERNS", ["urgent_*"])
+    monkeypatch.setattr(Config, "PRIORITY_LOW_PATTERNS", ["*.bak.csv"])
+
+
+def test_sort_key_orders_classes_then_expected_time():
+    scheduler = JobScheduler(history=object(), class_gap=600, aging_rate=0.25)
+    high_long = scheduler.sort_key(HIGH, 300, 0)
+    normal_short = scheduler.sort_key(NORMAL, 1, 0)
+    normal_long = scheduler.sort_key(NORMAL, 300, 0)
+    low_short = scheduler.sort_key(LOW, 1, 0)
+    assert high_long < normal_short < normal_long < low_short
+
+
+def test_aging_lets_a_long_job_overtake():
+    scheduler = JobScheduler(history=object(), class_gap=600, aging_rate=0.25)
+    # 299 seconds longer: overtaken by new short jobs until it has waited 299 / 0.25 seconds
+    assert scheduler.sort_key(NORMAL, 300, 1000) > scheduler.sort_key(NORMAL, 1, 0)
+    assert scheduler.sort_key(NORMAL, 300, 1200) < scheduler.sort_key(NORMAL, 1, 0)
+    # The same holds across classes, so low-priority work never starves
+    assert scheduler.sort_key(LOW, 1, 2500) < scheduler.sort_key(NORMAL, 1, 0)
+
+
+def test_classify_matches_patterns(urgent, tmp_path):
+    assert JobScheduler.classify(tmp_path / "urgent_20250101.csv") == HIGH
+    assert JobScheduler.classify(tmp_path / "orders.bak.csv") == LOW
+    assert JobScheduler.classify(tmp_path / "orders.csv") == NORMAL
+
+
+def test_history_smooths_and_shares_rates(tmp_path, files, history):
+    assert history.expected_seconds(files["slow"]) == pytest.approx(10.0)
+    history.observe(files["slow"], 20.0, size=0)
+    assert history.expected_seconds(files["slow"]) == pytest.approx(0.7 * 10 + 0.3 * 20)
+
+    # Another worker on the same volume sees the learned rates; unknown feeds use the default
+    other = JobHistory(tmp_path / "job_timings.json", default_rate=5.0)
+    assert other.expected_seconds(files["slow"]) == pytest.approx(13.0)
+    assert other.expected_seconds(tmp_path / "new.csv", size=0) == pytest.approx(5.0)
+
+
+def test_next_runs_shortest_job_first(files, history):
+    scheduler = JobScheduler(history=history, class_gap=600, aging_rate=0)
+    scheduler.submit(files["slow"])
+    scheduler.submit(files["fast"])
+    assert [scheduler.next(timeout=0), scheduler.next(timeout=0)] == [files["fast"], files["slow"]]
+    assert scheduler.next(timeout=0) is None
+
+
+def test_next_ages_waiting_jobs(files, history):
+    # Waiting 0.2s at 100 key-seconds per second outweighs the 9s difference in expected time
+    scheduler = JobScheduler(history=history, class_gap=600, aging_rate=100)
+    scheduler.submit(files["slow"])
+    time.sleep(0.2)
+    scheduler.submit(files["fast"])
+    assert scheduler.next(timeout=0) == files["slow"]
+
+
+def test_queue_claims_in_scheduler_order(tmp_path, urgent, files, history):
+    scheduler = JobScheduler(history=history, class_gap=600, aging_rate=0)
+    queue = JobQueue(tmp_path / "jobs.db", lease_seconds=60, max_attempts=3, scheduler=scheduler)
+    for feed in ("slow", "fast", "urgent"):
+        queue.enqueue(files[feed])
+
+    claimed = [queue.claim("w")["path"] for _ in range(3)]
+    assert claimed == [str(files["urgent"]), str(files["fast"]), str(files["slow"])]
@@ -0,0 +1,82 @@
+import polars as pl
+import pytest
+
+from src.ingestion.data_loader import DataLoader
+from src.ingestion.schema_registry import SchemaRegistry, derive_feed_key
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return SchemaRegistry(tmp_path / "schema_registry.json")
+
+
+def _csv(tmp_path, name: str, text: str):
+    path = tmp_path / name
+    path.write_text(text)
+    return path
+
+
+@pytest.mark.parametrize("name, feed", [
+    ("sales_20251203.csv", "sales"),
+    ("sales-2025-12-03.csv", "sales"),
+    ("sales_20251203_142425.csv", "sales"),
+    ("Inventory.csv", "inventory"),
+])
+def test_derive_feed_key(name, feed):
+    assert derive_feed_key(name) == feed
+
+
+def test_learned_schema_is_reused(tmp_path, registry):
+    first = _csv(tmp_path, "sales_20250101.csv", "id,amount,day\n1,2.5,2025-01-01\n")
+    DataLoader.load_csv(first, schema_registry=registry)
+
+    second = _csv(tmp_path, "sales_20250102.csv", "id,amount,day\n2,3.5,2025-01-02\n")
+    assert registry.lookup(second) == {"id": pl.Int64, "amount": pl.Float64, "day": pl.Date}
+    # A fresh instance reads what the first one persisted
+    assert SchemaRegistry(registry.registry_path).lookup(second) == registry.lookup(second)
+
+
+def test_header_change_falls_back_to_inference(tmp_path, registry):
+    DataLoader.load_csv(_csv(tmp_path, "sales_20250101.csv", "id,amount\n1,2\n"), schema_registry=registry)
+    assert registry.lookup(_csv(tmp_path, "sales_20250102.csv", "id,amount,region\n1,2,eu\n")) is None
+
+
+def test_int_then_float_widens_to_float(tmp_path, registry):
+    DataLoader.load_csv(_csv(tmp_path, "sales_20250101.csv", "id,amount\n1,2\n2,3\n"), schema_registry=registry)
+    df = DataLoader.load_csv(_csv(tmp_path, "sales_20250102.csv", "id,amount\n1,2.5\n2,3\n"), schema_registry=registry)
+
+    assert df["amount"].dtype == pl.Float64
+    assert df["amount"].to_list() == [2.5, 3.0]
+    later = _csv(tmp_path, "sales_20250103.csv", "id,amount\n1,4\n")
+    assert registry.lookup(later)["amount"] == pl.Float64
+    assert DataLoader.load_csv(later, schema_registry=registry)["amount"].dtype == pl.Float64
+
+
+def test_stray_text_never_downgrades_numeric_column(tmp_path, registry):
+    DataLoader.load_csv(_csv(tmp_path, "sales_20250101.csv", "id,amount\n1,2\n2,3\n"), schema_registry=registry)
+
+    coerced = {}
+    df = DataLoader.load_csv(_csv(tmp_path, "sales_20250102.csv", "id,amount\n1,NA\n2, 3\n"),
+                             schema_registry=registry, coerced=coerced)
+    assert df["amount"].dtype == pl.Int64
+    assert df["amount"].to_list() == [None, 3]
+    assert coerced == {"amount": 1}
+
+    clean = _csv(tmp_path, "sales_20250103.csv", "id,amount\n1,5\n")
+    assert registry.lookup(clean)["amount"] == pl.Int64
+
+
+def test_widen_rules():
+    widened = SchemaRegistry._widen(
+        {"a": "Int64", "b": "Float64", "c": "Int64", "d": "Utf8"},
+        {"a": "Float64", "b": "Utf8", "c": "Int64", "d": "Int64"}
+    )
+    assert widened == {"a": "Float64", "b": "Float64", "c": "Int64", "d": "Int64"}
+
+
+def test_forget_drops_feed(tmp_path, registry):
+    path = _csv(tmp_path, "sales_20250101.csv", "id\n1\n")
+    DataLoader.load_csv(path, schema_registry=registry)
+    registry.forget(path)
+    assert registry.lookup(path) is None
+    assert SchemaRegistry(registry.registry_path).lookup(path) is None
@@ -0,0 +1,75 @@
+import numpy as np
+import polars as pl
+import pytest
+
+from src.config import Config
+from src.processing.segment_analyzer import SegmentAnalyzer
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(5)
+    regions = ["north"] * 300 + ["south"] * 200 + ["east"] * 8
+    return pl.DataFrame({
+        "region": regions,
+        "channel": ["web", "store"] * 254,
+        "order_id": [f"o-{i}" for i in range(len(regions))],
+        "status": ["ok"] * len(regions),
+        "amount": rng.normal(100, 10, len(regions)),
+        "units": rng.integers(1, 5, len(regions)).astype(np.float64)
+    })
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    monkeypatch.setattr(Config, "SEGMENT_MAX_CARDINALITY", 10)
+    monkeypatch.setattr(Config, "SEGMENT_MIN_ROWS", 20)
+    monkeypatch.setattr(Config, "SEGMENT_BATCH_ROWS", 5000)
+    monkeypatch.setattr(Config, "SEGMENT_WORKERS", 1)
+    monkeypatch.setattr(Config, "SEGMENT_TOP_ANOMALIES", 3)
+    monkeypatch.setattr(Config, "N_ESTIMATORS", 20)
+
+
+def test_auto_dimensions_skip_constant_and_id_like_columns(frame):
+    # status has one value, order_id one per row; both say nothing about segments
+    assert SegmentAnalyzer(dimensions=[]).resolve_dimensions(frame) == ["region", "channel"]
+
+
+def test_configured_dimensions_drop_missing_columns(frame):
+    assert SegmentAnalyzer(dimensions=["channel", "country"]).resolve_dimensions(frame) == ["channel"]
+
+
+def test_no_dimensions_gives_empty_result(frame):
+    result = SegmentAnalyzer(dimensions=[]).analyze(frame.select("order_id", "amount"))
+    assert result == {"dimensions": [], "segment_count": 0, "segments": []}
+
+
+def test_batches_pack_small_segments_and_isolate_large_ones():
+    tasks = [(i, np.arange(rows), None) for i, rows in enumerate([5000, 40, 30, 7000, 20, 10])]
+    batches = SegmentAnalyzer._batch(tasks, batch_rows=60)
+    assert [[task[0] for task in batch] for batch in batches] == [[3], [0], [1, 2], [4, 5]]
+
+
+def test_small_segments_get_aggregates_only(frame):
+    result = SegmentAnalyzer(dimensions=["region"]).analyze(frame)
+    segments = {s["label"]: s for s in result["segments"]}
+
+    assert result["segment_count"] == 3
+    assert segments["east"]["rows"] == 8
+    assert segments["east"]["anomaly_count"] is None and segments["east"]["top_anomalies"] == []
+    assert segments["east"]["stats"]["amount"]["mean"] == pytest.approx(frame["amount"][500:].mean())
+    for label in ("north", "south"):
+        assert segments[label]["anomaly_count"] > 0
+        assert len(segments[label]["top_anomalies"]) == 3
+    # Most anomalous segments first
+    assert [s["label"] for s in result["segments"]][-1] == "east"
+
+
+def test_pool_matches_serial_detection(frame, monkeypatch):
+    serial = SegmentAnalyzer(dimensions=["region", "channel"]).analyze(frame)
+
+    monkeypatch.setattr(Config, "SEGMENT_WORKERS", 2)
+    monkeypatch.setattr(Config, "SEGMENT_BATCH_ROWS", 100)
+    pooled = SegmentAnalyzer(dimensions=["region", "channel"]).analyze(frame)
+
+    assert pooled == serial
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from src.processing.sketches import ColumnSummary, HyperLogLog, KLLSketch, RunningMoments
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(7)
+    return np.concatenate([rng.lognormal(3, 1, 150_000), rng.normal(1e8, 0.5, 50_000)])
+
+
+def _chunks(values, count=8):
+    return np.array_split(values, count)
+
+
+def test_merged_moments_match_exact(values):
+    merged = RunningMoments()
+    for chunk in _chunks(values):
+        merged = merged.merge(RunningMoments.from_array(chunk))
+
+    assert merged.count == values.size
+    assert merged.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert merged.std == pytest.approx(values.std(ddof=1), rel=1e-9)
+    assert merged.minimum == values.min() and merged.maximum == values.max()
+
+
+def test_moments_keep_precision_on_large_means():
+    rng = np.random.default_rng(1)
+    values = 1.2e8 + rng.normal(0, 0.5, 10_000)
+    merged = RunningMoments()
+    for chunk in _chunks(values, 100):
+        merged = merged.merge(RunningMoments.from_array(chunk))
+    assert merged.std == pytest.approx(values.std(ddof=1), rel=1e-6)
+
+
+def test_merging_empty_moments_is_identity(values):
+    moments = RunningMoments.from_array(values)
+    assert RunningMoments().merge(moments).to_dict() == moments.to_dict()
+    assert moments.merge(RunningMoments()).to_dict() == moments.to_dict()
+    assert RunningMoments().std is None
+
+
+def test_merged_kll_quantiles_within_rank_error(values):
+    merged = KLLSketch(k=200)
+    for i, chunk in enumerate(_chunks(values)):
+        part = KLLSketch(k=200, seed=i)
+        part.update(chunk)
+        merged.merge(part)
+
+    ordered = np.sort(values)
+    assert merged.count == values.size
+    for q, estimate in zip((0.01, 0.25, 0.5, 0.75, 0.99), merged.quantiles([0.01, 0.25, 0.5, 0.75, 0.99])):
+        rank = np.searchsorted(ordered, estimate) / values.size
+        assert abs(rank - q) <= merged.rank_error, f"q={q}: rank {rank:.4f}"
+
+
+def test_kll_memory_is_bounded(values):
+    sketch = KLLSketch(k=200)
+    for chunk in _chunks(values, 50):
+        sketch.update(chunk)
+    assert sum(len(level) for level in sketch.levels) < 3 * 200
+
+
+def test_merged_hll_within_error():
+    rng = np.random.default_rng(3)
+    distinct = rng.permutation(200_000).astype(np.float64)
+    # Every chunk overlaps the next by half, so merging must not double count
+    merged = HyperLogLog(p=14)
+    for start in range(0, distinct.size, 25_000):
+        part = HyperLogLog(p=14)
+        part.update(distinct[max(0, start - 12_500):start + 25_000])
+        merged.merge(part)
+
+    assert merged.count() == pytest.approx(distinct.size, rel=3 * merged.relative_error)
+
+
+def test_hll_rejects_mismatched_precision():
+    with pytest.raises(ValueError):
+        HyperLogLog(p=12).merge(HyperLogLog(p=14))
+
+
+def test_column_summary_round_trips_and_merges(values):
+    first, second = ColumnSummary(), ColumnSummary()
+    first.update(values[:100_000])
+    second.update(np.append(values[100_000:], np.nan))
+    restored = ColumnSummary.from_dict(first.to_dict()).merge(ColumnSummary.from_dict(second.to_dict()))
+
+    stats = restored.stats()
+    assert stats["mean"] == pytest.approx(values.mean(), rel=1e-12)
+    assert stats["sum"] == pytest.approx(values.sum(), rel=1e-12)
+    assert stats["distinct"] == pytest.approx(np.unique(values).size, rel=3 * restored.distinct.relative_error)
+    rank = np.searchsorted(np.sort(values), stats["median"]) / values.size
+    assert abs(rank - 0.5) <= restored.quantiles.rank_error
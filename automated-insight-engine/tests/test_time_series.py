@@ -0,0 +1,86 @@
+from datetime import date, datetime, timedelta
+
+import polars as pl
+import pytest
+
+from src.config import Config
+from src.processing.time_series import TimeSeriesAnalyzer
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    monkeypatch.setattr(Config, "TIMESTAMP_COLUMN", "")
+    monkeypatch.setattr(Config, "TS_INTERVAL", "auto")
+    monkeypatch.setattr(Config, "TS_HOURLY_MAX_DAYS", 7)
+    monkeypatch.setattr(Config, "TS_ROLLING_WINDOWS", 4)
+    monkeypatch.setattr(Config, "TS_ZSCORE_THRESHOLD", 3.0)
+    monkeypatch.setattr(Config, "TS_REPORT_WINDOWS", 48)
+
+
+def _hourly(values: list, start=datetime(2025, 1, 1)) -> pl.DataFrame:
+    """Two rows per hour, each hour's amount mean equal to values[hour]"""
+    times, amounts = [], []
+    for hour, value in enumerate(values):
+        times += [start + timedelta(hours=hour), start + timedelta(hours=hour, minutes=30)]
+        amounts += [value - 1.0, value + 1.0]
+    return pl.DataFrame({"event_time": times, "amount": amounts})
+
+
+def test_no_timestamp_column():
+    assert TimeSeriesAnalyzer().analyze(pl.DataFrame({"amount": [1.0, 2.0]})) is None
+
+
+def test_timestamp_column_prefers_hinted_names():
+    schema = {"shipped": pl.Date, "created_at_time": pl.Datetime("us"), "amount": pl.Float64}
+    assert TimeSeriesAnalyzer.detect_timestamp_column(schema) == "created_at_time"
+
+
+def test_short_spans_use_hourly_windows():
+    result = TimeSeriesAnalyzer().analyze(_hourly([10.0] * 24))
+    assert result["interval"] == "1h"
+    assert result["window_count"] == 24
+
+
+def test_long_spans_use_daily_windows():
+    times = [datetime(2025, 1, 1) + timedelta(hours=6 * i) for i in range(4 * 30)]
+    result = TimeSeriesAnalyzer().analyze(pl.DataFrame({"ts": times, "amount": [1.0] * len(times)}))
+    assert result["interval"] == "1d"
+    assert result["window_count"] == 30
+    assert result["windows"][0]["rows"] == 4
+
+
+def test_dates_are_daily_and_interval_can_be_forced(monkeypatch):
+    days = [date(2025, 1, 1) + timedelta(days=i) for i in range(3)]
+    assert TimeSeriesAnalyzer().analyze(pl.DataFrame({"day": days, "amount": [1.0, 2.0, 3.0]}))["interval"] == "1d"
+
+    monkeypatch.setattr(Config, "TS_INTERVAL", "6h")
+    assert TimeSeriesAnalyzer().analyze(_hourly([10.0] * 24))["window_count"] == 4
+
+
+def test_baseline_is_the_previous_windows():
+    values = [10.0, 12.0, 14.0, 16.0, 18.0, 20.0]
+    windows = TimeSeriesAnalyzer().analyze(_hourly(values))["windows"]
+    assert [w["amount_mean"] for w in windows] == values
+
+    frame = pl.DataFrame({"amount_mean": values})
+    baseline = frame.with_columns(TimeSeriesAnalyzer._window_exprs(["amount_mean"]))["amount_mean__baseline"]
+    # Window i compares with the mean of the up to 4 windows before it, never with itself
+    assert baseline.to_list()[:3] == [None, None, None]
+    assert baseline.to_list()[3:] == pytest.approx([12.0, 13.0, 15.0])
+
+
+def test_spike_is_flagged():
+    values = [10.0, 11.0, 9.0, 10.0, 11.0, 9.0, 10.0, 40.0]
+    result = TimeSeriesAnalyzer().analyze(_hourly(values))
+
+    flagged = [w for w in result["flagged_windows"] if w["metric"] == "amount_mean"]
+    assert len(flagged) == 1
+    assert flagged[0]["value"] == 40.0
+    assert flagged[0]["zscore"] > 3
+    assert result["period_over_period"]["amount_mean"] == pytest.approx(300.0)
+
+
+def test_flat_baseline_is_not_flagged():
+    # Zero spread: the z-score is undefined, not infinite
+    result = TimeSeriesAnalyzer().analyze(_hourly([10.0] * 6 + [11.0]))
+    assert result["flagged_windows"] == []